@@ -8,6 +8,34 @@ class BaseAgent:
     def invoke(self, user_text: str) -> dict:
         return self._agent.invoke({"messages": [("user", user_text)]})
 
+    async def ainvoke(self, user_text: str) -> dict:
+        return await self._agent.ainvoke({"messages": [("user", user_text)]})
+
+    def run_query(self, state: MobiLLMState, response_key: str) -> MobiLLMState:
+        '''
+        Invoke the agent on the query of the state and store its response under response_key.
+        '''
+        if self._is_empty_query(state):
+            return state
+        return self._apply_result(self.invoke(state["query"]), state, response_key)
+
+    async def arun_query(self, state: MobiLLMState, response_key: str) -> MobiLLMState:
+        '''
+        Async variant of run_query.
+        '''
+        if self._is_empty_query(state):
+            return state
+        return self._apply_result(await self.ainvoke(state["query"]), state, response_key)
+
+    @staticmethod
+    def _is_empty_query(state: MobiLLMState) -> bool:
+        query = state["query"]
+        return not query or query.strip() == ""
+
+    def _apply_result(self, res, state: MobiLLMState, response_key: str) -> MobiLLMState:
+        state[response_key] = res["messages"][-1].content
+        return self.collect_tool_calls(res, state)
+
     @staticmethod
     def collect_tool_calls(call_result, state: MobiLLMState):
         try:
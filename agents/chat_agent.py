@@ -4,11 +4,7 @@ from ..utils import *
 
 class ChatAgent(BaseAgent):
     def run(self, state: MobiLLMState) -> MobiLLMState:
-        query = state["query"]
-        if not query or query.strip() == "":
-            return state
-        res = self.invoke(query)
-        content = res["messages"][-1].content
-        state["chat_response"] = content
-        state = self.collect_tool_calls(res, state)
-        return state
\ No newline at end of file
+        return self.run_query(state, "chat_response")
+
+    async def arun(self, state: MobiLLMState) -> MobiLLMState:
+        return await self.arun_query(state, "chat_response")
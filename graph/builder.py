@@ -1,4 +1,5 @@
 from langgraph.graph import StateGraph, START, END
+from langchain_core.runnables import RunnableLambda
 from ..state import MobiLLMState
 from .router import supervisor, route_after_response
 
@@ -16,8 +17,9 @@ def build_graph(nodes: dict, checkpointer) -> any:
     
     # register nodes
     g.add_node("supervisor", supervisor)
-    g.add_node("mobillm_chat_agent", nodes["chat"].run)
-    g.add_node("mobillm_security_analysis_agent", nodes["security_analysis"].run)
+    # the agents calling SDL tools also have an async run, used when the graph is run with ainvoke
+    g.add_node("mobillm_chat_agent", RunnableLambda(nodes["chat"].run, afunc=nodes["chat"].arun))
+    g.add_node("mobillm_security_analysis_agent", RunnableLambda(nodes["security_analysis"].run, afunc=nodes["security_analysis"].arun))
     g.add_node("mobillm_security_classification_agent", nodes["classification"].run)
     g.add_node("mobillm_security_response_agent", nodes["response"].run)
     g.add_node("mobillm_config_tuning_agent", nodes["config_tuning"].run)
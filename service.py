@@ -3,6 +3,10 @@ from langgraph.checkpoint.memory import InMemorySaver
 from .settings import Settings
 from .llm.chatmodel_factory import instantiate_llm
 from .tools.tools_registry import *
+from .tools.sdl_cache import sdl_request_scope
+from .tools.network_snapshot import snapshot_pin_scope
+from .tools.sdl_apis import start_sdl_watcher, start_service_status_refresher
+from .tools.mitre_apis import start_mitre_search_warmup
 from MobiLLM import prompts
 from .agents.chat_agent import ChatAgent
 from .agents.security_classification_agent import SecurityClassificationAgent
@@ -31,28 +35,64 @@ class MobiLLMService:
 
         self.graph = build_graph(self.nodes, self.checkpointer)
 
+        if self.settings.sdl_watch:
+            start_sdl_watcher()
+            start_service_status_refresher()
+        if self.settings.mitre_warmup:
+            start_mitre_search_warmup()
+
     def invoke(self, query: str) -> dict:
         tid = str(uuid4())
         input_state = {"thread_id": tid, "query": query, "tools_called": []}
         config = {"configurable": {"thread_id": tid}, "run_id": tid, "run_name": "mobillm_refactored", "tags": ["mobillm"]}
-        return self.graph.invoke(input_state, config=config)
+        # all SDL tools called during this graph run share one SDL snapshot and one network snapshot
+        with sdl_request_scope(self.settings.sdl_cache_ttl), snapshot_pin_scope():
+            return self.graph.invoke(input_state, config=config)
 
     def resume(self, command: dict, thread_id: str) -> dict:
         from langgraph.types import Command
         resume_cmd = Command(resume=command)
         config = {"configurable": {"thread_id": thread_id}}
-        return self.graph.invoke(resume_cmd, config=config)
+        with sdl_request_scope(self.settings.sdl_cache_ttl), snapshot_pin_scope():
+            return self.graph.invoke(resume_cmd, config=config)
+
+    async def ainvoke(self, query: str) -> dict:
+        '''
+        Async variant of invoke. The tools run with their async implementations, so concurrent requests and
+        independent tool calls overlap on one event loop.
+        '''
+        tid = str(uuid4())
+        input_state = {"thread_id": tid, "query": query, "tools_called": []}
+        config = {"configurable": {"thread_id": tid}, "run_id": tid, "run_name": "mobillm_refactored", "tags": ["mobillm"]}
+        with sdl_request_scope(self.settings.sdl_cache_ttl), snapshot_pin_scope():
+            return await self.graph.ainvoke(input_state, config=config)
+
+    async def aresume(self, command: dict, thread_id: str) -> dict:
+        from langgraph.types import Command
+        resume_cmd = Command(resume=command)
+        config = {"configurable": {"thread_id": thread_id}}
+        with sdl_request_scope(self.settings.sdl_cache_ttl), snapshot_pin_scope():
+            return await self.graph.ainvoke(resume_cmd, config=config)
     
     def chat(self, query: str) -> str:
-        result = self.invoke(f"[chat] {query}")
+        return self._chat_response(self.invoke(f"[chat] {query}"))
+
+    async def achat(self, query: str) -> str:
+        return self._chat_response(await self.ainvoke(f"[chat] {query}"))
+
+    def _chat_response(self, result: dict) -> dict:
         if "chat_response" in result:
             return {"output": result["chat_response"], "thread_id": result["thread_id"]}
         else:
             return {"output": "No chat response available.", "thread_id": result["thread_id"]}
 
     def security_analysis(self, query: str) -> str:
-        result = self.invoke(f"[security analysis] {query}")
+        return self._security_analysis_response(self.invoke(f"[security analysis] {query}"))
+
+    async def asecurity_analysis(self, query: str) -> str:
+        return self._security_analysis_response(await self.ainvoke(f"[security analysis] {query}"))
 
+    def _security_analysis_response(self, result: dict) -> dict:
         response_message = ""
         response_payload = {}
 
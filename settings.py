@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     use_hf: bool = False
     fourbit: bool = True
     atebit: bool = False
+    sdl_cache_ttl: float | None = None # seconds an SDL snapshot is shared by the tools of one request (default: SDL_CACHE_TTL)
+    sdl_watch: bool = False # keep the network data live with a background SDL watcher instead of pulling SDL per tool call
+    mitre_warmup: bool = False # load the MITRE search embedding model in the background at service start
 
     class Config:
         env_prefix = "MOBILLM_"
@@ -0,0 +1,22 @@
+import asyncio
+from types import SimpleNamespace
+from ..agents.chat_agent import ChatAgent
+
+class FakeReactAgent:
+    def invoke(self, inputs):
+        return {"messages": [SimpleNamespace(content=f"re: {inputs['messages'][0][1]}")]}
+
+    async def ainvoke(self, inputs):
+        return self.invoke(inputs)
+
+def make_agent() -> ChatAgent:
+    agent = ChatAgent.__new__(ChatAgent)
+    agent._agent = FakeReactAgent()
+    return agent
+
+def test_sync_and_async_runs_update_the_state_alike():
+    agent = make_agent()
+    sync_state = agent.run({"query": "hello"})
+    async_state = asyncio.run(agent.arun({"query": "hello"}))
+    assert sync_state == async_state == {"query": "hello", "chat_response": "re: hello", "tools_called": []}
+    assert asyncio.run(agent.arun({"query": " "})) == agent.run({"query": " "}) == {"query": " "}
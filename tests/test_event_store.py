@@ -0,0 +1,58 @@
+import itertools
+import json
+from ..tools.event_store import EventStore, query_event_ids
+
+def make_store() -> EventStore:
+    store = EventStore()
+    sources = ["MobieXpert", "MobiWatch_autoencoder_v2", "MobiWatch_lstm_v2"]
+    severities = ["Critical", "Warning"]
+    for i in range(30):
+        event = {"source": sources[i % 3], "name": f"event {i}", "cellID": str(20000 + i % 2), "ueID": str(100 + i % 5),
+                 "timestamp": str(1000 + (i * 7) % 30), "severity": severities[i % 2], "description": ""}
+        store.add("mobiexpert-event", str(i + 1), json.dumps(event), json.loads)
+    store.set_active_ue_ids(["100", "101"])
+    return store
+
+def matches(event, ue_id, cell_id, source, severity, active, start_ts, end_ts) -> bool:
+    timestamp = int(event["timestamp"])
+    return ((ue_id is None or event["ueID"] == ue_id) and (cell_id is None or event["cellID"] == cell_id)
+            and (source is None or event["source"] == source or event["source"].startswith(source + "_") or event["source"].endswith("_" + source))
+            and (severity is None or event["severity"].lower() == severity.lower()) and (active is None or event["active"] == active)
+            and (start_ts is None or timestamp >= start_ts) and (end_ts is None or timestamp <= end_ts))
+
+def test_duplicate_events_keep_their_id():
+    store = make_store()
+    value = json.dumps({"source": "MobieXpert", "name": "event 0", "cellID": "20000", "ueID": "100", "timestamp": "1000",
+                        "severity": "Critical", "description": ""})
+    assert store.add("mobiexpert-event", "99", value, json.loads) == store.get_id("mobiexpert-event", "1")
+    assert len(store) == 30
+
+def test_active_counters_follow_the_active_ues():
+    store = make_store()
+    assert store.active_count == sum(1 for e in store.events.values() if e["ueID"] in ("100", "101"))
+    store.set_active_ue_ids(["102"])
+    assert store.active_count == 6 and all(e["active"] == (e["ueID"] == "102") for e in store.events.values())
+
+def test_query_matches_a_scan_of_all_events():
+    store = make_store()
+    _, events, indexes = store.snapshot()
+    for ue_id, cell_id, source, severity, active, (start_ts, end_ts) in itertools.product(
+            [None, "100", "103"], [None, "20001"], [None, "MobieXpert", "MobiWatch", "lstm_v2"], [None, "critical"],
+            [None, True, False], [(None, None), (1005, 1020), (None, 1003)]):
+        expected = sorted((int(e["timestamp"]), i) for i, e in events.items() if matches(e, ue_id, cell_id, source, severity, active, start_ts, end_ts))
+        assert query_event_ids(events, indexes, ue_id, cell_id, source, severity, active, start_ts, end_ts) == [i for _, i in expected]
+
+def test_snapshot_view_does_not_change_with_the_store():
+    store = make_store()
+    version, events, indexes = store.snapshot()
+    ids = list(events)
+    time_index = list(indexes["timestamp"])
+    ue_ids = indexes["ueID"]["100"]
+    store.add("mobiexpert-event", "100", json.dumps({"source": "MobieXpert", "name": "late", "cellID": "20000", "ueID": "100",
+                                                      "timestamp": "990", "severity": "Critical", "description": ""}), json.loads)
+    store.set_active_ue_ids(["103"])
+    assert list(events) == ids and list(indexes["timestamp"]) == time_index and indexes["ueID"]["100"] == ue_ids
+    assert all(events[i]["active"] == (events[i]["ueID"] in ("100", "101")) for i in events)
+    _, new_events, new_indexes = store.snapshot()
+    assert len(new_events) == 31 and new_indexes["timestamp"][0] == (990, 31)
+    assert all(new_events[i]["active"] == (new_events[i]["ueID"] == "103") for i in new_events)
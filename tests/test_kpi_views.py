@@ -0,0 +1,42 @@
+from ..tools import sdl_apis
+from ..tools.kpi_views import KPIViews
+from ..tools.mobiflow_table import MobiFlowTable
+
+def ue_record(index, ue_id, rrc_msg, nas_state=0, timestamp=1749482829):
+    return f"UE;{index};v2.1;SECSM;{timestamp};20000;1;{ue_id};{ue_id};0;0;0;0;0;0;{rrc_msg}; ;2;{nas_state};0;0;0;0"
+
+def test_retry_and_null_cipher_flags():
+    table = MobiFlowTable()
+    rows = table.append_records([ue_record(1, 7, "RRCSetupRequest"), ue_record(2, 7, "RRCSetupRequest"),
+                                 ue_record(3, 7, "SecurityModeComplete")])
+    views = KPIViews()
+    views.observe_rows(table, rows)
+    kpis = views.get_cell_kpis("20000")
+    assert (kpis["ues"], kpis["setup_requests"], kpis["retries"]) == (1, 2, 1)
+    assert views.get_ues_with_flag("null_cipher") == {"20000": ["7"]}
+    views.remove_ue("20000", "7")
+    assert views.get_cell_kpis("20000")["ues"] == 0
+    assert views.get_ues_with_flag("null_cipher") == {"20000": []}
+
+def test_views_observe_again_after_reset():
+    views = KPIViews()
+    table = MobiFlowTable()
+    views.observe_rows(table, table.append_records([ue_record(100, 7, "RRCSetupRequest")]))
+    views.reset()
+    # MobiFlow indexes restart after an xApp restart
+    table = MobiFlowTable()
+    views.observe_rows(table, table.append_records([ue_record(1, 8, "RRCSetupRequest")]))
+    assert views.get_cell_kpis("20000")["ues"] == 1
+
+def test_high_water_mark_reset_resets_kpis():
+    sdl_apis.pull_mobiflow_data()
+    kpis = sdl_apis.get_cell_kpis()
+    assert len(kpis) > 0
+    sdl_apis.reset_sdl_high_water_marks()
+    assert sdl_apis.kpi_views.get_cell_kpis() == {}
+    assert sdl_apis.get_cell_kpis() == kpis
+
+def test_kpi_ue_count_matches_active_sessions():
+    sdl_apis.pull_mobiflow_data()
+    kpis = sdl_apis.get_cell_kpis()
+    assert sum(cell["ues"] for cell in kpis.values()) == len(sdl_apis.ue_sessions.sessions) > 0
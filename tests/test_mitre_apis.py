@@ -0,0 +1,32 @@
+import faiss
+import numpy as np
+import pytest
+from ..tools import mitre_apis
+from ..tools.mitre_apis import get_fight_db_name, load_or_create_mitre_fight_faiss_index
+
+class FakeEmbeddingModel:
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def encode(self, texts, **kwargs):
+        return np.random.default_rng(0).random((len(texts), self.dimension), dtype=np.float32)
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setitem(mitre_apis.embedding_models, "fake-8d", FakeEmbeddingModel(8))
+    monkeypatch.setattr(mitre_apis, "mitre_faiss_indexes", {})
+    return "fake-8d"
+
+def test_index_file_is_named_by_model():
+    assert get_fight_db_name("all-MiniLM-L6-v2") == "mitre_fight.faiss_index"
+    assert get_fight_db_name("sentence-transformers/all-mpnet-base-v2") == "mitre_fight-sentence-transformers_all-mpnet-base-v2.faiss_index"
+
+def test_index_is_cached_by_model_and_rebuilt_on_dimension_mismatch(fake_model, tmp_path):
+    db_path = str(tmp_path / get_fight_db_name(fake_model))
+    # a stale index of another dimension at the model's path
+    faiss.write_index(faiss.IndexFlatL2(4), db_path)
+    index = load_or_create_mitre_fight_faiss_index(fight_db_name=db_path, embedding_model_name=fake_model, embedding_dimension=8)
+    assert index.d == 8 and index.ntotal > 0
+    assert faiss.read_index(db_path).d == 8
+    assert mitre_apis.mitre_faiss_indexes[(db_path, fake_model)] is index
+    assert load_or_create_mitre_fight_faiss_index(fight_db_name=db_path, embedding_model_name=fake_model, embedding_dimension=8) is index
@@ -0,0 +1,59 @@
+from ..tools.mobiflow_archive import MobiFlowArchive
+from ..tools.mobiflow_table import MobiFlowTable
+
+def ue_record(index, timestamp, ue_id=7, cell_id=20000):
+    return f"UE;{index};v2.1;SECSM;{timestamp};{cell_id};1;{ue_id};{ue_id};0;001010000000001;2;2;0;2;RRCSetupRequest; ;0;0;0;3;0;0"
+
+def test_reopen_keeps_records_and_skips_duplicates(tmp_path):
+    records = [ue_record(i, 1000 + i) for i in range(10)]
+    archive = MobiFlowArchive(str(tmp_path), segment_rows=4)
+    assert archive.append_mobiflow("ue", records) == 10
+    archive.close()
+    archive = MobiFlowArchive(str(tmp_path), segment_rows=4)
+    assert archive.query("ue") == records
+    assert archive.append_mobiflow("ue", records[3:] + records[:2]) == 0
+    assert archive.query("ue", 1002, 1004) == records[2:5]
+    assert archive.query("ue", ue_id=8) == []
+
+def test_index_reset_after_reopen(tmp_path):
+    archive = MobiFlowArchive(str(tmp_path))
+    archive.append_mobiflow("ue", [ue_record(i, 1000 + i) for i in range(100)])
+    archive.close()
+    archive = MobiFlowArchive(str(tmp_path))
+    # the xApps restarted: indexes start again from 0 with later timestamps
+    restarted = [ue_record(i, 2000 + i, ue_id=8) for i in range(5)]
+    assert archive.append_mobiflow("ue", restarted) == 5
+    assert archive.append_mobiflow("ue", restarted) == 0
+    assert archive.query("ue", ue_id=8) == restarted
+    assert len(archive.query("ue")) == 105
+
+def test_index_reset_within_archived_time_range(tmp_path):
+    archive = MobiFlowArchive(str(tmp_path), segment_rows=8)
+    archive.append_mobiflow("ue", [ue_record(i, 1000 + i) for i in range(20)])
+    late = [ue_record(1, 1005, ue_id=9), ue_record(1, 1005, ue_id=9)]
+    assert archive.append_mobiflow("ue", late) == 1
+    assert archive.query("ue", ue_id=9) == late[:1]
+
+def test_append_table_rows(tmp_path):
+    archive = MobiFlowArchive(str(tmp_path))
+    table = MobiFlowTable()
+    rows = table.append_records([ue_record(i, 1000 + i) for i in range(5)])
+    assert archive.append_table_rows(table, rows) == 5
+    assert archive.append_table_rows(table, rows) == 0
+    rows = table.append_records([ue_record(0, 3000), ue_record(5, 1005)])
+    assert archive.append_table_rows(table, rows) == 2
+    assert archive.query("ue", 3000) == [ue_record(0, 3000)]
+
+def test_append_events_skips_archived_events(tmp_path, monkeypatch):
+    events = [{"id": i, "event_name": "RRC Null Cipher", "timestamp": 1000 + i, "cellID": "20000", "ueID": str(i), "active": True}
+              for i in range(10)]
+    archive = MobiFlowArchive(str(tmp_path), segment_rows=4)
+    assert archive.append_events(events) == 10
+    archive.close()
+    archive = MobiFlowArchive(str(tmp_path), segment_rows=4)
+    # events pulled again after a restart get new store-local IDs
+    assert archive.append_events([dict(e, id=e["id"] + 100) for e in events[5:]]) == 0
+    # the archive is read once, later appends dedup against the kept keys
+    monkeypatch.setattr(archive, "query", None)
+    assert archive.append_events(events[:2] + [dict(events[0], timestamp=999)]) == 1
+    assert archive.append_events([dict(events[0], timestamp=999)]) == 0
@@ -0,0 +1,16 @@
+from ..tools import mobiflow_parser
+from ..tools.mobiflow_parser import get_mobiflow_schema, parse_mobiflow_record, register_mobiflow_schema
+
+def test_parse_converts_typed_fields():
+    record = parse_mobiflow_record("UE;5;v2.1;SECSM;1749482829;20000;1;7;7;0;001010000000001;2;2;0;2;RRCSetupRequest; ;0;0;0;3;0;0")
+    assert record.Index == 5 and record.nr_cell_id == 20000 and record.reserved_field_3 == 0
+    assert record.mobile_id == "001010000000001" and record.rrc_msg == "RRCSetupRequest"
+    record = parse_mobiflow_record("BS;3;1749482829;v2.1;SECSM;20000;001;01;0001;1;1")
+    assert record.Timestamp == 1749482829 and record.tac == "0001" and record.status == 1
+
+def test_unknown_version_falls_back_to_the_latest_version(monkeypatch):
+    monkeypatch.setattr(mobiflow_parser, "mobiflow_schemas", dict(mobiflow_parser.mobiflow_schemas))
+    for version in ("v10.0", "v9.1"):
+        register_mobiflow_schema("BS", version, ["DataType", "Index"], {"Index": int})
+    assert get_mobiflow_schema("BS", "v3").version == "v10.0"
+    assert get_mobiflow_schema("BS", "v10.0").parse("BS;4") == ("BS", 4)
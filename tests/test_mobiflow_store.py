@@ -0,0 +1,23 @@
+from ..tools.mobiflow_retention import MobiFlowRetentionPolicy
+from ..tools.mobiflow_store import MobiFlowStore
+
+def ue_record(index, ue_id=7, rrc_msg="RRCReconfiguration"):
+    return f"UE;{index};v2.1;SECSM;{1749482829 + index};20000;1;{ue_id};{ue_id};0;0;2;2;0;2;{rrc_msg}; ;2;2;2;0;0;0"
+
+def test_duplicates_are_skipped():
+    store = MobiFlowStore()
+    assert len(store.add_records([ue_record(1), ue_record(2), ue_record(2)])) == 2
+    assert len(store.add_records([ue_record(1), ue_record(3)])) == 1
+    assert store.get_by("gnb_du_ue_f1ap_id", 7) == [ue_record(i) for i in (1, 2, 3)]
+
+def test_compaction_bounds_the_index_map():
+    store = MobiFlowStore()
+    store.add_records([ue_record(i) for i in range(100)])
+    removed = store.compact(MobiFlowRetentionPolicy(max_messages=10, keep_first=0))
+    assert removed == 90
+    assert len(store._rows_by_index) == len(store) == 10
+    # compacted records are not added again, later records are
+    assert len(store.add_records([ue_record(i) for i in range(50)])) == 0
+    assert len(store.add_records([ue_record(99), ue_record(100)])) == 1
+    assert store.summaries[("20000", "7")]["compacted_messages"] == 90
+    assert store.query(start_ts=1749482829 + 95) == [ue_record(i) for i in range(95, 101)]
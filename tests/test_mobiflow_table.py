@@ -0,0 +1,26 @@
+from ..tools.mobiflow_store import MobiFlowStore
+from ..tools.mobiflow_table import MobiFlowTable, build_network_view
+
+record = "UE;5;v2.1;SECSM;1749482829;20000;1;54649;0123;000456;001010000000001;2;2;0;2;RRCSetupRequest; ;0;0;0;3;0;0"
+
+def test_round_trip_keeps_leading_zeros():
+    table = MobiFlowTable()
+    rows = table.append_records([record])
+    assert table.to_records(rows) == [record]
+    assert table.get_values(rows, "mobile_id") == ["001010000000001"]
+    assert table.get_values(rows, "Index") == [5]
+
+def test_store_lookup_by_identifier_string():
+    store = MobiFlowStore()
+    store.add_records([record])
+    assert store.get_all() == [record]
+    assert store.get_by("s_tmsi", "000456") == [record]
+    assert store.get_by("s_tmsi", "456") == []
+    assert store.query(1749482829, 1749482829, rnti="0123") == [record]
+
+def test_network_view_keeps_identifier_strings():
+    table = MobiFlowTable()
+    table.append_records([record])
+    network = build_network_view({"20000": {"timestamp": "1749482800"}}, table)
+    ue = network["20000"]["ue"]["54649"]
+    assert (ue["rnti"], ue["s_tmsi"], ue["mobile_id"]) == ("0123", "000456", "001010000000001")
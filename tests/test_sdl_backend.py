@@ -0,0 +1,12 @@
+from ..tools import global_vars
+from ..tools.sdl_backend import SimulationSDLBackend, get_sdl_backend, get_simulation_sdl_backend, set_sdl_backend
+
+def test_set_backend_is_used_in_simulation_mode(tmp_path):
+    assert global_vars.simulation_mode
+    backend = SimulationSDLBackend(str(tmp_path))
+    set_sdl_backend(backend)
+    try:
+        assert get_sdl_backend() is backend
+    finally:
+        set_sdl_backend(None)
+    assert get_sdl_backend() is get_simulation_sdl_backend()
@@ -0,0 +1,82 @@
+import pytest
+from ..tools import sdl_apis
+from ..tools.sdl_backend import SimulationSDLBackend, set_sdl_backend
+
+def ue_record(index):
+    return f"UE;{index};v2.1;SECSM;{1749482829 + index};20000;1;7;7;0;0;2;2;0;2;RRCSetupRequest; ;0;0;0;3;0;0"
+
+@pytest.fixture
+def sdl(tmp_path):
+    backend = SimulationSDLBackend(str(tmp_path))
+    set_sdl_backend(backend)
+    sdl_apis.reset_sdl_high_water_marks()
+    yield backend
+    set_sdl_backend(None)
+    sdl_apis.reset_sdl_high_water_marks()
+
+class PartialSDLBackend(SimulationSDLBackend):
+    '''
+    Simulation backend whose next get misses the given keys, as a failed kubectl / Redis batch would.
+    '''
+    missing = set()
+
+    def get(self, namespace: str, keys: list) -> dict:
+        values = super().get(namespace, [k for k in keys if int(k) not in self.missing])
+        self.missing = set()
+        return values
+
+def test_incremental_fetch_skips_key_gaps(sdl):
+    indexes = list(range(0, 10)) + list(range(500, 510))
+    sdl.set("ue_mobiflow", {i: ue_record(i) for i in indexes})
+    assert sdl_apis.fetch_new_mobiflow_data("ue_mobiflow", sdl_apis.get_ue_mobiflow_data_by_index) == [ue_record(i) for i in indexes]
+    assert sdl_apis.fetch_new_mobiflow_data("ue_mobiflow", sdl_apis.get_ue_mobiflow_data_by_index) == []
+    # keys written after a gap of more than one probe batch
+    sdl.set("ue_mobiflow", {1000: ue_record(1000)})
+    assert sdl_apis.fetch_new_mobiflow_data("ue_mobiflow", sdl_apis.get_ue_mobiflow_data_by_index) == [ue_record(1000)]
+
+def test_incremental_pull_ingests_all_records(sdl):
+    sdl.set("ue_mobiflow", {i: ue_record(i) for i in range(0, 1000, 3)})
+    sdl_apis.pull_mobiflow_data()
+    assert len(sdl_apis.ue_mobiflow_store) == len(range(0, 1000, 3))
+    sdl.set("ue_mobiflow", {i: ue_record(i) for i in range(1500, 1510)})
+    sdl_apis.pull_mobiflow_data()
+    assert len(sdl_apis.ue_mobiflow_store) == len(range(0, 1000, 3)) + 10
+
+def test_incremental_event_fetch_reads_all_new_keys(sdl):
+    events = {i: f"{i};RRC Null Cipher;20000;1749482829;7;desc;Critical" for i in range(1, 251)}
+    sdl.set("mobiexpert-event", events)
+    assert list(sdl_apis.fetch_new_sdl_items(sdl, "mobiexpert-event")) == [str(i) for i in range(1, 251)]
+    assert sdl_apis.fetch_new_sdl_items(sdl, "mobiexpert-event") == {}
+
+def test_failed_fetch_does_not_advance_the_high_water_mark(tmp_path):
+    backend = PartialSDLBackend(str(tmp_path))
+    set_sdl_backend(backend)
+    sdl_apis.reset_sdl_high_water_marks()
+    try:
+        backend.set("ue_mobiflow", {i: ue_record(i) for i in range(10)})
+        backend.set("mobiexpert-event", {i: f"{i};RRC Null Cipher;20000;1749482829;7;desc;Critical" for i in range(1, 11)})
+        backend.missing = {4}
+        assert sdl_apis.fetch_new_mobiflow_data("ue_mobiflow", sdl_apis.get_ue_mobiflow_data_by_index) == [ue_record(i) for i in range(10) if i != 4]
+        assert sdl_apis.sdl_high_water_marks["ue_mobiflow"] == 3
+        # the missing record is read again, with the records after it
+        assert sdl_apis.fetch_new_mobiflow_data("ue_mobiflow", sdl_apis.get_ue_mobiflow_data_by_index) == [ue_record(i) for i in range(4, 10)]
+        assert sdl_apis.sdl_high_water_marks["ue_mobiflow"] == 9
+
+        backend.missing = set(range(1, 11))
+        assert sdl_apis.fetch_new_sdl_items(backend, "mobiexpert-event") == {}
+        assert "mobiexpert-event" not in sdl_apis.sdl_high_water_marks
+        assert list(sdl_apis.fetch_new_sdl_items(backend, "mobiexpert-event")) == [str(i) for i in range(1, 11)]
+    finally:
+        set_sdl_backend(None)
+        sdl_apis.reset_sdl_high_water_marks()
+
+def test_fetch_sdl_data_is_incremental_by_default(sdl):
+    sdl.set("ue_mobiflow", {i: ue_record(i) for i in range(10)})
+    sdl_apis.fetch_sdl_data_osc()
+    store = sdl_apis.ue_mobiflow_store
+    sdl.set("ue_mobiflow", {10: ue_record(10)})
+    sdl_apis.fetch_sdl_data_osc()
+    assert sdl_apis.ue_mobiflow_store is store and len(store) == 11
+    # an explicit full reload rebuilds the store from all records
+    sdl_apis.fetch_sdl_data_osc(incremental=False)
+    assert sdl_apis.ue_mobiflow_store is not store and len(sdl_apis.ue_mobiflow_store) == 11
@@ -0,0 +1,39 @@
+import subprocess
+import pytest
+from ..tools import sdl_backend
+from ..tools.sdl_backend import KubectlSDLBackend, SimulationSDLBackend
+from ..tools.sdl_loader import SDLBulkLoader, get_last_sdl_key
+
+class FailingSDLBackend(SimulationSDLBackend):
+    '''
+    Simulation backend whose writes fail after a number of successful chunks.
+    '''
+    def __init__(self, data_dir: str, fail_after: int):
+        super().__init__(data_dir)
+        self.fail_after = fail_after
+
+    def set(self, namespace: str, items: dict):
+        if self.fail_after == 0:
+            raise RuntimeError("write failed")
+        self.fail_after -= 1
+        super().set(namespace, items)
+
+def test_kubectl_set_raises_on_pipe_errors(monkeypatch):
+    result = subprocess.CompletedProcess([], 0, stdout=b"All data transferred. errors: 1, replies: 1", stderr=b"")
+    monkeypatch.setattr(sdl_backend.subprocess, "run", lambda *args, **kwargs: result)
+    with pytest.raises(RuntimeError):
+        KubectlSDLBackend("pod", "ns").set("ue_mobiflow", {"1": "a"})
+
+def test_failed_chunk_stops_the_load_and_resume_continues(tmp_path):
+    data_file = tmp_path / "data.csv"
+    data_file.write_text("".join(f"line{i}\n" for i in range(1, 11)))
+    backend = FailingSDLBackend(str(tmp_path), fail_after=2)
+    with pytest.raises(RuntimeError):
+        SDLBulkLoader(backend, chunk_size=3, verbose=False).load_file(str(data_file), "test")
+    # the two chunks written before the failure stay, the failed chunk is not skipped
+    assert get_last_sdl_key(backend, "test") == 6
+
+    backend.fail_after = -1
+    stats = SDLBulkLoader(backend, chunk_size=3, verbose=False).load_file(str(data_file), "test")
+    assert stats.start_key == 6 and stats.records == 4
+    assert sorted(int(key) for key in backend.get_keys("test")) == list(range(1, 11))
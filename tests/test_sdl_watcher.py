@@ -0,0 +1,48 @@
+from ..tools.sdl_backend import RedisSDLBackend
+from ..tools.sdl_watcher import PollChangeFeed, RedisKeyspaceChangeFeed, create_sdl_change_feed, keyspace_notifications_enabled
+
+class RedisClient:
+    '''
+    Records the CONFIG commands sent to the Redis server.
+    '''
+    def __init__(self, flags):
+        self.flags = flags
+        self.config_sets = []
+
+    def config_get(self, name):
+        return {name: self.flags}
+
+    def config_set(self, name, value):
+        self.config_sets.append((name, value))
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return PubSub()
+
+class PubSub:
+    def psubscribe(self, *patterns):
+        self.patterns = patterns
+
+    def close(self):
+        pass
+
+def test_notification_flags():
+    assert keyspace_notifications_enabled("K$g")
+    assert keyspace_notifications_enabled("AKE")
+    assert not keyspace_notifications_enabled("")
+    assert not keyspace_notifications_enabled("E$")
+
+def test_server_config_is_not_changed_by_default():
+    client = RedisClient(b"")
+    feed = create_sdl_change_feed(RedisSDLBackend(client=client), ["ue_mobiflow"], 0.5)
+    assert isinstance(feed, PollChangeFeed)
+    assert client.config_sets == []
+
+    client = RedisClient(b"AKE")
+    assert isinstance(create_sdl_change_feed(RedisSDLBackend(client=client), ["ue_mobiflow"]), RedisKeyspaceChangeFeed)
+    assert client.config_sets == []
+
+def test_configure_notifications_explicitly():
+    client = RedisClient("")
+    feed = create_sdl_change_feed(RedisSDLBackend(client=client), ["ue_mobiflow"], configure_notifications=True)
+    assert isinstance(feed, RedisKeyspaceChangeFeed)
+    assert client.config_sets == [("notify-keyspace-events", "K$g")]
@@ -0,0 +1,17 @@
+import asyncio
+from ..tools.service_status import FakeServiceSource, ServiceStatusCache
+
+def test_status_line_starts_with_the_label():
+    pods, containers = FakeServiceSource(), FakeServiceSource()
+    pods.set("ricplt-e2mgr-7d9f", since=0)
+    containers.set("mobiflow-agent", restart_count=2, since=0)
+    cache = ServiceStatusCache([pods, containers], {"E2 Manager": "e2mgr", "MobiFlow Agent": "mobiflow-agent"},
+                               labels={"MobiFlow Agent": "MobiFlow Agent"})
+    status = cache.get_status()
+    assert status["E2 Manager"].startswith("ricplt-e2mgr-7d9f;1/1;Running;0;")
+    assert status["MobiFlow Agent"].startswith("MobiFlow Agent;1/1;Running;2;")
+    assert asyncio.run(cache.aget_status())["MobiFlow Agent"].startswith("MobiFlow Agent;")
+
+    containers.remove("mobiflow-agent")
+    cache.refresh()
+    assert cache.get_status()["MobiFlow Agent"] == ""
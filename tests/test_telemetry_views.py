@@ -0,0 +1,20 @@
+import re
+from ..tools import sdl_apis
+from ..tools.telemetry_views import null_security_flags, summarize_network
+
+def test_summary_counts_active_ues_in_simulation_mode():
+    snapshot = sdl_apis.refresh_network_snapshot()
+    assert len(snapshot.active_ue_ids) > 0
+    assert all(isinstance(ue_id, str) for ue_id in snapshot.active_ue_ids)
+    active = int(re.search(r"\bactive=(\d+)", sdl_apis.get_network_summary(snapshot)).group(1))
+    assert active == len(set(snapshot.active_ue_ids)) > 0
+
+def test_summarize_network_matches_active_ids_as_str():
+    network = {"20000": {"ue": {"1": {"mobiflow": [], "s_tmsi": "0", "rrc_cipher_alg": "2", "rrc_integrity_alg": "2",
+                                      "nas_cipher_alg": "0", "nas_integrity_alg": "2"}}}}
+    assert summarize_network(network, active_ue_ids={"1"})["cells"]["20000"]["active"] == 1
+
+def test_null_security_flags_match_int_and_str_algorithms():
+    assert null_security_flags((0, 0, 2, 0), secured=True, registered=True) == ["null_cipher", "null_integrity", "nas_null_integrity"]
+    assert null_security_flags(("0", "0", "2", "0"), secured=True, registered=True) == ["null_cipher", "null_integrity", "nas_null_integrity"]
+    assert null_security_flags(("0", "0", "2", "0"), secured=False) == []
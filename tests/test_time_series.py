@@ -0,0 +1,28 @@
+from ..tools.time_series import TimeSeries
+
+def test_rollups_min_max_avg():
+    series = TimeSeries(raw_capacity=4, rollups=((60, 10),))
+    for ts, value in ((0, 1), (10, 5), (20, 3), (60, 7), (70, 9)):
+        series.append(ts, value)
+    assert series.get_rollup(60) == {0: {"min": 1, "max": 5, "avg": 3.0}, 60: {"min": 7, "max": 9, "avg": 8.0}}
+    assert series.get_raw() == {10: 5, 20: 3, 60: 7, 70: 9}
+
+def test_same_timestamp_replaces_the_sample_in_the_rollups():
+    series = TimeSeries(rollups=((60, 10),))
+    series.append(0, 2)
+    series.append(10, 100)
+    series.append(10, 4)
+    assert series.get_raw() == {0: 2, 10: 4}
+    assert series.get_rollup(60) == {0: {"min": 2, "max": 4, "avg": 3.0}}
+    series.append(20, 6)
+    series.append(20, 6)
+    assert series.get_rollup(60) == {0: {"min": 2, "max": 6, "avg": 4.0}}
+
+def test_raw_window_keeps_the_last_samples():
+    series = TimeSeries(raw_capacity=90)
+    for i in range(100):
+        series.append(1000 + 10 * i, i)
+    # the raw window is the last 90 samples, however old they are
+    raw = series.get_window(900, end_ts=10 ** 9)
+    assert list(raw.values()) == list(range(10, 100))
+    assert series.get_window(3600, 60, end_ts=1000 + 10 * 99) == series.get_rollup(60, 1000 + 10 * 99 - 3600 - 59)
@@ -0,0 +1,16 @@
+import asyncio
+import os
+from ..tools import global_vars
+from ..tools.sdl_apis import aunDeploy_xapp_osc
+
+def test_async_undeploy_runs_in_the_xapp_dir_without_changing_cwd(tmp_path, monkeypatch):
+    monkeypatch.setattr(global_vars, "simulation_mode", False)
+    monkeypatch.setenv("XAPP_ROOT_PATH", str(tmp_path))
+    xapp_dir = tmp_path / "MobieXpert"
+    xapp_dir.mkdir()
+    (xapp_dir / "undeploy.sh").write_text("#!/bin/sh\npwd > undeploy.out\n")
+    cwd = os.getcwd()
+    result, status = asyncio.run(aunDeploy_xapp_osc("MobieXpert xApp"))
+    assert status == 200 and "error" not in result
+    assert (xapp_dir / "undeploy.out").read_text().strip() == str(xapp_dir)
+    assert os.getcwd() == cwd
@@ -1,6 +1,7 @@
 import subprocess
 import os
 import time
+import asyncio
 from ..utils import *
 from langchain.tools import tool
 from langgraph.types import interrupt
@@ -78,22 +79,43 @@ def update_oai_ran_cu_config(config_data: str, oai_ran_cu_config_path: str) -> s
     except Exception as e:
         return f"Error updating OAI RAN CU configuration: {e}"
 
-@tool
-def reboot_ran_cu_tool() -> str:
+def request_reboot_ran_cu_approval() -> str:
     '''
-    Reboot the RAN CU. The invocation will be sent to the human in the loop for approval or edits.
+    Send the RAN CU reboot to the human in the loop for approval. Returns None if it is approved, otherwise the
+    answer of the tool.
     '''
     response = interrupt(  
         f"Trying to call `reboot_ran_cu_tool` (no argument provided)."
         "Please approve or suggest edits."
     )
     if response["type"] == "accept":
-        return reboot_oai_ran()
+        return None
     elif response["type"] == "deny":
         return "reboot_ran_cu_tool operation denied by the user."
     else:
         return f"Unknown response type: {response['type']}"
 
+@tool
+def reboot_ran_cu_tool() -> str:
+    '''
+    Reboot the RAN CU. The invocation will be sent to the human in the loop for approval or edits.
+    '''
+    answer = request_reboot_ran_cu_approval()
+    if answer is not None:
+        return answer
+    return reboot_oai_ran()
+
+async def areboot_ran_cu() -> str:
+    '''
+    Async variant of reboot_ran_cu_tool, the reboot runs in a worker thread.
+    '''
+    answer = request_reboot_ran_cu_approval()
+    if answer is not None:
+        return answer
+    return await asyncio.to_thread(reboot_oai_ran)
+
+reboot_ran_cu_tool.coroutine = areboot_ran_cu
+
 def reboot_oai_ran() -> str:
     '''
     Reboot the OAI RAN CU.
@@ -121,7 +143,7 @@ def reboot_oai_ran() -> str:
         # Run docker-compose commands in that directory
         res = subprocess.run(["./run_gnb_1_demo.sh"], cwd=oai_ran_cu_path, check=True)
         if res.returncode != 0:
-            return "Error while shutting down mobiflow-agent-1 containers"
+            return "Error while starting RAN containers"
 
         # res = subprocess.run(["docker-compose", "restart", "oai-cu-1", "oai-du-1"], cwd=oai_ran_cu_path, check=True)
         # if res.returncode != 0:
@@ -142,4 +164,4 @@ def reboot_oai_ran() -> str:
     except subprocess.CalledProcessError as e:
         return f"Error while restarting OAI containers: {e}"
     except Exception as e:
-        return f"Unexpected error: {e}"
\ No newline at end of file
+        return f"Unexpected error: {e}"
@@ -0,0 +1,292 @@
+'''
+Persistent in-memory store of MobieXpert / MobiWatch events with stable event IDs.
+
+Events are keyed by (SDL namespace, SDL key) and deduplicated by a hash of their content, so the same event keeps
+its ID across polls (and across xApp restarts that write it again under a new key). Each event is parsed once,
+and its "active" flag is only recomputed for the UEs whose active state changed. A sorted timestamp index serves
+time-range queries with bisect lookups, and query_event_ids evaluates event predicates against the indexes.
+
+Event IDs increase and timestamps arrive almost in order, so the event list, the indexes and the timestamp index
+are append-only lists. A snapshot() view shares them with the store and is bounded by the highest event ID and the
+timestamp index length of its version, so taking a view copies nothing.
+'''
+import time
+import bisect
+import hashlib
+import threading
+from collections.abc import Mapping, Sequence
+
+class EventStore:
+    '''
+    Store of network events with UE / cell indexes, first / last seen times and active event counters.
+    Event dicts are never modified once stored; an update replaces the dict, so shallow copies of the store
+    are consistent views.
+    '''
+    indexed_fields = ["ueID", "cellID", "source", "severity"]
+
+    def __init__(self):
+        self.events = {}  # event ID -> event
+        self.indexes = {field: {} for field in self.indexed_fields}  # field -> value -> list of event IDs, ascending
+        self.time_index = []  # (event timestamp, event ID) sorted by timestamp
+        self._event_list = []  # the events as added (event ID - 1 -> event), shared with the views
+        self.first_seen = {}  # event ID -> time the event was first pulled
+        self.last_seen = {}  # event ID -> time the event was last pulled
+        self.version = 0  # incremented whenever an event is added or changed
+        self.active_count = 0
+        self.active_critical_count = 0
+        self._next_id = 1
+        self._ids_by_key = {}  # (namespace, key) -> event ID
+        self._ids_by_hash = {}  # content hash -> event ID
+        self._active_ue_ids = frozenset()
+        self._time_index_shared = False  # whether a view holds the current time_index list
+        self._snapshot = None  # (version, events, indexes) of the last snapshot() call
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, namespace: str, key: str, value: str, parse) -> int:
+        '''
+        Add the raw SDL value of an event. Events already in the store only get their last seen time updated.
+        Args:
+            namespace (str): the SDL namespace
+            key (str): the SDL key
+            value (str): the raw SDL value
+            parse (function): function that parses the raw value into an event dict (without "id"), or returns
+                None for values that are not events
+        Returns:
+            int: the event ID, or None if the value is not an event
+        '''
+        digest = hashlib.sha1(f"{namespace};{value}".encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            event_id = self._ids_by_hash.get(digest)
+            if event_id is not None:
+                self._ids_by_key[(namespace, str(key))] = event_id
+                self.last_seen[event_id] = now
+                return event_id
+            event_data = parse(value)
+            if event_data is None:
+                return None
+            event_id = self._next_id
+            self._next_id += 1
+            event = {"id": event_id}
+            event.update(event_data)
+            event["active"] = event["ueID"] in self._active_ue_ids
+            self.events[event_id] = event
+            self._event_list.append(event)
+            self._ids_by_hash[digest] = event_id
+            self._ids_by_key[(namespace, str(key))] = event_id
+            self.first_seen[event_id] = now
+            self.last_seen[event_id] = now
+            for field, field_index in self.indexes.items():
+                ids = field_index.get(event[field])
+                if ids is None:
+                    field_index[event[field]] = [event_id]
+                else:
+                    ids.append(event_id)
+            timestamp = parse_event_timestamp(event["timestamp"])
+            if timestamp is not None:
+                if len(self.time_index) == 0 or (timestamp, event_id) > self.time_index[-1]:
+                    self.time_index.append((timestamp, event_id))
+                else:
+                    # an out-of-order timestamp is inserted into a copy if a view holds the list
+                    if self._time_index_shared:
+                        self.time_index = list(self.time_index)
+                        self._time_index_shared = False
+                    bisect.insort(self.time_index, (timestamp, event_id))
+            self._count(event, 1)
+            self.version += 1
+            return event_id
+
+    def get_id(self, namespace: str, key: str) -> int:
+        '''
+        Return the ID of the event stored under an SDL key, or None.
+        '''
+        return self._ids_by_key.get((namespace, str(key)))
+
+    def _count(self, event: dict, delta: int):
+        if event["active"]:
+            self.active_count += delta
+            if event["severity"] == "Critical":
+                self.active_critical_count += delta
+
+    def set_active_ue_ids(self, ue_ids):
+        '''
+        Mark the events of the given UEs active and all other events inactive. Only the events of the UEs whose
+        active state changed since the last call are updated.
+        '''
+        ue_ids = frozenset(str(ue_id) for ue_id in ue_ids)
+        with self._lock:
+            changed_ue_ids = ue_ids ^ self._active_ue_ids
+            self._active_ue_ids = ue_ids
+            for ue_id in changed_ue_ids:
+                active = ue_id in ue_ids
+                for event_id in self.indexes["ueID"].get(ue_id, ()):
+                    event = self.events[event_id]
+                    if event["active"] == active:
+                        continue
+                    self._count(event, -1)
+                    self.events[event_id] = dict(event, active=active)
+                    self._count(self.events[event_id], 1)
+                    self.version += 1
+
+    def snapshot(self) -> tuple:
+        '''
+        Return a consistent view of the store as (version, events, indexes): read-only mappings bounded by the
+        highest event ID of this version, with the "active" flags of this version. Nothing is copied, events added
+        later are not visible in the view. indexes["timestamp"] is the sorted timestamp index, see
+        get_ids_in_time_range. The view is reused until the store changes.
+        '''
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != self.version:
+                max_id = len(self._event_list)
+                indexes = {field: EventIndexView(field_index, max_id) for field, field_index in self.indexes.items()}
+                indexes["timestamp"] = TimeIndexView(self.time_index, len(self.time_index))
+                self._time_index_shared = True
+                self._snapshot = (self.version, EventView(self._event_list, max_id, self._active_ue_ids), indexes)
+            return self._snapshot
+
+class EventView(Mapping):
+    '''
+    Event ID -> event mapping of a store version: the first max_id events of the store's event list, with the
+    "active" flag computed from the active UEs of the version.
+    '''
+    def __init__(self, event_list: list, max_id: int, active_ue_ids: frozenset):
+        self._event_list = event_list
+        self._max_id = max_id
+        self._active_ue_ids = active_ue_ids
+
+    def __getitem__(self, event_id):
+        if not isinstance(event_id, int) or not 0 < event_id <= self._max_id:
+            raise KeyError(event_id)
+        event = self._event_list[event_id - 1]
+        active = event["ueID"] in self._active_ue_ids
+        return event if event["active"] == active else dict(event, active=active)
+
+    def __iter__(self):
+        return iter(range(1, self._max_id + 1))
+
+    def __len__(self):
+        return self._max_id
+
+    def __contains__(self, event_id):
+        return isinstance(event_id, int) and 0 < event_id <= self._max_id
+
+class EventIndexView(Mapping):
+    '''
+    Value -> event IDs mapping of an indexed field, bounded by the highest event ID of a store version.
+    '''
+    def __init__(self, field_index: dict, max_id: int):
+        self._field_index = field_index
+        self._max_id = max_id
+
+    def __getitem__(self, value) -> list:
+        ids = self._field_index[value]
+        # the ID lists are ascending, only the IDs added after the version are cut
+        n = bisect.bisect_right(ids, self._max_id)
+        if n == 0:
+            raise KeyError(value)
+        return ids[:n]
+
+    def __iter__(self):
+        return iter([value for value in tuple(self._field_index) if value in self])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, value):
+        ids = self._field_index.get(value)
+        return ids is not None and len(ids) > 0 and ids[0] <= self._max_id
+
+class TimeIndexView(Sequence):
+    '''
+    The first length entries of a sorted (timestamp, event ID) list. The store appends to the list, or inserts
+    into a copy once a view holds it, so the entries of the view do not change.
+    '''
+    def __init__(self, time_index: list, length: int):
+        self._time_index = time_index
+        self._length = length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._length)
+            return self._time_index[start:stop:step]
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        return self._time_index[i]
+
+    def __len__(self):
+        return self._length
+
+def parse_event_timestamp(value) -> int:
+    '''
+    Parse an event timestamp (epoch seconds) into an int, or None if it is not a number.
+    '''
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def get_ids_in_time_range(time_index, start_ts: int = None, end_ts: int = None) -> list:
+    '''
+    Return the IDs of the events with start_ts <= timestamp <= end_ts from a sorted timestamp index, in time order.
+    '''
+    lo = 0 if start_ts is None else bisect.bisect_left(time_index, (start_ts,))
+    hi = len(time_index) if end_ts is None else bisect.bisect_left(time_index, (end_ts + 1,))
+    return [event_id for _, event_id in time_index[lo:hi]]
+
+def query_event_ids(events: dict, indexes: dict, ue_id=None, cell_id=None, source: str = None, severity: str = None,
+                    active: bool = None, start_ts: int = None, end_ts: int = None) -> list:
+    '''
+    Return the IDs of the events matching all given predicates, in time order, from a snapshot() view of the store.
+    Only the events of the most selective indexed predicate (or of the time range) are looked up, the other
+    predicates, the active flag and the time range are checked on them.
+    Args:
+        events (dict): event ID -> event
+        indexes (dict): field -> value -> event IDs, and "timestamp" -> sorted (timestamp, event ID)
+        ue_id, cell_id: the UE / cell ID
+        source (str): the source, either the full name (e.g., "MobieXpert", "MobiWatch_lstm_v2"), the MobiWatch
+            model name (e.g., "autoencoder_v2") or "MobiWatch" for all MobiWatch models
+        severity (str): the severity (e.g., "Critical"), case-insensitive
+        active (bool): whether the events are related to active UEs
+        start_ts, end_ts (int): the time range (epoch seconds, inclusive)
+    '''
+    # (field, accepted values) of the indexed predicates
+    predicates = []
+    if ue_id is not None:
+        predicates.append(("ueID", {str(ue_id)}))
+    if cell_id is not None:
+        predicates.append(("cellID", {str(cell_id)}))
+    if source is not None:
+        predicates.append(("source", {v for v in indexes["source"] if v == source or v.startswith(source + "_") or v.endswith("_" + source)}))
+    if severity is not None:
+        predicates.append(("severity", {v for v in indexes["severity"] if v.lower() == severity.lower()}))
+
+    time_range = start_ts is not None or end_ts is not None
+    if len(predicates) == 0:
+        # the time index is the candidate set, already in time order
+        ids = get_ids_in_time_range(indexes["timestamp"], start_ts, end_ts) if time_range else sorted(events, key=lambda i: (parse_event_timestamp(events[i]["timestamp"]) or 0, i))
+        return [i for i in ids if active is None or events[i]["active"] == active]
+    # scan the smallest index entry (or time range), the other predicates are checked on its events only
+    sizes = [sum(len(indexes[field].get(v, ())) for v in values) for field, values in predicates]
+    field, values = predicates[sizes.index(min(sizes))]
+    candidates = (event_id for v in values for event_id in indexes[field].get(v, ()))
+    if time_range:
+        time_ids = get_ids_in_time_range(indexes["timestamp"], start_ts, end_ts)
+        if len(time_ids) < min(sizes):
+            candidates = time_ids
+    matched = []
+    for event_id in candidates:
+        event = events.get(event_id)
+        if event is None or (active is not None and event["active"] != active):
+            continue
+        if not all(event[f] in vs for f, vs in predicates):
+            continue
+        timestamp = parse_event_timestamp(event["timestamp"])
+        if time_range and (timestamp is None or (start_ts is not None and timestamp < start_ts) or (end_ts is not None and timestamp > end_ts)):
+            continue
+        matched.append((timestamp or 0, event_id))
+    return [event_id for _, event_id in sorted(matched)]
@@ -4,5 +4,43 @@ This module contains global variables used across the server application.
 import os
 
 simulation_mode = os.environ.get('SIMULATION_MODE', True) != 'false'
+# directory of the sample data served in simulation mode (default: tools/5G-Sample-Data)
+simulation_data_dir = os.environ.get('SIMULATION_DATA_DIR')
 
-mitre_faiss_db = None
\ No newline at end of file
+mitre_faiss_db = None
+# sentence embedding model of the MITRE FiGHT technique search (model name or local path)
+mitre_embedding_model = os.environ.get('MITRE_EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+
+# SDL backend: "kubectl" (sdlcli through kubectl exec) or "redis" (direct connection to the RIC dbaas)
+sdl_backend = os.environ.get('SDL_BACKEND', 'kubectl')
+sdl_dbaas_pod_name = os.environ.get('SDL_DBAAS_POD_NAME', 'statefulset-ricplt-dbaas-server-0')
+sdl_dbaas_pod_namespace = os.environ.get('SDL_DBAAS_POD_NAMESPACE', 'ricplt')
+sdl_redis_host = os.environ.get('DBAAS_SERVICE_HOST', 'service-ricplt-dbaas-tcp.ricplt')
+sdl_redis_port = int(os.environ.get('DBAAS_SERVICE_PORT', 6379))
+sdl_batch_size = int(os.environ.get('SDL_BATCH_SIZE', 20)) # max number of keys per sdlcli get
+sdl_max_in_flight = int(os.environ.get('SDL_MAX_IN_FLIGHT', 8)) # max number of concurrent sdlcli batches
+
+# poll interval (seconds) of the SDL watcher when the backend has no change notifications
+sdl_watch_poll_interval = float(os.environ.get('SDL_WATCH_POLL_INTERVAL', 1))
+# let the SDL watcher enable keyspace notifications on the dbaas Redis (a server-wide CONFIG SET shared by all tenants)
+sdl_watch_configure_notifications = os.environ.get('SDL_WATCH_CONFIGURE_NOTIFICATIONS', 'false') == 'true'
+
+# seconds without MobiFlow messages after which a UE session expires and the UE is evicted from the network data
+ue_session_idle_timeout = float(os.environ.get('UE_SESSION_IDLE_TIMEOUT', 600))
+
+# max age (seconds) of the cached service status, also the refresh interval of the background refresher
+service_status_ttl = float(os.environ.get('SERVICE_STATUS_TTL', 10))
+
+# retention of the per-UE MobiFlow history, older messages are compacted into summary counters
+mobiflow_max_messages_per_ue = int(os.environ.get('MOBIFLOW_MAX_MESSAGES_PER_UE', 200))
+mobiflow_max_age = float(os.environ.get('MOBIFLOW_MAX_AGE', 0)) # seconds, 0 keeps messages of any age
+
+# directory of the on-disk MobiFlow / event archive (disabled if not set) and max number of rows per segment file
+mobiflow_archive_dir = os.environ.get('MOBIFLOW_ARCHIVE_DIR')
+mobiflow_archive_segment_rows = int(os.environ.get('MOBIFLOW_ARCHIVE_SEGMENT_ROWS', 65536))
+
+# approximate max number of LLM tokens of the aggregate views returned by the summary tools
+tool_token_budget = int(os.environ.get('TOOL_TOKEN_BUDGET', 2000))
+
+# default lifetime (seconds) of the request-scoped SDL snapshot cache
+sdl_cache_ttl = float(os.environ.get('SDL_CACHE_TTL', 10))
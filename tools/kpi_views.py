@@ -0,0 +1,237 @@
+'''
+Materialized per-cell and per-UE KPI views over the UE MobiFlow records.
+
+The views are updated incrementally with each batch of ingested records, so KPI questions (e.g., how many UEs of a
+cell use the null RRC cipher, which cell has the most RRCSetupRequest retries) are answered by dict reads instead of
+a scan over the MobiFlow data. Message counters are cumulative; UE counts, algorithm distributions and security
+posture flags cover the UEs currently tracked, a UE is removed when its session expires.
+'''
+import threading
+import numpy as np
+from collections import Counter
+from .telemetry_views import algorithm_fields, null_security_flags
+
+posture_flags = ["null_cipher", "null_integrity", "nas_null_integrity", "attach_retry"]
+
+class UEPosture:
+    '''
+    Security posture and attach state of a UE in a cell.
+    '''
+    __slots__ = ["nr_cell_id", "ue_id", "msgs", "first_seen", "last_seen", "alg", "s_tmsi", "rrc_state", "nas_state",
+                 "rrc_sec_state", "secured", "registered", "released", "setup_requests", "retries", "attach_pending", "flags"]
+
+    def __init__(self, nr_cell_id: str, ue_id: str, timestamp: int):
+        self.nr_cell_id = nr_cell_id
+        self.ue_id = ue_id
+        self.msgs = 0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.alg = None
+        self.s_tmsi = "0"
+        self.rrc_state = self.nas_state = self.rrc_sec_state = 0
+        self.secured = self.registered = self.released = False
+        self.setup_requests = 0
+        self.retries = 0  # RRCSetupRequests sent again before the previous attach completed the NAS registration
+        self.attach_pending = False
+        self.flags = frozenset()
+
+    def to_dict(self) -> dict:
+        posture = {name: getattr(self, name) for name in self.__slots__ if name not in ("alg", "flags", "attach_pending")}
+        posture.update(zip(algorithm_fields, self.alg))
+        posture["flags"] = sorted(self.flags)
+        return posture
+
+class CellKPIs:
+    '''
+    KPI counters of a cell.
+    '''
+    def __init__(self):
+        self.ues = 0
+        self.msgs = 0
+        self.setup_requests = 0
+        self.retries = 0
+        self.registrations = 0
+        self.releases = 0
+        self.rrc_msg = Counter()
+        self.nas_msg = Counter()
+        self.algorithms = {field: Counter() for field in algorithm_fields}  # field -> value -> number of UEs
+        self.flag_ues = {flag: set() for flag in posture_flags}  # flag -> IDs of the UEs with the flag
+
+    def to_dict(self) -> dict:
+        return {
+            "ues": self.ues,
+            "msgs": self.msgs,
+            "setup_requests": self.setup_requests,
+            "retries": self.retries,
+            "registrations": self.registrations,
+            "attach_success_ratio": round(self.registrations / self.setup_requests, 3) if self.setup_requests else None,
+            "releases": self.releases,
+            "algorithms": {field: {v: n for v, n in counts.items() if n > 0} for field, counts in self.algorithms.items()},
+            "flags": {flag: len(ues) for flag, ues in self.flag_ues.items()},
+            "rrc_msg": dict(self.rrc_msg),
+            "nas_msg": dict(self.nas_msg),
+        }
+
+class KPIViews:
+    '''
+    Per-cell KPIs and per-UE security posture, maintained from the rows of a MobiFlowTable.
+    '''
+    setup_request_message = "RRCSetupRequest"
+    security_complete_message = "SecurityModeComplete"
+    release_messages = ["RRCRelease", "Deregistrationrequest", "Deregistrationaccept"]
+    # nas_state value of EMM_REGISTERED
+    nas_registered_state = 2
+
+    def __init__(self):
+        self.cells = {}  # nr_cell_id -> CellKPIs
+        self.ues = {}  # (nr_cell_id, ue_id) -> UEPosture
+        self.last_index = -1  # highest MobiFlow index observed by observe_rows
+        self._lock = threading.RLock()
+
+    def reset(self):
+        with self._lock:
+            self.cells.clear()
+            self.ues.clear()
+            self.last_index = -1
+
+    def observe_rows(self, table, rows):
+        '''
+        Update the views with the given rows of a MobiFlowTable. Rows whose MobiFlow index has already been
+        observed are skipped, so a rebuilt table can be passed again.
+        '''
+        with self._lock:
+            indexes = table.column("Index")[rows]
+            rows = np.asarray(rows)[indexes > self.last_index]
+            if len(rows) == 0:
+                return
+            names = ["nr_cell_id", "gnb_du_ue_f1ap_id", "Timestamp", "rrc_msg", "nas_msg", "rrc_state", "nas_state", "rrc_sec_state", "s_tmsi"] + algorithm_fields
+            columns = [table.get_values(rows, name) for name in names]
+            for values in zip(*columns):
+                self.observe(*values[:9], tuple(values[9:]))
+            self.last_index = max(self.last_index, int(indexes.max()))
+
+    def observe(self, nr_cell_id, ue_id, timestamp: int, rrc_msg: str, nas_msg: str, rrc_state: int, nas_state: int,
+                rrc_sec_state: int, s_tmsi: str, alg: tuple):
+        '''
+        Update the views with one MobiFlow message of a UE.
+        Args:
+            alg (tuple): the rrc_cipher_alg, rrc_integrity_alg, nas_cipher_alg and nas_integrity_alg of the message
+        '''
+        key = (str(nr_cell_id), str(ue_id))
+        with self._lock:
+            cell = self.cells.get(key[0])
+            if cell is None:
+                cell = self.cells[key[0]] = CellKPIs()
+            ue = self.ues.get(key)
+            if ue is None:
+                ue = self.ues[key] = UEPosture(key[0], key[1], timestamp)
+                cell.ues += 1
+            cell.msgs += 1
+            cell.rrc_msg[rrc_msg] += 1
+            cell.nas_msg[nas_msg] += 1
+
+            ue.msgs += 1
+            ue.last_seen = max(ue.last_seen, timestamp)
+            ue.rrc_state, ue.nas_state, ue.rrc_sec_state, ue.s_tmsi = rrc_state, nas_state, rrc_sec_state, s_tmsi
+            if rrc_msg == self.setup_request_message:
+                ue.setup_requests += 1
+                cell.setup_requests += 1
+                if ue.attach_pending:
+                    ue.retries += 1
+                    cell.retries += 1
+                ue.attach_pending = True
+                ue.released = False
+            if rrc_msg == self.security_complete_message:
+                ue.secured = True
+            if nas_state == self.nas_registered_state and not ue.registered:
+                ue.registered = True
+                ue.attach_pending = False
+                cell.registrations += 1
+            if (rrc_msg in self.release_messages or nas_msg in self.release_messages) and not ue.released:
+                ue.released = True
+                ue.registered = False
+                cell.releases += 1
+
+            if ue.alg != alg:
+                for field, old, new in zip(algorithm_fields, ue.alg or (None,) * len(alg), alg):
+                    if old is not None:
+                        cell.algorithms[field][old] -= 1
+                    cell.algorithms[field][new] += 1
+                ue.alg = alg
+            self._update_flags(cell, ue)
+
+    def _update_flags(self, cell: CellKPIs, ue: UEPosture):
+        flags = set(null_security_flags(ue.alg, ue.secured, ue.registered))
+        if ue.retries > 0:
+            flags.add("attach_retry")
+        if flags == ue.flags:
+            return
+        for flag in ue.flags - flags:
+            cell.flag_ues[flag].discard(ue.ue_id)
+        for flag in flags - ue.flags:
+            cell.flag_ues[flag].add(ue.ue_id)
+        ue.flags = frozenset(flags)
+
+    def remove_ue(self, nr_cell_id, ue_id):
+        '''
+        Remove a UE from the UE counts, algorithm distributions and posture flags (message counters are kept).
+        '''
+        key = (str(nr_cell_id), str(ue_id))
+        with self._lock:
+            ue = self.ues.pop(key, None)
+            if ue is None:
+                return
+            cell = self.cells[key[0]]
+            cell.ues -= 1
+            if ue.alg is not None:
+                for field, value in zip(algorithm_fields, ue.alg):
+                    cell.algorithms[field][value] -= 1
+            for flag in ue.flags:
+                cell.flag_ues[flag].discard(ue.ue_id)
+
+    def on_session_transition(self, transition):
+        '''
+        UESessionTracker listener removing the UEs whose session expired.
+        '''
+        if transition.to_state == "expired":
+            self.remove_ue(transition.nr_cell_id, transition.ue_id)
+
+    def get_cell_kpis(self, nr_cell_id=None) -> dict:
+        '''
+        Return the KPIs of a cell, or of all cells (nr_cell_id -> KPIs).
+        '''
+        with self._lock:
+            if nr_cell_id is not None:
+                cell = self.cells.get(str(nr_cell_id))
+                return cell.to_dict() if cell is not None else None
+            return {cell_id: cell.to_dict() for cell_id, cell in self.cells.items()}
+
+    def get_ue_posture(self, ue_id, nr_cell_id=None) -> list:
+        '''
+        Return the posture of a UE in each cell it is tracked in (or in the given cell).
+        '''
+        with self._lock:
+            cells = [str(nr_cell_id)] if nr_cell_id is not None else self.cells
+            return [self.ues[(c, str(ue_id))].to_dict() for c in cells if (c, str(ue_id)) in self.ues]
+
+    def get_ues_with_flag(self, flag: str, nr_cell_id=None) -> dict:
+        '''
+        Return the IDs of the UEs with a posture flag, by cell.
+        '''
+        if flag not in posture_flags:
+            raise ValueError(f"Unknown posture flag: {flag}, available flags: {posture_flags}")
+        with self._lock:
+            cells = [str(nr_cell_id)] if nr_cell_id is not None else list(self.cells)
+            return {c: sorted(self.cells[c].flag_ues[flag]) for c in cells if c in self.cells}
+
+def format_cell_kpis(nr_cell_id: str, kpis: dict, top_messages: int = 5) -> str:
+    '''
+    Format the KPIs of a cell in a compact line.
+    '''
+    ratio = "N/A" if kpis["attach_success_ratio"] is None else f"{kpis['attach_success_ratio']:.2f}"
+    algorithms = " ".join(f"{field.replace('_alg', '')}=" + ",".join(f"{v}:{n}" for v, n in sorted(counts.items()))
+                          for field, counts in kpis["algorithms"].items())
+    flags = " ".join(f"{flag}={n}" for flag, n in kpis["flags"].items())
+    messages = ",".join(f"{m}:{n}" for m, n in Counter(kpis["rrc_msg"]).most_common(top_messages))
+    return (f"cell {nr_cell_id}: ues={kpis['ues']} msgs={kpis['msgs']} setup_requests={kpis['setup_requests']} retries={kpis['retries']} "
+            f"registrations={kpis['registrations']} attach_success={ratio} releases={kpis['releases']} {flags} {algorithms} top_rrc_msg={messages}")
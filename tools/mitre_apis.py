@@ -1,5 +1,7 @@
 import os
+import re
 import json
+import threading
 from pathlib import Path
 import faiss
 import numpy as np
@@ -40,6 +42,77 @@ def _resolve_path(maybe_path: str, default_name: Optional[str] = None) -> Path:
         p = base / maybe_path
     return p.resolve()
 
+# ---------- embedding service ----------
+
+default_embedding_model_name = mitre_embedding_model
+
+class EmbeddingModel:
+    '''
+    A sentence embedding model loaded once per process. Encodes are serialized by a lock, so the model can be
+    shared by the agents and tool calls running in different threads.
+    '''
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        with self._lock:
+            return self.model.encode(texts, **kwargs)
+
+embedding_models = {} # model name -> EmbeddingModel
+_embedding_models_lock = threading.Lock()
+# the FAISS indexes and processed technique data are also loaded once per process
+mitre_faiss_indexes = {} # (index file path, model name) -> FAISS index
+fight_data_cache = {} # technique JSON file path -> processed techniques
+
+def get_embedding_model(model_name: str = default_embedding_model_name) -> EmbeddingModel:
+    '''
+    Return the process-wide instance of an embedding model, loading the model on first use.
+    '''
+    model = embedding_models.get(model_name)
+    if model is None:
+        with _embedding_models_lock:
+            model = embedding_models.get(model_name)
+            if model is None:
+                model = embedding_models[model_name] = EmbeddingModel(model_name)
+    return model
+
+# the bundled mitre_fight.faiss_index was built with this model, the indexes of other models get their own file
+bundled_fight_db_model_name = "all-MiniLM-L6-v2"
+
+def get_fight_db_name(embedding_model_name: str) -> str:
+    '''
+    Return the FAISS index file name of an embedding model.
+    '''
+    if embedding_model_name == bundled_fight_db_model_name:
+        return "mitre_fight.faiss_index"
+    return f"mitre_fight-{re.sub(r'[^A-Za-z0-9_.-]', '_', embedding_model_name)}.faiss_index"
+
+def warm_up_mitre_search(model_name: str = default_embedding_model_name, fight_json_path: str = None):
+    '''
+    Load the embedding model, the FAISS index and the technique data and run a first encode, so the first
+    search_mitre_fight_techniques call does not pay for them.
+    '''
+    if fight_json_path is None:
+        fight_json_path = os.path.join(os.path.dirname(__file__), "mitre_fight_techniques-3.0.1.json")
+    get_embedding_model(model_name).encode(["warm up"], convert_to_tensor=False)
+    load_or_create_mitre_fight_faiss_index(fight_json_file_name=fight_json_path, embedding_model_name=model_name)
+    load_and_process_fight_data(fight_json_path)
+
+def start_mitre_search_warmup(model_name: str = default_embedding_model_name) -> threading.Thread:
+    '''
+    Warm up the MITRE search in a background thread. A search started meanwhile waits for the model to be loaded.
+    '''
+    def warm_up():
+        try:
+            warm_up_mitre_search(model_name)
+        except Exception as e:
+            print(f"Error warming up the MITRE search: {e}")
+    thread = threading.Thread(target=warm_up, name="mitre-search-warmup", daemon=True)
+    thread.start()
+    return thread
+
 # ---------- tools ----------
 
 @tool
@@ -86,7 +159,7 @@ def get_mitre_fight_technique_by_id(tech_id: str, fight_json_path: str=None) ->
 
 
 @tool
-def search_mitre_fight_techniques(threat_summary: str, top_k: int=5, fight_json_path: str=None, embedding_model_name="all-MiniLM-L6-v2") -> list:
+def search_mitre_fight_techniques(threat_summary: str, top_k: int=5, fight_json_path: str=None, embedding_model_name=default_embedding_model_name) -> list:
     '''
     This function will perform a similarity search through the MiTRE FiGHT technique descriptions to find the top most relevant MiTRE FiGHT technique associated with the given event. The search is performed via FAISS (Facebook AI Similarity Search) using sentence embeddings.
     Input:
@@ -100,18 +173,17 @@ def search_mitre_fight_techniques(threat_summary: str, top_k: int=5, fight_json_
     if fight_json_path is None:
         fight_json_path = os.path.join(os.path.dirname(__file__), "mitre_fight_techniques-3.0.1.json")
     
-    embedding_model = SentenceTransformer(embedding_model_name)
-
-    query_embedding = embedding_model.encode([threat_summary], convert_to_tensor=False)
+    query_embedding = get_embedding_model(embedding_model_name).encode([threat_summary], convert_to_tensor=False)
     query_embedding_faiss = np.array(query_embedding, dtype='float32')
     faiss.normalize_L2(query_embedding_faiss)
 
-    if mitre_faiss_db is not None:
+    if mitre_faiss_db is not None and mitre_faiss_db.d == query_embedding_faiss.shape[1]:
         # if the db has been loaded from global variable, use it directly
         index = mitre_faiss_db
     else:
-        # load the db from file
-        index = load_or_create_mitre_fight_faiss_index(fight_json_file_name=fight_json_path)
+        # load the db of the embedding model from file
+        index = load_or_create_mitre_fight_faiss_index(fight_json_file_name=fight_json_path, embedding_model_name=embedding_model_name,
+                                                       embedding_dimension=query_embedding_faiss.shape[1])
 
     if index is None:
         print("Error: FAISS index could not be loaded or created. Please check the data file.")
@@ -149,6 +221,8 @@ def load_and_process_fight_data(json_filepath):
     Extracts relevant text for embedding (Name, Description, Tactics, Procedure Examples) 
     and keeps the original object.
     """
+    if json_filepath in fight_data_cache:
+        return fight_data_cache[json_filepath]
     try:
         with open(json_filepath, 'r', encoding='utf-8') as f:
             fight_data_raw = json.load(f)
@@ -200,22 +274,31 @@ def load_and_process_fight_data(json_filepath):
             "text_for_embedding": text_to_embed,
             "original_object": tech_obj # Store the full original object
         })
+    fight_data_cache[json_filepath] = processed_techniques
     return processed_techniques
 
-def load_or_create_mitre_fight_faiss_index(fight_json_file_name: str=None, fight_db_name: str=None, embedding_model_name="all-MiniLM-L6-v2"):
+def load_or_create_mitre_fight_faiss_index(fight_json_file_name: str=None, fight_db_name: str=None, embedding_model_name=default_embedding_model_name,
+                                           embedding_dimension: int=None):
     """
-    Load or create a FAISS index for MITRE FiGHT techniques.
+    Load or create a FAISS index for MITRE FiGHT techniques. The index file and the cached index are per embedding
+    model; an index whose dimension does not match embedding_dimension (if given) is rebuilt.
     """
     if fight_json_file_name is None:
         fight_json_file_name = "mitre_fight_techniques-3.0.1.json"
     if fight_db_name is None:
-        fight_db_name = "mitre_fight.faiss_index"
+        fight_db_name = get_fight_db_name(embedding_model_name)
     
     fight_db_path = os.path.join(os.path.dirname(__file__), fight_db_name)
-    if os.path.exists(fight_db_path):
+    cache_key = (fight_db_path, embedding_model_name)
+    index = mitre_faiss_indexes.get(cache_key)
+    if index is None and os.path.exists(fight_db_path):
         print("Loading existing FAISS index from file...")
         index = faiss.read_index(fight_db_path)
-        return index
+    if index is not None:
+        if embedding_dimension is None or index.d == embedding_dimension:
+            mitre_faiss_indexes[cache_key] = index
+            return index
+        print(f"FAISS index {fight_db_path} has dimension {index.d}, {embedding_model_name} embeds {embedding_dimension}, rebuilding it...")
 
     # --- Specify the path to your JSON file ---
     fight_json_file_path = os.path.join(os.path.dirname(__file__), fight_json_file_name)
@@ -234,7 +317,7 @@ def load_or_create_mitre_fight_faiss_index(fight_json_file_name: str=None, fight
 
 
     # 2. Initialize a sentence embedding model
-    embedding_model = SentenceTransformer(embedding_model_name)
+    embedding_model = get_embedding_model(embedding_model_name)
 
     # 3. Embed the corpus
     print("Embedding techniques... This might take a while depending on the corpus size.")
@@ -251,7 +334,8 @@ def load_or_create_mitre_fight_faiss_index(fight_json_file_name: str=None, fight
 
     print(f"FAISS index built successfully with {index.ntotal} vectors (Dimension: {index.d}).")
 
-    faiss.write_index(index, fight_db_name)
+    faiss.write_index(index, fight_db_path)
+    mitre_faiss_indexes[cache_key] = index
     return index
 
 
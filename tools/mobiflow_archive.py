@@ -0,0 +1,464 @@
+'''
+Persistent append-only archive of the ingested UE / BS MobiFlow records and events.
+
+Records are buffered and written into immutable segment files of up to segment_rows rows. A segment stores each
+column as a separately zlib-compressed block (integer columns delta-encoded when sorted, string columns as
+categorical codes), followed by a JSON footer with the column offsets and a zone map: the min / max timestamp and
+MobiFlow index and the distinct cell / UE IDs of the segment. The footers are read when the archive is opened, so a
+query skips the segments whose zone map cannot match without touching them, memory-maps the others and only
+decompresses the columns it needs.
+
+Segment layout: magic | compressed column blocks | footer JSON | footer length (uint64, little-endian) | magic
+'''
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import threading
+from collections import namedtuple
+import numpy as np
+from .mobiflow_table import MobiFlowTable, bs_meta, ue_meta
+
+segment_magic = b"MFARCH01"
+footer_struct = struct.Struct("<Q")
+# max number of distinct cell / UE IDs listed in a zone map, segments with more can't be pruned on that field
+max_zone_values = 4096
+
+ArchiveKind = namedtuple("ArchiveKind", ["name", "fields", "time_field", "cell_field", "ue_field", "index_field"])
+archive_kinds = {
+    "ue": ArchiveKind("ue", ue_meta, "Timestamp", "nr_cell_id", "gnb_du_ue_f1ap_id", "Index"),
+    "bs": ArchiveKind("bs", bs_meta, "Timestamp", "nr_cell_id", None, "Index"),
+    "event": ArchiveKind("event", None, "timestamp", "cellID", "ueID", None),
+}
+
+# zone: min_ts, max_ts, min_index, max_index, cells, ues (None if the segment has more than max_zone_values)
+ArchiveSegment = namedtuple("ArchiveSegment", ["path", "kind", "rows", "columns", "zone"])
+
+def _int_or_none(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def encode_column(values: list) -> tuple:
+    '''
+    Encode a column as (column info, compressed block). Python ints and strings that are canonical integers are stored
+    as int64 ("int" / "intstr"), everything else as categorical codes ("str").
+    '''
+    info = {}
+    if all(type(v) is int for v in values):
+        info["type"] = "int"
+        array = np.array(values, dtype=np.int64)
+    elif all(type(v) is str for v in values):
+        # the distinct values are checked once, string columns have few of them
+        distinct, inverse = np.unique(np.array(values, dtype=str), return_inverse=True)
+        distinct = distinct.tolist()
+        if all(v.lstrip("-").isdigit() and str(int(v)) == v for v in distinct):
+            info["type"] = "intstr"
+            array = np.array([int(v) for v in distinct], dtype=np.int64)[inverse]
+        else:
+            info["type"] = "str"
+            info["categories"] = distinct
+            array = inverse.astype(np.int32)
+    else:
+        codes = {}
+        info["type"] = "str"
+        array = np.array([codes.setdefault(v, len(codes)) for v in values], dtype=np.int32)
+        info["categories"] = list(codes.keys())
+    if info["type"] != "str" and len(array) > 1 and bool(np.all(array[1:] >= array[:-1])):
+        info["delta"] = True
+        array = np.diff(array, prepend=0)
+    return info, zlib.compress(array.tobytes())
+
+def decode_column(info: dict, block) -> np.ndarray:
+    '''
+    Decode a compressed column block into int64 values or categorical codes.
+    '''
+    array = np.frombuffer(zlib.decompress(block), dtype=np.int32 if info["type"] == "str" else np.int64)
+    if info.get("delta"):
+        array = np.cumsum(array)
+    return array
+
+def column_values(info: dict, array: np.ndarray) -> list:
+    '''
+    Convert decoded column values back to the archived Python values.
+    '''
+    if info["type"] == "str":
+        categories = info["categories"]
+        return [categories[v] for v in array.tolist()]
+    if info["type"] == "intstr":
+        return [str(v) for v in array.tolist()]
+    return array.tolist()
+
+def write_segment(path: str, kind: str, columns: dict, zone: dict):
+    '''
+    Write a segment file atomically (to a temporary file first).
+    Args:
+        columns (dict): column name -> list of values
+        zone (dict): the zone map of the segment
+    '''
+    column_infos = []
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(segment_magic)
+        for name, values in columns.items():
+            info, block = encode_column(values)
+            info.update(name=name, offset=f.tell(), length=len(block))
+            f.write(block)
+            column_infos.append(info)
+        footer = json.dumps({"kind": kind, "rows": len(next(iter(columns.values()), [])), "columns": column_infos,
+                             "zone": zone, "created": time.time()}).encode("utf-8")
+        f.write(footer)
+        f.write(footer_struct.pack(len(footer)))
+        f.write(segment_magic)
+    os.replace(tmp_path, path)
+
+def read_segment_footer(path: str) -> ArchiveSegment:
+    '''
+    Read the footer of a segment file. Returns None if the file is not a complete segment.
+    '''
+    tail_size = footer_struct.size + len(segment_magic)
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size < len(segment_magic) + tail_size:
+            return None
+        f.seek(size - tail_size)
+        tail = f.read(tail_size)
+        if tail[footer_struct.size:] != segment_magic:
+            return None
+        footer_length = footer_struct.unpack(tail[:footer_struct.size])[0]
+        f.seek(size - tail_size - footer_length)
+        footer = json.loads(f.read(footer_length))
+    return ArchiveSegment(path, footer["kind"], footer["rows"], {c["name"]: c for c in footer["columns"]}, footer["zone"])
+
+def build_zone_map(kind: ArchiveKind, columns: dict) -> dict:
+    '''
+    Build the zone map of the rows of a segment.
+    '''
+    timestamps = [t for t in (_int_or_none(v) for v in columns[kind.time_field]) if t is not None]
+    indexes = [int(v) for v in columns[kind.index_field]] if kind.index_field else []
+    zone = {
+        "min_ts": min(timestamps, default=None),
+        "max_ts": max(timestamps, default=None),
+        "min_index": min(indexes, default=None),
+        "max_index": max(indexes, default=None),
+    }
+    for zone_field, field in (("cells", kind.cell_field), ("ues", kind.ue_field)):
+        values = sorted(set(str(v) for v in columns[field])) if field else []
+        zone[zone_field] = values if len(values) <= max_zone_values else None
+    return zone
+
+def event_key(event: dict) -> tuple:
+    '''
+    Content key of an event: its fields except for the store-local "id" and "active" flag.
+    '''
+    return tuple(sorted((k, str(v)) for k, v in event.items() if k not in ("id", "active") and v is not None))
+
+def zone_may_match(zone: dict, start_ts: int = None, end_ts: int = None, cell_id: str = None, ue_id: str = None) -> bool:
+    '''
+    Whether a segment with the given zone map may hold rows matching the query.
+    '''
+    if start_ts is not None and zone["max_ts"] is not None and zone["max_ts"] < start_ts:
+        return False
+    if end_ts is not None and zone["min_ts"] is not None and zone["min_ts"] > end_ts:
+        return False
+    if cell_id is not None and zone["cells"] is not None and str(cell_id) not in zone["cells"]:
+        return False
+    if ue_id is not None and zone["ues"] is not None and str(ue_id) not in zone["ues"]:
+        return False
+    return True
+
+class MobiFlowArchive:
+    '''
+    Append-only archive of UE / BS MobiFlow records ("ue", "bs") and events ("event") in a directory of segment files.
+    UE / BS records are rows of ;-separated fields (ue_meta / bs_meta), events are dicts. Queries return rows in time order.
+    '''
+    def __init__(self, directory: str, segment_rows: int = 65536, flush_interval: float = 300.0):
+        '''
+        Args:
+            directory (str): the archive directory, created if needed
+            segment_rows (int): max number of rows of a segment
+            flush_interval (float): seconds after which buffered rows are written into a segment even if it is not full
+        '''
+        self.directory = directory
+        self.segment_rows = segment_rows
+        self.flush_interval = flush_interval
+        self.segments = {kind: [] for kind in archive_kinds}  # kind -> list of ArchiveSegment, in write order
+        self.max_index = {kind: -1 for kind in archive_kinds}  # highest archived MobiFlow index of the UE / BS records
+        self.max_timestamp = {kind: None for kind in archive_kinds}  # latest archived timestamp of the UE / BS records
+        self.last_query_stats = {}
+        self._buffers = {kind: [] for kind in archive_kinds}
+        self._buffer_since = {kind: None for kind in archive_kinds}
+        self._next_segment = 0
+        self._event_keys = None  # content keys of the archived events, see _archived_event_keys
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".seg"):
+                continue
+            segment = read_segment_footer(os.path.join(directory, filename))
+            if segment is None or segment.kind not in archive_kinds:
+                print(f"Skipping incomplete archive segment {filename}")
+                continue
+            self._add_segment(segment)
+            self._next_segment = max(self._next_segment, int(filename.split("-")[1].split(".")[0]) + 1)
+
+    def _add_segment(self, segment: ArchiveSegment):
+        self.segments[segment.kind].append(segment)
+        if segment.zone["max_index"] is not None:
+            self.max_index[segment.kind] = max(self.max_index[segment.kind], segment.zone["max_index"])
+        if segment.zone["max_ts"] is not None and archive_kinds[segment.kind].index_field is not None:
+            self.max_timestamp[segment.kind] = max(self.max_timestamp[segment.kind] or segment.zone["max_ts"], segment.zone["max_ts"])
+
+    def append_mobiflow(self, kind: str, records: list) -> int:
+        '''
+        Archive raw UE ("ue") or BS ("bs") MobiFlow records (separated by ; delimiter). Malformed records and records
+        already archived (same MobiFlow index and timestamp) are skipped. The MobiFlow indexes restart when the xApps
+        restart, so records below the highest archived index are archived as long as they are not in the archive.
+        Returns:
+            int: the number of archived records
+        '''
+        fields = archive_kinds[kind].fields
+        index_pos, time_pos = fields.index("Index"), fields.index("Timestamp")
+        rows, keys = [], []
+        for record in records:
+            row = record.split(";")
+            if len(row) != len(fields) or not row[index_pos].isdigit():
+                continue
+            rows.append(row)
+            keys.append((int(row[index_pos]), _int_or_none(row[time_pos])))
+        with self._lock:
+            return self._append_new_rows(kind, rows, keys, self._archived_keys(kind, keys))
+
+    def append_table_rows(self, table: MobiFlowTable, rows) -> int:
+        '''
+        Archive rows of a UE MobiFlow table. Rows already archived are skipped before they are rendered into records.
+        '''
+        rows = np.asarray(rows, dtype=np.int64)
+        keys = list(zip(table.column("Index")[rows].tolist(), table.column("Timestamp")[rows].tolist()))
+        with self._lock:
+            archived = self._archived_keys("ue", keys)
+            if len(archived) > 0:
+                new = np.array([key not in archived for key in keys], dtype=bool)
+                rows = rows[new]
+                keys = [key for key, is_new in zip(keys, new) if is_new]
+            if len(rows) == 0:
+                return 0
+            return self._append_new_rows("ue", [record.split(";") for record in table.to_records(rows)], keys, archived)
+
+    def _archived_keys(self, kind: str, keys: list) -> set:
+        '''
+        Return the (MobiFlow index, timestamp) keys that are already archived. A key above the highest archived index
+        or timestamp is new, the others are looked up in the index / timestamp columns of the segments (and the buffer)
+        of their time range.
+        '''
+        max_index, max_ts = self.max_index[kind], self.max_timestamp[kind]
+        candidates = set(key for key in keys if key[0] <= max_index and (key[1] is None or max_ts is None or key[1] <= max_ts))
+        if len(candidates) == 0:
+            return set()
+        timestamps = [t for _, t in candidates]
+        start_ts, end_ts = (None, None) if None in timestamps else (min(timestamps), max(timestamps))
+        archive_kind = archive_kinds[kind]
+        names = [archive_kind.index_field, archive_kind.time_field]
+        archived = set()
+        for segment in self.segments[kind]:
+            if not zone_may_match(segment.zone, start_ts, end_ts):
+                continue
+            with open(segment.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    columns = []
+                    for name in names:
+                        info = segment.columns[name]
+                        columns.append(map(_int_or_none, column_values(info, decode_column(info, view[info["offset"]:info["offset"] + info["length"]]))))
+                    archived.update(key for key in zip(*columns) if key in candidates)
+                finally:
+                    view.release()
+        positions = [archive_kind.fields.index(name) for name in names]
+        buffered = ((int(row[positions[0]]), _int_or_none(row[positions[1]])) for row in self._buffers[kind])
+        archived.update(key for key in buffered if key in candidates)
+        return archived
+
+    def _append_new_rows(self, kind: str, rows: list, keys: list, archived: set) -> int:
+        new_rows = []
+        for row, key in zip(rows, keys):
+            if key in archived:
+                continue
+            archived.add(key)
+            new_rows.append(row)
+            self.max_index[kind] = max(self.max_index[kind], key[0])
+            if key[1] is not None:
+                self.max_timestamp[kind] = max(self.max_timestamp[kind] or key[1], key[1])
+        self._append_rows(kind, new_rows)
+        return len(new_rows)
+
+    def append_events(self, events: list) -> int:
+        '''
+        Archive events. Events identical to an archived event (except for their store-local "id" and "active" flag)
+        are skipped, so events pulled again after a restart are not archived twice.
+        Returns:
+            int: the number of archived events
+        '''
+        events = [{k: v for k, v in event.items() if k != "active"} for event in events]
+        if len(events) == 0:
+            return 0
+        with self._lock:
+            archived = self._archived_event_keys()
+            rows = []
+            for event in events:
+                key = event_key(event)
+                if key not in archived:
+                    archived.add(key)
+                    rows.append(event)
+            self._append_rows("event", rows)
+            return len(rows)
+
+    def _archived_event_keys(self) -> set:
+        '''
+        Return the content keys of the archived (and buffered) events. They are read from the event segments on first
+        use and kept up to date by append_events.
+        '''
+        if self._event_keys is None:
+            self._event_keys = set(event_key(event) for event in self.query("event"))
+        return self._event_keys
+
+    def _append_rows(self, kind: str, rows: list):
+        if len(rows) == 0:
+            return
+        buffer = self._buffers[kind]
+        if self._buffer_since[kind] is None:
+            self._buffer_since[kind] = time.time()
+        buffer.extend(rows)
+        while len(buffer) >= self.segment_rows:
+            self._write_segment(kind, buffer[:self.segment_rows])
+            del buffer[:self.segment_rows]
+        if len(buffer) == 0:
+            self._buffer_since[kind] = None
+        elif time.time() - self._buffer_since[kind] >= self.flush_interval:
+            self.flush(kind)
+
+    def _to_columns(self, kind: str, rows: list) -> dict:
+        fields = archive_kinds[kind].fields
+        if fields is not None:
+            return {name: list(values) for name, values in zip(fields, zip(*rows))}
+        names = []
+        for row in rows:
+            names += [name for name in row if name not in names]
+        return {name: [row.get(name) for row in rows] for name in names}
+
+    def _write_segment(self, kind: str, rows: list):
+        columns = self._to_columns(kind, rows)
+        path = os.path.join(self.directory, f"{kind}-{self._next_segment:08d}.seg")
+        self._next_segment += 1
+        write_segment(path, kind, columns, build_zone_map(archive_kinds[kind], columns))
+        self._add_segment(read_segment_footer(path))
+
+    def flush(self, kind: str = None):
+        '''
+        Write the buffered rows (of a kind, or of all kinds) into new segments.
+        '''
+        with self._lock:
+            for k in ([kind] if kind else archive_kinds):
+                if len(self._buffers[k]) > 0:
+                    self._write_segment(k, self._buffers[k])
+                    self._buffers[k] = []
+                self._buffer_since[k] = None
+
+    def query(self, kind: str, start_ts: int = None, end_ts: int = None, cell_id=None, ue_id=None, limit: int = None) -> list:
+        '''
+        Query the archived rows (and the buffered rows not written yet) of a kind with start_ts <= timestamp <= end_ts,
+        optionally of a cell and / or a UE, in time order. Segments whose zone map cannot match are skipped.
+        Returns:
+            list: raw records (separated by ; delimiter) for "ue" / "bs", event dicts for "event"
+        '''
+        archive_kind = archive_kinds[kind]
+        with self._lock:
+            segments = list(self.segments[kind])
+            n_buffered = len(self._buffers[kind])
+            buffered = self._to_columns(kind, self._buffers[kind]) if n_buffered > 0 else None
+        scanned = 0
+        matches = []  # (timestamp, row)
+        for segment in segments:
+            if not zone_may_match(segment.zone, start_ts, end_ts, cell_id, ue_id):
+                continue
+            scanned += 1
+            with open(segment.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    def read(name):
+                        info = segment.columns[name]
+                        return decode_column(info, view[info["offset"]:info["offset"] + info["length"]])
+                    matches += self._match(archive_kind, segment.columns, read, segment.rows, start_ts, end_ts, cell_id, ue_id)
+                finally:
+                    view.release()
+        if buffered is not None:
+            infos = {name: {"type": "raw"} for name in buffered}
+            matches += self._match(archive_kind, infos, lambda name: buffered[name], n_buffered, start_ts, end_ts, cell_id, ue_id)
+        self.last_query_stats = {"segments": len(segments), "scanned": scanned, "skipped": len(segments) - scanned, "rows": len(matches)}
+        matches.sort(key=lambda m: m[0])
+        rows = [row for _, row in matches[:limit]]
+        if archive_kind.fields is not None:
+            return [";".join(row) for row in rows]
+        return rows
+
+    def _match(self, kind: ArchiveKind, infos: dict, read, n: int, start_ts, end_ts, cell_id, ue_id) -> list:
+        '''
+        Select the matching rows of a segment (or of the buffer), decoding the filter columns first and the other
+        columns only for the selected rows.
+        '''
+        def values(name, rows):
+            info = infos.get(name)
+            if info is None:
+                return [None] * len(rows)
+            data = read(name)
+            if info["type"] == "raw":
+                return [data[i] for i in rows]
+            return column_values(info, data[rows])
+
+        def integers(name):
+            info = infos.get(name)
+            if info is None:
+                return np.full(n, -1, dtype=np.int64)
+            if info["type"] in ("int", "intstr"):
+                return read(name)
+            data = read(name)
+            if info["type"] == "str":
+                data = column_values(info, data)
+            return np.array([t if t is not None else -1 for t in map(_int_or_none, data)], dtype=np.int64)
+
+        def equals(name, value):
+            info = infos.get(name)
+            if info is None:
+                return np.zeros(n, dtype=bool)
+            if info["type"] in ("int", "intstr"):
+                value = _int_or_none(value)
+                return read(name) == value if value is not None else np.zeros(n, dtype=bool)
+            if info["type"] == "str":
+                code = {v: c for c, v in enumerate(info["categories"])}.get(str(value), -1)
+                return read(name) == code
+            return np.array([str(v) == str(value) for v in read(name)], dtype=bool)
+
+        timestamps = integers(kind.time_field)
+        mask = np.ones(n, dtype=bool)
+        if start_ts is not None:
+            mask &= timestamps >= start_ts
+        if end_ts is not None:
+            mask &= timestamps <= end_ts
+        for field, value in ((kind.cell_field, cell_id), (kind.ue_field, ue_id)):
+            if value is not None and field is not None:
+                mask &= equals(field, value)
+        rows = np.nonzero(mask)[0]
+        if len(rows) == 0:
+            return []
+        names = kind.fields if kind.fields is not None else list(infos)
+        columns = [values(name, rows) for name in names]
+        if kind.fields is not None:
+            records = [list(row) for row in zip(*columns)]
+        else:
+            records = [{name: v for name, v in zip(names, row) if v is not None} for row in zip(*columns)]
+        return list(zip(timestamps[rows].tolist(), records))
+
+    def close(self):
+        self.flush()
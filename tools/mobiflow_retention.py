@@ -0,0 +1,74 @@
+'''
+Retention policy for the per-UE MobiFlow history.
+
+Each UE keeps the first messages of its session up to the end of the security setup (the messages the security
+analysis relies on, e.g., the negotiated cipher / integrity algorithms) and its most recent messages. Older messages
+are compacted into summary counters, so the in-memory MobiFlow store and the network data returned to the tools have
+a predictable size on long-running deployments.
+'''
+import numpy as np
+
+class MobiFlowRetentionPolicy:
+    '''
+    Per-UE retention of MobiFlow messages.
+    '''
+    # the RRC message that completes the security setup of a UE session
+    security_setup_end_message = "SecurityModeComplete"
+
+    def __init__(self, max_messages: int = 200, max_age: float = None, keep_first: int = 20, compact_interval: int = 1000):
+        '''
+        Args:
+            max_messages (int): number of most recent messages kept per UE
+            max_age (float): messages older than max_age seconds (on the MobiFlow clock) are compacted, None to keep all
+            keep_first (int): max number of security setup messages kept at the start of each UE history
+            compact_interval (int): number of records added to the store between two compactions
+        '''
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.keep_first = keep_first
+        self.compact_interval = compact_interval
+
+    def select(self, timestamps: np.ndarray, rrc_msgs: list, latest_timestamp: int) -> np.ndarray:
+        '''
+        Select the messages to keep from the history of one UE.
+        Args:
+            timestamps (np.ndarray): the timestamps of the UE messages, in MobiFlow index order
+            rrc_msgs (list): the RRC message names of the UE messages
+            latest_timestamp (int): the current time on the MobiFlow clock
+        Returns:
+            np.ndarray: boolean mask of the messages to keep
+        '''
+        n = len(timestamps)
+        keep = np.zeros(n, dtype=bool)
+        # security setup at the start of the history
+        head = min(self.keep_first, n)
+        if self.security_setup_end_message in rrc_msgs[:head]:
+            head = rrc_msgs.index(self.security_setup_end_message) + 1
+        keep[:head] = True
+        # most recent messages
+        recent = np.zeros(n, dtype=bool)
+        recent[max(n - self.max_messages, 0):] = True
+        if self.max_age is not None:
+            recent &= timestamps >= latest_timestamp - self.max_age
+        keep |= recent
+        return keep
+
+def new_mobiflow_summary() -> dict:
+    return {"compacted_messages": 0, "first_timestamp": None, "last_timestamp": None, "rrc_msg": {}, "nas_msg": {}}
+
+def update_mobiflow_summary(summary: dict, timestamps: list, rrc_msgs: list, nas_msgs: list):
+    '''
+    Add compacted messages to the summary counters of a UE.
+    '''
+    summary["compacted_messages"] += len(timestamps)
+    first_timestamp, last_timestamp = min(timestamps), max(timestamps)
+    if summary["first_timestamp"] is None or first_timestamp < summary["first_timestamp"]:
+        summary["first_timestamp"] = first_timestamp
+    if summary["last_timestamp"] is None or last_timestamp > summary["last_timestamp"]:
+        summary["last_timestamp"] = last_timestamp
+    for field, msgs in (("rrc_msg", rrc_msgs), ("nas_msg", nas_msgs)):
+        counts = summary[field]
+        for msg in msgs:
+            if msg.strip() == "":
+                continue
+            counts[msg] = counts.get(msg, 0) + 1
@@ -0,0 +1,202 @@
+'''
+In-memory UE MobiFlow store with secondary indexes.
+
+Records are kept in a columnar MobiFlowTable and indexed by UE identifiers, cell ID, and timestamp as they arrive,
+so lookups cost O(result) instead of a scan over all records.
+'''
+import threading
+import numpy as np
+from .mobiflow_table import MobiFlowTable, bs_meta, ue_meta
+from .mobiflow_parser import parse_mobiflow_records
+from .mobiflow_retention import MobiFlowRetentionPolicy, new_mobiflow_summary, update_mobiflow_summary
+
+class MobiFlowStore:
+    '''
+    Store of UE MobiFlow records with hash indexes on UE / cell identifiers and a sorted timestamp index.
+    '''
+    indexed_fields = ["gnb_du_ue_f1ap_id", "nr_cell_id", "rnti", "s_tmsi"]
+
+    def __init__(self, meta: list = None):
+        self.table = MobiFlowTable(meta)
+        self._rows_by_index = {}  # MobiFlow index -> table row, of the records in the table
+        self.compacted_index = -1  # highest MobiFlow index at the last compaction, records up to it are known
+        self.indexes = {field: {} for field in self.indexed_fields}  # field -> value -> list of table rows
+        self._time_order = None  # row order sorted by timestamp, None while rows are appended in time order
+        self._last_timestamp = None
+        self.summaries = {}  # (nr_cell_id, ue_id) -> summary counters of the compacted records
+        self.compacted_size = 0  # number of records after the last compaction
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.table)
+
+    def add(self, record: str):
+        '''
+        Add a raw UE MobiFlow record and update the indexes. Records already in the store are ignored.
+        '''
+        self.add_records([record])
+
+    def add_records(self, records: list) -> range:
+        '''
+        Add raw UE MobiFlow records and update the indexes. Returns the table rows of the records that were new.
+        '''
+        parsed = parse_mobiflow_records(records)
+        with self._lock:
+            new_records = []
+            for record in parsed:
+                if record.Index > self.compacted_index and record.Index not in self._rows_by_index:
+                    self._rows_by_index[record.Index] = -1
+                    new_records.append(record)
+            rows = self.table.append_parsed(new_records)
+            if len(rows) > 0:
+                self._index_rows(rows)
+            return rows
+
+    def _index_rows(self, rows: range):
+        for row, index in zip(rows, self.table.column("Index")[rows.start:rows.stop].tolist()):
+            self._rows_by_index[index] = row
+        for field in self.indexed_fields:
+            field_index = self.indexes[field]
+            for row, value in zip(rows, self.table.get_values(np.arange(rows.start, rows.stop), field)):
+                field_index.setdefault(value, []).append(row)
+        timestamps = self.table.column("Timestamp")[rows.start:rows.stop]
+        in_order = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        if self._time_order is not None or not in_order or (self._last_timestamp is not None and timestamps[0] < self._last_timestamp):
+            # records arrived out of time order, maintain an explicit sorted row order
+            self._time_order = np.argsort(self.table.column("Timestamp"), kind="stable")
+        self._last_timestamp = max(int(timestamps.max()), self._last_timestamp or 0)
+
+    def compact(self, policy: MobiFlowRetentionPolicy, live_ue_keys=None) -> int:
+        '''
+        Apply a retention policy. The records the policy does not keep are compacted into per-UE summary counters
+        (self.summaries), and the table and indexes are rebuilt with the kept records. Only the kept records stay in
+        the index map; records up to the highest compacted index are skipped if added again.
+        Args:
+            policy (MobiFlowRetentionPolicy): the retention policy
+            live_ue_keys: if given, the records and summaries of the UEs whose (nr_cell_id, ue_id) is not in
+                live_ue_keys (e.g., expired UE sessions) are dropped
+        Returns:
+            int: the number of removed records
+        '''
+        with self._lock:
+            n = len(self.table)
+            self.compacted_size = n
+            if n == 0:
+                return 0
+            cells = self.table.column("nr_cell_id")
+            ue_ids = self.table.column("gnb_du_ue_f1ap_id")
+            timestamps = self.table.column("Timestamp")
+            latest_timestamp = int(timestamps.max())
+            # group the rows by UE, in MobiFlow index order
+            order = np.lexsort((self.table.column("Index"), ue_ids, cells))
+            cells, ue_ids = cells[order], ue_ids[order]
+            boundaries = np.nonzero((cells[1:] != cells[:-1]) | (ue_ids[1:] != ue_ids[:-1]))[0] + 1
+            rrc_msgs = self.table.get_values(order, "rrc_msg")
+            nas_msgs = self.table.get_values(order, "nas_msg")
+
+            keep = np.zeros(n, dtype=bool)
+            summaries = {}
+            for start, end in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [n]))):
+                key = (str(cells[start]), str(ue_ids[start]))
+                if live_ue_keys is not None and key not in live_ue_keys:
+                    continue
+                group = order[start:end]
+                mask = policy.select(timestamps[group], rrc_msgs[start:end], latest_timestamp)
+                keep[group[mask]] = True
+                if key in self.summaries:
+                    summaries[key] = self.summaries[key]
+                compacted = np.nonzero(~mask)[0]
+                if len(compacted) > 0:
+                    update_mobiflow_summary(summaries.setdefault(key, new_mobiflow_summary()), timestamps[group[compacted]].tolist(),
+                                            [rrc_msgs[start + i] for i in compacted], [nas_msgs[start + i] for i in compacted])
+            self.summaries = summaries
+
+            removed = n - int(keep.sum())
+            if removed == 0:
+                return 0
+            self.compacted_index = max(self.compacted_index, int(self.table.column("Index").max()))
+            self.table = self.table.take(np.nonzero(keep)[0])
+            self.compacted_size = len(self.table)
+            self._rows_by_index = {}
+            self.indexes = {field: {} for field in self.indexed_fields}
+            self._time_order = None
+            self._last_timestamp = None
+            if len(self.table) > 0:
+                self._index_rows(range(len(self.table)))
+            return removed
+
+    def get_by(self, field: str, value) -> list:
+        '''
+        Get the raw records whose indexed field equals the value, sorted by MobiFlow index.
+        '''
+        if field not in self.indexes:
+            raise ValueError(f"Field {field} is not indexed, available fields: {self.indexed_fields}")
+        with self._lock:
+            rows = self.indexes[field].get(self._index_key(field, value), [])
+            return self._sorted_records(rows)
+
+    def get_by_time_range(self, start_ts: int = None, end_ts: int = None) -> list:
+        '''
+        Get the raw records with start_ts <= timestamp <= end_ts, sorted by timestamp.
+        '''
+        with self._lock:
+            return self.table.to_records(self._rows_in_time_range(start_ts, end_ts))
+
+    def query(self, start_ts: int = None, end_ts: int = None, **filters) -> list:
+        '''
+        Get the raw records with start_ts <= timestamp <= end_ts whose indexed fields equal the filters
+        (e.g., nr_cell_id=20000, gnb_du_ue_f1ap_id=54649), sorted by timestamp.
+        '''
+        for field in filters:
+            if field not in self.indexes:
+                raise ValueError(f"Field {field} is not indexed, available fields: {self.indexed_fields}")
+        with self._lock:
+            if len(filters) == 0:
+                return self.table.to_records(self._rows_in_time_range(start_ts, end_ts))
+            # start from the smallest index list, the rows of an index list are in insertion order
+            row_lists = sorted((self.indexes[field].get(self._index_key(field, value), []) for field, value in filters.items()), key=len)
+            rows = np.asarray(row_lists[0], dtype=np.int64)
+            for other in row_lists[1:]:
+                rows = rows[np.isin(rows, other)]
+            timestamps = self.table.column("Timestamp")[rows]
+            if self._time_order is None:
+                # rows were appended in time order, bisect the time range
+                lo = 0 if start_ts is None else np.searchsorted(timestamps, start_ts, side="left")
+                hi = len(rows) if end_ts is None else np.searchsorted(timestamps, end_ts, side="right")
+                return self.table.to_records(rows[lo:hi])
+            mask = np.ones(len(rows), dtype=bool)
+            if start_ts is not None:
+                mask &= timestamps >= start_ts
+            if end_ts is not None:
+                mask &= timestamps <= end_ts
+            rows, timestamps = rows[mask], timestamps[mask]
+            return self.table.to_records(rows[np.argsort(timestamps, kind="stable")])
+
+    def _index_key(self, field: str, value):
+        # identifiers stored as categorical strings are looked up by their exact string (leading zeros included)
+        return str(value) if field in self.table.categorical_columns else int(value)
+
+    def latest_timestamp(self) -> int:
+        '''
+        Return the latest record timestamp, or None if the store is empty.
+        '''
+        return self._last_timestamp
+
+    def _rows_in_time_range(self, start_ts: int = None, end_ts: int = None) -> np.ndarray:
+        timestamps = self.table.column("Timestamp")
+        if self._time_order is not None:
+            timestamps = timestamps[self._time_order]
+        lo = 0 if start_ts is None else np.searchsorted(timestamps, start_ts, side="left")
+        hi = len(timestamps) if end_ts is None else np.searchsorted(timestamps, end_ts, side="right")
+        if self._time_order is not None:
+            return self._time_order[lo:hi]
+        return np.arange(lo, hi)
+
+    def _sorted_records(self, rows: list) -> list:
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[np.argsort(self.table.column("Index")[rows], kind="stable")]
+        return self.table.to_records(rows)
+
+    def get_all(self) -> list:
+        with self._lock:
+            return self._sorted_records(np.arange(len(self.table)))
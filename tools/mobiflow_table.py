@@ -0,0 +1,228 @@
+'''
+Columnar UE MobiFlow table backed by typed NumPy arrays.
+
+Numeric identifiers (cell and F1AP IDs), timestamps and state fields are stored as integers. RRC/NAS message names,
+other strings and the UE identifiers that may have leading zeros (rnti, s_tmsi, mobile_id) are stored as categorical
+codes. The nested network dict returned to the tools is only built as a view on demand.
+'''
+import numpy as np
+from .mobiflow_parser import parse_mobiflow_records
+
+bs_meta = "DataType,Index,Timestamp,Version,Generator,nr_cell_id,mcc,mnc,tac,report_period,status".split(",")
+ue_meta = "DataType,Index,Version,Generator,Timestamp,nr_cell_id,gnb_cu_ue_f1ap_id,gnb_du_ue_f1ap_id,rnti,s_tmsi,mobile_id,rrc_cipher_alg,rrc_integrity_alg,nas_cipher_alg,nas_integrity_alg,rrc_msg,nas_msg,rrc_state,nas_state,rrc_sec_state,reserved_field_1,reserved_field_2,reserved_field_3".split(",")
+
+class MobiFlowTable:
+    '''
+    Append-only columnar table of UE MobiFlow records.
+    '''
+    column_types = {
+        "Index": np.int64,
+        "Timestamp": np.int64,
+        "nr_cell_id": np.int64,
+        "gnb_cu_ue_f1ap_id": np.int64,
+        "gnb_du_ue_f1ap_id": np.int64,
+        "rrc_cipher_alg": np.int8,
+        "rrc_integrity_alg": np.int8,
+        "nas_cipher_alg": np.int8,
+        "nas_integrity_alg": np.int8,
+        "rrc_state": np.int8,
+        "nas_state": np.int8,
+        "rrc_sec_state": np.int8,
+        "reserved_field_1": np.int32,
+        "reserved_field_2": np.int32,
+        "reserved_field_3": np.int32,
+    }
+    categorical_columns = ["DataType", "Version", "Generator", "rnti", "s_tmsi", "mobile_id", "rrc_msg", "nas_msg"]
+
+    def __init__(self, meta: list = None, capacity: int = 1024):
+        self.meta = meta or ue_meta
+        self._positions = {name: pos for pos, name in enumerate(self.meta)}
+        self._size = 0
+        self._columns = {}
+        for name in self.meta:
+            dtype = np.int32 if name in self.categorical_columns else self.column_types.get(name, np.int64)
+            self._columns[name] = np.zeros(capacity, dtype=dtype)
+        self.categories = {name: [] for name in self.categorical_columns}  # column -> list of category values
+        self._category_codes = {name: {} for name in self.categorical_columns}  # column -> value -> code
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, n: int):
+        capacity = len(self._columns[self.meta[0]])
+        if self._size + n <= capacity:
+            return
+        while capacity < self._size + n:
+            capacity *= 2
+        for name, col in self._columns.items():
+            grown = np.zeros(capacity, dtype=col.dtype)
+            grown[:self._size] = col[:self._size]
+            self._columns[name] = grown
+
+    def _encode(self, name: str, value: str) -> int:
+        codes = self._category_codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(self.categories[name])
+            codes[value] = code
+            self.categories[name].append(value)
+        return code
+
+    def append_records(self, records: list) -> range:
+        '''
+        Append raw UE MobiFlow records (separated by ; delimiter). Malformed records are skipped.
+        Returns:
+            range: the row numbers of the appended records
+        '''
+        return self.append_parsed(parse_mobiflow_records(records))
+
+    def append_parsed(self, records: list) -> range:
+        '''
+        Append UE MobiFlow records parsed by mobiflow_parser. Records of different MobiFlow versions are mapped to the
+        table columns by field name, columns missing from a version are filled with 0 (or "" for categorical columns).
+        Returns:
+            range: the row numbers of the appended records
+        '''
+        start = self._size
+        if len(records) == 0:
+            return range(start, start)
+        n = len(records)
+        self._reserve(n)
+        # group consecutive records of the same schema and copy them column by column
+        offset = start
+        group_start = 0
+        for i in range(1, n + 1):
+            if i < n and type(records[i]) is type(records[group_start]):
+                continue
+            group = records[group_start:i]
+            values_by_field = dict(zip(group[0]._fields, zip(*group)))
+            for name in self.meta:
+                col = self._columns[name]
+                values = values_by_field.get(name)
+                if name in self.categorical_columns:
+                    col[offset:offset + len(group)] = [self._encode(name, v) for v in (values or [""] * len(group))]
+                else:
+                    col[offset:offset + len(group)] = values if values is not None else 0
+            offset += len(group)
+            group_start = i
+        self._size += n
+        return range(start, start + n)
+
+    def take(self, rows) -> "MobiFlowTable":
+        '''
+        Return a new table with the given rows (in the given order).
+        '''
+        table = MobiFlowTable(self.meta, max(len(rows), 1024))
+        for name, col in self._columns.items():
+            table._columns[name][:len(rows)] = col[:self._size][rows]
+        table.categories = {name: list(values) for name, values in self.categories.items()}
+        table._category_codes = {name: dict(codes) for name, codes in self._category_codes.items()}
+        table._size = len(rows)
+        return table
+
+    def column(self, name: str) -> np.ndarray:
+        '''
+        Return a read-only view of a column (categorical columns are returned as codes).
+        '''
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def code_of(self, name: str, value: str) -> int:
+        '''
+        Return the categorical code of a value, or -1 if the value has never been seen.
+        '''
+        return self._category_codes[name].get(value, -1)
+
+    def select(self, **conditions) -> np.ndarray:
+        '''
+        Vectorized filter. Returns the row numbers whose columns equal all given values,
+        e.g., select(nr_cell_id=20000, rrc_cipher_alg=0) or select(rrc_msg="RRCSetupRequest").
+        '''
+        mask = np.ones(self._size, dtype=bool)
+        for name, value in conditions.items():
+            if name in self.categorical_columns:
+                value = self.code_of(name, str(value))
+            mask &= self._columns[name][:self._size] == int(value)
+        return np.nonzero(mask)[0]
+
+    def get_values(self, rows, name: str) -> list:
+        '''
+        Return the values of a column for the given rows as Python objects (str for categorical columns, int otherwise).
+        '''
+        values = self._columns[name][rows].tolist()
+        if name in self.categorical_columns:
+            categories = self.categories[name]
+            return [categories[v] for v in values]
+        return values
+
+    def to_records(self, rows) -> list:
+        '''
+        Convert rows back to raw UE MobiFlow records (separated by ; delimiter).
+        '''
+        columns = [[str(v) for v in self.get_values(rows, name)] for name in self.meta]
+        return [";".join(fields) for fields in zip(*columns)]
+
+def build_network_view(bs_data: dict, table: MobiFlowTable, ue_keys=None, summaries: dict = None) -> dict:
+    '''
+    Build the nested network dict (cell -> BS data -> UE -> MobiFlow messages) from the BS data and the UE MobiFlow table.
+    UE records older than the BS record of their cell are left out, as the UE is not connected to the current BS session.
+    Args:
+        bs_data (dict): nr_cell_id (str) -> BS fields (str), including "timestamp"
+        table (MobiFlowTable): the UE MobiFlow table
+        ue_keys: if given, only the UEs whose (nr_cell_id, ue_id) is in ue_keys are included (e.g., the tracked UE sessions)
+        summaries (dict): (nr_cell_id, ue_id) -> summary counters of the compacted MobiFlow history, added to the UEs
+            as "mobiflow_summary"
+    Returns:
+        dict: the network data
+    '''
+    network = {}
+    for nr_cell_id, bs in bs_data.items():
+        network[nr_cell_id] = dict(bs)
+        network[nr_cell_id]["ue"] = {}
+    if len(table) == 0 or len(bs_data) == 0:
+        return network
+
+    # vectorized selection of the UE records that belong to the current BS session of their cell
+    bs_cells = np.array([int(c) for c in bs_data.keys()], dtype=np.int64)
+    bs_timestamps = np.array([int(bs["timestamp"]) for bs in bs_data.values()], dtype=np.int64)
+    order = np.argsort(bs_cells)
+    bs_cells, bs_timestamps = bs_cells[order], bs_timestamps[order]
+    cells = table.column("nr_cell_id")
+    pos = np.clip(np.searchsorted(bs_cells, cells), 0, len(bs_cells) - 1)
+    mask = (bs_cells[pos] == cells) & (table.column("Timestamp") >= bs_timestamps[pos])
+    rows = np.nonzero(mask)[0]
+
+    fields = ["Index", "Timestamp", "nr_cell_id", "gnb_cu_ue_f1ap_id", "gnb_du_ue_f1ap_id", "rnti", "s_tmsi", "mobile_id",
+              "rrc_cipher_alg", "rrc_integrity_alg", "nas_cipher_alg", "nas_integrity_alg", "rrc_msg", "nas_msg",
+              "rrc_state", "nas_state", "rrc_sec_state", "reserved_field_1", "reserved_field_2", "reserved_field_3"]
+    values = {name: table.get_values(rows, name) for name in fields}
+    ue_fields = ["gnb_cu_ue_f1ap_id", "rnti", "s_tmsi", "mobile_id", "rrc_cipher_alg", "rrc_integrity_alg", "nas_cipher_alg", "nas_integrity_alg"]
+    msg_fields = ["rrc_msg", "nas_msg", "rrc_state", "nas_state", "rrc_sec_state", "reserved_field_1", "reserved_field_2", "reserved_field_3"]
+    for i in range(len(rows)):
+        ue_id = str(values["gnb_du_ue_f1ap_id"][i])
+        nr_cell_id = str(values["nr_cell_id"][i])
+        if ue_keys is not None and (nr_cell_id, ue_id) not in ue_keys:
+            continue
+        timestamp = str(values["Timestamp"][i])
+        ues = network[nr_cell_id]["ue"]
+        message = {"msg_id": values["Index"][i], "abnormal": {"value": False, "source": "None"}}
+        for name in msg_fields:
+            message[name] = str(values[name][i])
+        message["timestamp"] = timestamp
+        if ue_id not in ues:
+            ues[ue_id] = {name: str(values[name][i]) for name in ue_fields}
+            ues[ue_id]["timestamp"] = timestamp
+            ues[ue_id]["mobiflow"] = [message]
+            ues[ue_id]["event"] = {}
+        else:
+            # update UE
+            for name in ue_fields:
+                ues[ue_id][name] = str(values[name][i])
+            ues[ue_id]["Timestamp"] = timestamp
+            ues[ue_id]["mobiflow"].append(message)
+
+    for (nr_cell_id, ue_id), summary in (summaries or {}).items():
+        if nr_cell_id in network and ue_id in network[nr_cell_id]["ue"]:
+            network[nr_cell_id]["ue"][ue_id]["mobiflow_summary"] = dict(summary, rrc_msg=dict(summary["rrc_msg"]), nas_msg=dict(summary["nas_msg"]))
+    return network
@@ -0,0 +1,84 @@
+'''
+Versioned network / event snapshots shared by concurrent requests.
+
+A snapshot is built off to the side from the in-memory MobiFlow and event data and published atomically with an
+increasing version number. Published snapshots are never modified, so readers need no lock. A graph run opens a
+snapshot_pin_scope() and pins the first snapshot it reads, so all its tools see the same network state.
+'''
+import time
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# network: nr_cell_id -> BS data and UEs, events: event ID -> event, event_index: field -> value -> event IDs
+# (event_index["timestamp"]: sorted (timestamp, event ID) pairs), the events and event index are EventStore views
+NetworkSnapshot = namedtuple("NetworkSnapshot", ["version", "timestamp", "network", "events", "event_index", "active_ue_ids"])
+
+class SnapshotManager:
+    '''
+    Holds the latest published snapshot. Publishing swaps a single reference, readers never see a half-built snapshot.
+    '''
+    def __init__(self):
+        self._current = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def current(self) -> NetworkSnapshot:
+        '''
+        Return the latest published snapshot, or None if nothing has been published yet.
+        '''
+        return self._current
+
+    def publish(self, network: dict, events: dict, event_index: dict, active_ue_ids) -> NetworkSnapshot:
+        '''
+        Publish a new snapshot. The given data must not be modified after publishing.
+        '''
+        with self._lock:
+            self._version += 1
+            snapshot = NetworkSnapshot(self._version, time.time(), network, events, event_index, frozenset(active_ue_ids))
+            self._current = snapshot
+        return snapshot
+
+class _SnapshotPin:
+    def __init__(self):
+        self.snapshot = None
+        self.lock = threading.Lock()
+
+_current_pin = ContextVar("mobillm_network_snapshot_pin", default=None)
+
+@contextmanager
+def snapshot_pin_scope():
+    '''
+    Open a scope (e.g., a graph run) in which the first snapshot read is pinned. Nested scopes reuse the outer pin.
+    '''
+    if _current_pin.get() is not None:
+        yield _current_pin.get()
+        return
+    token = _current_pin.set(_SnapshotPin())
+    try:
+        yield _current_pin.get()
+    finally:
+        _current_pin.reset(token)
+
+def get_pinned_snapshot() -> NetworkSnapshot:
+    '''
+    Return the snapshot pinned in the current scope, or None if no snapshot is pinned (or outside of a scope).
+    '''
+    pin = _current_pin.get()
+    if pin is None:
+        return None
+    return pin.snapshot
+
+def pin_snapshot(snapshot: NetworkSnapshot) -> NetworkSnapshot:
+    '''
+    Pin the snapshot in the current scope unless one is already pinned. Returns the pinned snapshot
+    (the given snapshot outside of a scope).
+    '''
+    pin = _current_pin.get()
+    if pin is None:
+        return snapshot
+    with pin.lock:
+        if pin.snapshot is None:
+            pin.snapshot = snapshot
+        return pin.snapshot
@@ -2,9 +2,27 @@ import subprocess
 import os
 import json
 import time
+import threading
+import atexit
 from langchain.tools import tool
 from ..utils import *
 from . import global_vars
+from .sdl_backend import SDLBackend, get_sdl_backend
+from .mobiflow_store import MobiFlowStore
+from .event_store import EventStore, query_event_ids
+from .ue_session import UESessionTracker
+from .mobiflow_retention import MobiFlowRetentionPolicy
+from .mobiflow_table import bs_meta, ue_meta, build_network_view
+from .mobiflow_parser import parse_mobiflow_records
+from .sdl_cache import cached_sdl_read, peek_sdl_snapshot, invalidate_sdl_cache
+from .time_series import TimeSeries
+from .sdl_watcher import SDLWatcher, create_sdl_change_feed
+from .service_status import ServiceStatusCache, KubernetesPodSource, DockerContainerSource
+from .network_snapshot import NetworkSnapshot, SnapshotManager, get_pinned_snapshot, pin_snapshot
+from .mobiflow_archive import MobiFlowArchive
+from .kpi_views import KPIViews, posture_flags, format_cell_kpis
+from .sdl_bytes import clean_sdl_str, extract_mobiflow_records, mobiflow_index
+from .telemetry_views import summarize_network, render_network_summary, render_ue_summaries
 
 def get_sample_data_path(filename: str) -> str:
     """
@@ -43,12 +61,52 @@ sdl_namespaces = ["ue_mobiflow", "bs_mobiflow", "mobiexpert-event", "mobiwatch-e
 pod_names = ["ricplt-e2mgr", "mobiflow-auditor", "mobiexpert-xapp", "mobiwatch-xapp"]
 display_names = ["E2 Manager", "MobiFlow Auditor xApp", "MobieXpert xApp", "MobiWatch xApp"]
 
-active_ue_data_time_series = {}
-active_bs_data_time_series = {}
-critical_event_time_series = {}
-total_event_time_series = {}
-current_active_ue_ids = []
 max_time_series_length = 90 # update once every 10 seconds, 15 minutes = 900 seconds = 90 data points
+active_ue_data_time_series = TimeSeries(max_time_series_length)
+active_bs_data_time_series = TimeSeries(max_time_series_length)
+critical_event_time_series = TimeSeries(max_time_series_length)
+total_event_time_series = TimeSeries(max_time_series_length)
+# dashboard window -> (window length in seconds, rollup resolution in seconds), None resolution serves the raw samples
+time_series_windows = {
+    "15m": (900, None),
+    "1h": (3600, 60),
+    "24h": (86400, 900),
+    "7d": (604800, 3600),
+}
+sdl_high_water_marks = {} # last seen integer key of each SDL namespace, used by incremental fetches
+bs_model = {} # latest BS MobiFlow fields by nr_cell_id, maintained by fetch_sdl_data_osc
+ue_mobiflow_store = MobiFlowStore() # indexed columnar UE MobiFlow records, maintained together with bs_model
+sdl_ingest_lock = threading.RLock()
+ue_sessions = UESessionTracker(global_vars.ue_session_idle_timeout) # UE session lifecycle, maintained by pull_mobiflow_data
+mobiflow_retention = MobiFlowRetentionPolicy(global_vars.mobiflow_max_messages_per_ue, global_vars.mobiflow_max_age or None)
+kpi_views = KPIViews() # per-cell KPIs and per-UE security posture, maintained by pull_mobiflow_data
+ue_sessions.add_listener(kpi_views.on_session_transition)
+event_store = EventStore() # events with stable IDs across polls, maintained by pull_event_data
+network_snapshots = SnapshotManager() # versioned network / event snapshots read by the tools
+sdl_watcher = None # background SDL watcher keeping the in-memory data live, see start_sdl_watcher
+service_status_cache = None # see get_service_status_cache
+mobiflow_archive = None # on-disk archive of the ingested MobiFlow records and events, see get_mobiflow_archive
+
+def clean_sdl_value(val: str) -> str:
+    '''
+    Remove the non-printable prefix (e.g., "€€") and control characters from a raw SDL value.
+    '''
+    return clean_sdl_str(val)
+
+def get_sdl_keys_sorted(sdl: SDLBackend, namespace: str) -> list:
+    '''
+    Get all integer keys of an SDL namespace in ascending order.
+    '''
+    return sorted(int(key) for key in sdl.get_keys(namespace) if key.strip().isdigit())
+
+def get_sdl_values_by_index(sdl: SDLBackend, namespace: str, index_list: list = None) -> list:
+    '''
+    Get the raw SDL values of a namespace ordered by their integer key. All keys are fetched if index_list is None.
+    '''
+    if index_list is None:
+        index_list = get_sdl_keys_sorted(sdl, namespace)
+    values = sdl.get(namespace, index_list)
+    return [values[k] for k in sorted(values.keys(), key=int)]
 
 def fetch_service_status_osc() -> dict:
     ''' 
@@ -73,84 +131,35 @@ def fetch_service_status_osc() -> dict:
                     services[display_name] = tokens[1].strip()
         return services
 
-    command = "kubectl get pods -A | awk {'print $2\";\"$3\";\"$4\";\"$5\";\"$6'}"
-    output = execute_command(command)
-    lines = output.split("\n")
-
-    for pod in pod_names:
-        pod_index = pod_names.index(pod)
-        display_name = display_names[pod_index]
-        services[display_name] = ""
-
-    for line in lines:
-        for pod in pod_names:
-            if pod in line:
-                pod_index = pod_names.index(pod)
-                display_name = display_names[pod_index]
-                services[display_name] = line.replace("(", "") # tmp soluton to solve getting (4d20h ago) as the age
-                break
-
-    # MobiFlow Agent
-    display_name = "MobiFlow Agent"
-    program_name = "mobiflow-agent"
-    
-    command_ps = "docker ps --format {{.ID}}\\\\t{{.Names}}\\\\t{{.Status}} --filter name=mobiflow-agent"
-    process_ps = execute_command(command_ps)
-    lines = process_ps.strip().split('\n')
-    services[display_name] = ""  # Default to empty string if not found
-
-    if lines and lines != ['']:
-        parts = lines[-1].split('\t')
-        if len(parts) >= 3:
-            # Skip malformed lines
-            container_id = parts[0]
-            container_name = parts[1]
-            raw_status = parts[2] # e.g., "Up 2 hours", "Exited (0) 5 minutes ago"
-
-            status_parts = raw_status.split(' ')
-            status = "Unknown"
-            up_time = "N/A"
-
-            # Determine status and uptime
-            if status_parts[0] == "Up":
-                status = "Running"
-                # Extract uptime from "Up X (minutes/hours/days)"
-                if len(status_parts) >= 3:
-                    up_time = status_parts[1] + status_parts[2][0] # e.g., "95m", "2h", "1d"
-            elif status_parts[0] == "Exited":
-                status = "Inactive"
-                if len(status_parts) >= 4:
-                    up_time = status_parts[2] + status_parts[3][0] # e.g., "5m", "1h"
-            else:
-                status = raw_status # Fallback if format is unexpected
-
-            # Get restart count using docker inspect
-            restart_count = 0
-            try:
-                command_inspect = "docker inspect -f '{{.RestartCount}}' %s" % program_name
-                process_inspect = execute_command(command_inspect)
-                restart_count = int(process_inspect.strip())
-            except subprocess.CalledProcessError as e_inspect:
-                print(f"Error inspecting container {container_id}: {e_inspect}")
-            except ValueError:
-                print(f"Could not parse restart count for {container_name}")
-
-
-            # Format and print the output
-            # The '1/1' part is assumed to be a static string as per your example.
-            formatted_output = f"{display_name};1/1;{status};{restart_count};{up_time}"
-            services[display_name] = formatted_output
-    
+    return get_service_status_cache().get_status()
 
-    # command = f"pgrep -x {program_name}" # need to makes sure pgrep is available
-    # output = execute_command(command)
-    # if output:
-    #     services["MobiFlow Agent"] = " ; ;Running; ;" # TODO get the age of the process
-    # else:
-    #     services["MobiFlow Agent"] = ""
-    
-    # print(json.dumps(services, indent=4))
-    return services
+async def afetch_service_status_osc() -> dict:
+    '''
+    Async variant of fetch_service_status_osc, the pod / container probes run as async subprocesses.
+    '''
+    if global_vars.simulation_mode is True:
+        return fetch_service_status_osc()
+    return await get_service_status_cache().aget_status()
+
+def get_service_status_cache() -> ServiceStatusCache:
+    '''
+    Get the service status cache of the RIC pods and the MobiFlow agent container, created on first use.
+    '''
+    global service_status_cache
+    if service_status_cache is None:
+        services = dict(zip(display_names, pod_names))
+        services["MobiFlow Agent"] = "mobiflow-agent"
+        # the MobiFlow agent status line starts with its display name, not the container name
+        service_status_cache = ServiceStatusCache([KubernetesPodSource(), DockerContainerSource(["mobiflow-agent"])], services, global_vars.service_status_ttl,
+                                                  labels={"MobiFlow Agent": "MobiFlow Agent"})
+    return service_status_cache
+
+def start_service_status_refresher():
+    '''
+    Keep the service status cache up to date in the background. No-op in simulation mode.
+    '''
+    if global_vars.simulation_mode is not True:
+        get_service_status_cache().start()
 
 @tool
 def fetch_service_status_tool() -> dict:
@@ -162,217 +171,320 @@ def fetch_service_status_tool() -> dict:
     '''
     return fetch_service_status_osc()
 
-def fetch_sdl_data_osc() -> dict:
+fetch_service_status_tool.coroutine = afetch_service_status_osc
+
+def fetch_sdl_data_osc(incremental: bool = True) -> dict:
     ''' 
     Fetch network data from SDL
+        Args:
+            incremental (bool): if True, only fetch the MobiFlow records above the last seen index of each namespace
+                and merge them into the in-memory MobiFlow data. Otherwise reset the in-memory data
+                (see reset_sdl_high_water_marks) and rebuild it from all records.
         Returns:
             dict: A dictionary containing the network data
     '''
-    # get namespaces from SDL
-    get_ns_command = 'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get namespaces'
-    ns_output = execute_command(get_ns_command)
+    # print(json.dumps(network, indent=4))
+    return get_network_snapshot(incremental).network
 
-    # Parse namespaces (split by newlines)
-    namespaces = [ns.strip() for ns in ns_output.split("\n") if ns.strip()]
-    # print(namespaces)
+def get_network_snapshot(incremental: bool = True) -> NetworkSnapshot:
+    '''
+    Return the network snapshot pinned by the current graph run. If none is pinned yet, a new snapshot is
+    refreshed, published and pinned for the rest of the run.
+    '''
+    snapshot = get_pinned_snapshot()
+    if snapshot is None:
+        snapshot = pin_snapshot(refresh_network_snapshot(incremental))
+    return snapshot
 
-    # Iterate over the desired namespaces to get all keys
-    ns_target = sdl_namespaces
-    key_len_by_namespace = {}
+async def aget_network_snapshot(incremental: bool = True) -> NetworkSnapshot:
+    '''
+    Async variant of get_network_snapshot. A pinned snapshot is returned on the event loop, a refresh (which may read
+    SDL and waits for the ingest lock) runs in a worker thread.
+    '''
+    snapshot = get_pinned_snapshot()
+    if snapshot is None:
+        snapshot = pin_snapshot(await asyncio.to_thread(refresh_network_snapshot, incremental))
+    return snapshot
 
-    for namespace in ns_target:
-        if namespace in namespaces:
-            get_key_command = f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get keys {namespace}'
-            keys_output = execute_command(get_key_command)
+async def afetch_sdl_data_osc(incremental: bool = True) -> dict:
+    '''
+    Async variant of fetch_sdl_data_osc.
+    '''
+    return (await aget_network_snapshot(incremental)).network
 
-            # Parse keys (split by newlines)
-            keys = [key.strip() for key in keys_output.split("\n") if key.strip()]
+def refresh_network_snapshot(incremental: bool = True) -> NetworkSnapshot:
+    '''
+    Bring the in-memory MobiFlow and event data up to date, build a network / event snapshot off to the side and
+    publish it. Published snapshots are never modified, readers holding an older one are not affected.
+    A non-incremental refresh resets the in-memory data (see reset_sdl_high_water_marks) and pulls all records again.
+    '''
+    with sdl_ingest_lock:
+        if not incremental:
+            reset_sdl_high_water_marks()
+        network = ingest_mobiflow_data(force_pull=not incremental)
+        events = ingest_event_data(force_pull=not incremental)
+        current_active_bs, active_ue_ids = get_active_network_stats(network, ue_sessions.active_ue_keys)
+
+        # indicate whether the events are related to active UEs (only the UEs that changed are re-evaluated)
+        events.set_active_ue_ids(active_ue_ids)
+        _, event_data, event_index = events.snapshot()
+        current_critical_event, current_total_event = events.active_critical_count, events.active_count
+        snapshot = network_snapshots.publish(network, event_data, event_index, active_ue_ids)
 
-            # Store the keys by namespace
-            key_len_by_namespace[namespace] = len(keys)
-        else:
-            print(f"Namespace '{namespace}' not found in the available namespaces.")
-            key_len_by_namespace[namespace] = -1
-
-
-    max_batch_get_value = 20  # max number of keys to fetch in a single batch
-    get_val_command = lambda ns, key: f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get {ns} {key}'  # template get value command
-    network = {}
-
-
-    # get all BS mobiflow
-    bs_mobiflow_key = ns_target[1]
-    bs_meta = "DataType,Index,Timestamp,Version,Generator,nr_cell_id,mcc,mnc,tac,report_period,status".split(",")
-    values = get_bs_mobiflow_data_all_tool.invoke("")
-    for val in values:
-        bs_mf_item = val.split(";")
-        nr_cell_id = bs_mf_item[bs_meta.index("nr_cell_id")]
-        timestamp = bs_mf_item[bs_meta.index("Timestamp")]
-        mcc = bs_mf_item[bs_meta.index("mcc")]
-        mnc = bs_mf_item[bs_meta.index("mnc")]
-        tac = bs_mf_item[bs_meta.index("tac")]
-        report_period = bs_mf_item[bs_meta.index("report_period")]
-        status = bs_mf_item[bs_meta.index("status")]
-        network[nr_cell_id] = {
-            "mcc": mcc,
-            "mnc": mnc,
-            "tac": tac,
-            "report_period": report_period,
-            "status": status,
-            "timestamp": timestamp,
-            "ue": {}
-        }
+    # update time series data
+    update_network_time_series(current_active_bs, len(active_ue_ids))
+    # in simulation mode, the events are static sample data
+    if global_vars.simulation_mode is not True:
+        update_event_time_series(current_critical_event, current_total_event)
+    return snapshot
 
-    # get all UE mobiflow
-    ue_mobiflow_key = ns_target[0]
-    ue_meta = "DataType,Index,Version,Generator,Timestamp,nr_cell_id,gnb_cu_ue_f1ap_id,gnb_du_ue_f1ap_id,rnti,s_tmsi,mobile_id,rrc_cipher_alg,rrc_integrity_alg,nas_cipher_alg,nas_integrity_alg,rrc_msg,nas_msg,rrc_state,nas_state,rrc_sec_state,reserved_field_1,reserved_field_2,reserved_field_3".split(",")
-    values = get_ue_mobiflow_data_all_tool.invoke("")
-    for val in values:
-        ue_mf_item = val.split(";")
-        ue_id = ue_mf_item[ue_meta.index("gnb_du_ue_f1ap_id")]
-        nr_cell_id = ue_mf_item[ue_meta.index("nr_cell_id")]
-        if nr_cell_id in network:
-            ue_timestamp = ue_mf_item[ue_meta.index('Timestamp')]
-            bs_timestamp = network[nr_cell_id]["timestamp"]
-            # don't report UE if the UE's timestamp is older than the BS's timestamp, which means the UE is not connected to the BS
-            if ue_timestamp < bs_timestamp:
-                continue
-            if ue_id not in network[nr_cell_id]["ue"]:
-                # add UE
-                network[nr_cell_id]["ue"][ue_id] = {
-                    "gnb_cu_ue_f1ap_id": ue_mf_item[ue_meta.index("gnb_cu_ue_f1ap_id")],
-                    "rnti": ue_mf_item[ue_meta.index("rnti")],
-                    "s_tmsi": ue_mf_item[ue_meta.index("s_tmsi")],
-                    "mobile_id": ue_mf_item[ue_meta.index("mobile_id")],
-                    "rrc_cipher_alg": ue_mf_item[ue_meta.index("rrc_cipher_alg")],
-                    "rrc_integrity_alg": ue_mf_item[ue_meta.index("rrc_integrity_alg")],
-                    "nas_cipher_alg": ue_mf_item[ue_meta.index("nas_cipher_alg")],
-                    "nas_integrity_alg": ue_mf_item[ue_meta.index("nas_integrity_alg")],
-                    "timestamp": ue_mf_item[ue_meta.index('Timestamp')],
-                    "mobiflow": [{
-                        "msg_id": int(ue_mf_item[ue_meta.index("Index")]),
-                        "abnormal": {
-                            "value": False,
-                            "source": "None"
-                        },
-                        "rrc_msg": ue_mf_item[ue_meta.index("rrc_msg")],
-                        "nas_msg": ue_mf_item[ue_meta.index("nas_msg")],
-                        "rrc_state": ue_mf_item[ue_meta.index("rrc_state")],
-                        "nas_state": ue_mf_item[ue_meta.index("nas_state")],
-                        "rrc_sec_state": ue_mf_item[ue_meta.index("rrc_sec_state")],
-                        "reserved_field_1": ue_mf_item[ue_meta.index("reserved_field_1")],
-                        "reserved_field_2": ue_mf_item[ue_meta.index("reserved_field_2")],
-                        "reserved_field_3": ue_mf_item[ue_meta.index("reserved_field_3")],
-                        "timestamp": ue_mf_item[ue_meta.index('Timestamp')],
-                    }],
-                    "event": {}
-                }
-            else:
-                # update UE
-                network[nr_cell_id]["ue"][ue_id]["gnb_cu_ue_f1ap_id"] = ue_mf_item[ue_meta.index("gnb_cu_ue_f1ap_id")]
-                network[nr_cell_id]["ue"][ue_id]["rnti"] = ue_mf_item[ue_meta.index("rnti")]
-                network[nr_cell_id]["ue"][ue_id]["s_tmsi"] = ue_mf_item[ue_meta.index("s_tmsi")]
-                network[nr_cell_id]["ue"][ue_id]["mobile_id"] = ue_mf_item[ue_meta.index("mobile_id")]
-                network[nr_cell_id]["ue"][ue_id]["rrc_cipher_alg"] = ue_mf_item[ue_meta.index("rrc_cipher_alg")]
-                network[nr_cell_id]["ue"][ue_id]["rrc_integrity_alg"] = ue_mf_item[ue_meta.index("rrc_integrity_alg")]
-                network[nr_cell_id]["ue"][ue_id]["nas_cipher_alg"] = ue_mf_item[ue_meta.index("nas_cipher_alg")]
-                network[nr_cell_id]["ue"][ue_id]["nas_integrity_alg"] = ue_mf_item[ue_meta.index("nas_integrity_alg")]
-                network[nr_cell_id]["ue"][ue_id]["Timestamp"] = ue_mf_item[ue_meta.index("Timestamp")]
-                network[nr_cell_id]["ue"][ue_id]["mobiflow"].append({
-                    "msg_id": int(ue_mf_item[ue_meta.index("Index")]),
-                    "abnormal": {
-                        "value": False,
-                        "source": "None"
-                    },
-                    "rrc_msg": ue_mf_item[ue_meta.index("rrc_msg")],
-                    "nas_msg": ue_mf_item[ue_meta.index("nas_msg")],
-                    "rrc_state": ue_mf_item[ue_meta.index("rrc_state")],
-                    "nas_state": ue_mf_item[ue_meta.index("nas_state")],
-                    "rrc_sec_state": ue_mf_item[ue_meta.index("rrc_sec_state")],
-                    "reserved_field_1": ue_mf_item[ue_meta.index("reserved_field_1")],
-                    "reserved_field_2": ue_mf_item[ue_meta.index("reserved_field_2")],
-                    "reserved_field_3": ue_mf_item[ue_meta.index("reserved_field_3")],
-                    "timestamp": ue_mf_item[ue_meta.index('Timestamp')],
-                })
-        else:
-            print("nr_cell_id not found")
+def ingest_mobiflow_data(force_pull: bool = False) -> dict:
+    '''
+    Bring the in-memory BS data and UE MobiFlow store up to date and build the network data from them.
+    While the SDL watcher is running, it keeps the in-memory data up to date and no SDL read is made here,
+    unless force_pull is set (e.g., after a reset).
+    Returns:
+        dict: the network data, built as a view over the BS data and the UE MobiFlow table
+    '''
+    with sdl_ingest_lock:
+        if force_pull or not is_sdl_watcher_running():
+            pull_mobiflow_data()
+        # UEs whose session expired are evicted from the network data
+        return build_network_view(bs_model, ue_mobiflow_store.table, ue_sessions.sessions, ue_mobiflow_store.summaries)
 
-    # print(json.dumps(network, indent=4))
+def pull_mobiflow_data():
+    '''
+    Pull the BS / UE MobiFlow records above the high-water marks from SDL into the in-memory BS data and the indexed
+    UE MobiFlow store. After reset_sdl_high_water_marks, all records are pulled again.
+    '''
+    with sdl_ingest_lock:
+        bs_values = fetch_new_mobiflow_data(sdl_namespaces[1], get_bs_mobiflow_data_by_index)
+        ue_values = fetch_new_mobiflow_data(sdl_namespaces[0], get_ue_mobiflow_data_by_index)
 
-    # update time series data
-    update_network_time_series(network)
+        # merge all BS mobiflow
+        merge_bs_mobiflow(bs_model, bs_values)
+
+        # merge all UE mobiflow
+        rows = ue_mobiflow_store.add_records(ue_values)
+
+        # archive the new records before the retention policy compacts them
+        archive = get_mobiflow_archive()
+        if archive is not None:
+            archive.append_mobiflow("bs", bs_values)
+            archive.append_table_rows(ue_mobiflow_store.table, rows)
+
+        # update the UE sessions with the new records
+        ue_sessions.observe_rows(ue_mobiflow_store.table, rows)
+        kpi_views.observe_rows(ue_mobiflow_store.table, rows)
+        ue_sessions.expire_idle()
+
+        # compact the MobiFlow history once enough records have been added since the last compaction
+        if len(ue_mobiflow_store) - ue_mobiflow_store.compacted_size >= mobiflow_retention.compact_interval:
+            ue_mobiflow_store.compact(mobiflow_retention, ue_sessions.sessions)
+
+def get_mobiflow_archive() -> MobiFlowArchive:
+    '''
+    Return the MobiFlow archive, opened on first use, or None if no archive directory is configured (MOBIFLOW_ARCHIVE_DIR).
+    '''
+    global mobiflow_archive
+    if mobiflow_archive is None and global_vars.mobiflow_archive_dir:
+        mobiflow_archive = MobiFlowArchive(global_vars.mobiflow_archive_dir, global_vars.mobiflow_archive_segment_rows)
+        # write the buffered records on exit
+        atexit.register(mobiflow_archive.close)
+    return mobiflow_archive
+
+def get_new_sdl_keys(sdl: SDLBackend, namespace: str) -> list:
+    '''
+    Get the integer keys of an SDL namespace above its high-water mark, in ascending order. The mark is not changed,
+    see advance_sdl_high_water_mark. The keys are listed rather than probed in ranges after the mark, so gaps
+    (deleted or expired keys) do not stop the ingest.
+    '''
+    mark = sdl_high_water_marks.get(namespace, -1)
+    # only the new keys are sorted
+    return sorted(key for key in (int(key) for key in sdl.get_keys(namespace) if key.strip().isdigit()) if key > mark)
+
+def advance_sdl_high_water_mark(namespace: str, keys: list, fetched_keys: set):
+    '''
+    Advance the high-water mark of a namespace over the requested keys (ascending) up to the first key whose value
+    did not come back. A failed or partial fetch (the backends return what they got) leaves the missing keys above
+    the mark, so the next incremental fetch reads them again.
+    '''
+    mark = None
+    for key in keys:
+        if key not in fetched_keys:
+            break
+        mark = key
+    if mark is not None:
+        sdl_high_water_marks[namespace] = mark
+
+def fetch_new_mobiflow_data(namespace: str, get_data_by_index) -> list:
+    '''
+    Fetch the MobiFlow records whose SDL key is above the high-water mark of the namespace.
+    Args:
+        namespace (str): the SDL namespace
+        get_data_by_index (function): function that fetches raw MobiFlow records from a list of keys
+    Returns:
+        list: a list of new MobiFlow records in raw format (separated by ; delimiter), sorted by key
+    '''
+    keys = get_new_sdl_keys(get_sdl_backend(), namespace)
+    if len(keys) == 0:
+        return []
+    values = get_data_by_index(keys)
+    # the SDL key of a MobiFlow record is its MobiFlow index
+    advance_sdl_high_water_mark(namespace, keys, set(mobiflow_index(value) for value in values))
+    return values
+
+def set_sdl_data(namespace: str, items: dict):
+    '''
+    Write key-value pairs into an SDL namespace and invalidate its snapshot in the current request.
+    '''
+    get_sdl_backend().set(namespace, items)
+    invalidate_sdl_cache(namespace)
+
+def fetch_new_sdl_items(sdl: SDLBackend, namespace: str) -> dict:
+    '''
+    Fetch the raw SDL values whose integer key is above the high-water mark of the namespace.
+    Returns:
+        dict: {key: raw value}, sorted by key
+    '''
+    keys = get_new_sdl_keys(sdl, namespace)
+    if len(keys) == 0:
+        return {}
+    values = sdl.get(namespace, keys)
+    advance_sdl_high_water_mark(namespace, keys, set(int(k) for k in values.keys()))
+    return {k: values[k] for k in sorted(values.keys(), key=int)}
+
+def reset_sdl_high_water_marks():
+    '''
+    Forget the last seen index of every namespace, e.g., after the xApps restarted and reset their SDL keys.
+    The next incremental fetch will pull all records again.
+    Events keep their IDs, as the event store recognizes events that are written again by their content.
+    '''
+    global bs_model, ue_mobiflow_store
+    with sdl_ingest_lock:
+        sdl_high_water_marks.clear()
+        bs_model = {}
+        ue_mobiflow_store = MobiFlowStore()
+        ue_sessions.reset()
+        # the KPI views skip rows at or below the last observed index, which restarts from 0 with the xApps
+        kpi_views.reset()
+
+def apply_sdl_changes(namespaces: set):
+    '''
+    Pull the changed SDL namespaces into the in-memory data. Invoked by the SDL watcher.
+    '''
+    if sdl_namespaces[0] in namespaces or sdl_namespaces[1] in namespaces:
+        pull_mobiflow_data()
+    if sdl_namespaces[2] in namespaces or sdl_namespaces[3] in namespaces:
+        pull_event_data()
 
-    return network
+def start_sdl_watcher(change_feed=None) -> SDLWatcher:
+    '''
+    Start the background SDL watcher. While it runs, the tools read the in-memory data it maintains without SDL reads.
+    Args:
+        change_feed: the change feed to watch, defaults to keyspace notifications for the Redis backend and polling otherwise
+    Returns:
+        SDLWatcher: the running watcher
+    '''
+    global sdl_watcher
+    stop_sdl_watcher()
+    if change_feed is None:
+        change_feed = create_sdl_change_feed(get_sdl_backend(), sdl_namespaces, global_vars.sdl_watch_poll_interval,
+                                             global_vars.sdl_watch_configure_notifications)
+    # catch up with the records written before the feed was subscribed
+    pull_mobiflow_data()
+    pull_event_data()
+    sdl_watcher = SDLWatcher(change_feed, apply_sdl_changes)
+    sdl_watcher.start()
+    return sdl_watcher
+
+def stop_sdl_watcher():
+    '''
+    Stop the background SDL watcher, the tools pull from SDL again.
+    '''
+    global sdl_watcher
+    if sdl_watcher is not None:
+        sdl_watcher.stop()
+        sdl_watcher = None
+
+def is_sdl_watcher_running() -> bool:
+    return sdl_watcher is not None and sdl_watcher.is_running()
+
+def merge_bs_mobiflow(bs_data: dict, values: list):
+    '''
+    Merge raw BS MobiFlow records into the BS data (nr_cell_id -> latest BS fields)
+    '''
+    for record in parse_mobiflow_records(values):
+        bs_data[str(record.nr_cell_id)] = {
+            "mcc": str(record.mcc),
+            "mnc": str(record.mnc),
+            "tac": str(record.tac),
+            "report_period": str(record.report_period),
+            "status": str(record.status),
+            "timestamp": str(record.Timestamp),
+        }
 
-def update_network_time_series(network: dict):
+def get_active_network_stats(network: dict, active_ue_keys: set) -> tuple:
     '''
-    Update the time series data for the network data. Invoked when fetch_sdl_data_osc is called.
+    Count the active base stations and collect the IDs of the UEs with an active session on them.
+    Args:
+        network (dict): the network data
+        active_ue_keys (set): (nr_cell_id, ue_id) of the active UE sessions
+    Returns:
+        tuple: (number of active BS, list of active UE IDs as str)
     '''
-    current_active_ue = 0
     current_active_bs = 0
-    global current_active_ue_ids
     current_active_ue_ids = []
     for nr_cell_id in network.keys():
         if int(network[nr_cell_id]["status"]) == 1:
             current_active_bs += 1
             if "ue" in network[nr_cell_id].keys():
-                current_active_ue += len(network[nr_cell_id]["ue"].keys())
-                current_active_ue_ids.extend([int(ue_id) for ue_id in network[nr_cell_id]["ue"].keys()])
-    
+                current_active_ue_ids.extend([str(ue_id) for ue_id in network[nr_cell_id]["ue"].keys() if (nr_cell_id, ue_id) in active_ue_keys])
+    return current_active_bs, current_active_ue_ids
+
+def update_network_time_series(current_active_bs: int, current_active_ue: int):
+    '''
+    Update the time series data for the network data with the number of active BS and UEs.
+    Invoked when a network snapshot is refreshed.
+    '''
     # get current timestamp (integer)
     current_ts = int(time.time())
-    active_bs_data_time_series[current_ts] = current_active_bs
-    active_ue_data_time_series[current_ts] = current_active_ue
-
-    # remove the oldest timestamp
-    if len(active_bs_data_time_series) > max_time_series_length:
-        active_bs_data_time_series.pop(min(active_bs_data_time_series.keys()))
-    if len(active_ue_data_time_series) > max_time_series_length:
-        active_ue_data_time_series.pop(min(active_ue_data_time_series.keys()))
-
-def update_event_time_series(event: dict):
-    '''
-    Update the time series data for the event data. Invoked when fetch_sdl_event_data_osc is called.
-    '''
-    current_critical_event = 0
-    current_total_event = 0
-    for event_id in event.keys():
-        if event[event_id]["active"] is False:
-            continue # skip inactive events
-        if event[event_id]["severity"] == "Critical":
-            current_critical_event += 1
-        current_total_event += 1
-    
+    active_bs_data_time_series.append(current_ts, current_active_bs)
+    active_ue_data_time_series.append(current_ts, current_active_ue)
+
+def update_event_time_series(current_critical_event: int, current_total_event: int):
+    '''
+    Update the time series data for the event data with the number of active (critical) events.
+    Invoked when a network snapshot is refreshed.
+    '''
     current_ts = int(time.time())
-    critical_event_time_series[current_ts] = current_critical_event
-    total_event_time_series[current_ts] = current_total_event
-
-    # remove the oldest timestamp
-    if len(critical_event_time_series) > max_time_series_length:
-        critical_event_time_series.pop(min(critical_event_time_series.keys()))
-    if len(total_event_time_series) > max_time_series_length:
-        total_event_time_series.pop(min(total_event_time_series.keys()))
-
-def get_time_series_data() -> dict:
-    global active_bs_data_time_series, active_ue_data_time_series
-    global critical_event_time_series, total_event_time_series
-    ts = {}
+    critical_event_time_series.append(current_ts, current_critical_event)
+    total_event_time_series.append(current_ts, current_total_event)
+
+def get_time_series_data(window: str = "15m") -> dict:
+    '''
+    Get the time series data of the dashboard.
+    Args:
+        window (str): "15m" returns the last 90 raw samples (15 minutes of 10 second updates) as {timestamp: value}. "1h", "24h" and
+            "7d" return 1 minute, 15 minute and 1 hour rollups as {bucket timestamp: {"min", "max", "avg"}}.
+    Returns:
+        dict: the time series of active_bs, active_ue, critical_event and total_event
+    '''
+    if window not in time_series_windows:
+        raise ValueError(f"Unknown time series window: {window}, available windows: {list(time_series_windows.keys())}")
+    window_length, resolution = time_series_windows[window]
     # active_bs_data_time_series_example = {
     #     1721731200: 0,
     #     1721731210: 0,
     #     1721731220: 0,
     #     1721731230: 4,
     #     1721731240: 5,
-    #     1721731250: 5,
-    #     1721731260: 5,
-    #     1721731270: 5,
-    #     1721731280: 8,
-    #     1721731290: 8,
     # }
-    ts["active_bs"] = active_bs_data_time_series
-    ts["active_ue"] = active_ue_data_time_series
-    ts["critical_event"] = critical_event_time_series
-    ts["total_event"] = total_event_time_series
+    ts = {}
+    ts["active_bs"] = active_bs_data_time_series.get_window(window_length, resolution)
+    ts["active_ue"] = active_ue_data_time_series.get_window(window_length, resolution)
+    ts["critical_event"] = critical_event_time_series.get_window(window_length, resolution)
+    ts["total_event"] = total_event_time_series.get_window(window_length, resolution)
     return ts
 
 @tool
@@ -384,180 +496,179 @@ def fetch_sdl_data_osc_tool() -> dict:
     '''
     return fetch_sdl_data_osc()
 
-def fetch_sdl_event_data_osc() -> dict:
+fetch_sdl_data_osc_tool.coroutine = afetch_sdl_data_osc
+
+def get_network_summary(snapshot: NetworkSnapshot = None, top_k: int = 20, token_budget: int = None) -> str:
+    '''
+    Summarize a network snapshot (per-cell counters, algorithm distributions and the top_k most anomalous UEs)
+    in the compact format of telemetry_views, within the token budget (default: global_vars.tool_token_budget).
+    '''
+    snapshot = snapshot or get_network_snapshot()
+    summary = summarize_network(snapshot.network, snapshot.events, snapshot.event_index, snapshot.active_ue_ids)
+    return render_network_summary(summary, token_budget or global_vars.tool_token_budget, top_k)
+
+async def aget_network_summary(top_k: int = 20) -> str:
+    '''
+    Async variant of get_network_summary.
+    '''
+    return get_network_summary(await aget_network_snapshot(), top_k)
+
+def get_ue_summary(ue_id: str, snapshot: NetworkSnapshot = None, token_budget: int = None) -> str:
+    '''
+    Summarize the MobiFlow state machine, algorithms, anomaly flags and events of a UE (in each cell it is seen in).
+    '''
+    snapshot = snapshot or get_network_snapshot()
+    network = {nr_cell_id: {"ue": {str(ue_id): cell["ue"][str(ue_id)]}} for nr_cell_id, cell in snapshot.network.items() if str(ue_id) in cell["ue"]}
+    if len(network) == 0:
+        return f"UE {ue_id} not found"
+    summary = summarize_network(network, snapshot.events, snapshot.event_index, snapshot.active_ue_ids)
+    return render_ue_summaries(summary["ues"], token_budget or global_vars.tool_token_budget)
+
+async def aget_ue_summary(ue_id: str) -> str:
+    '''
+    Async variant of get_ue_summary.
+    '''
+    return get_ue_summary(ue_id, await aget_network_snapshot())
+
+@tool
+def get_network_summary_tool(top_k: int = 20) -> str:
+    '''
+    Get a compact summary of the network, computed from the MobiFlow and event data. Prefer it over the raw network or MobiFlow data for an overview.
+    The first line holds the totals (cells, UEs, active UEs, MobiFlow messages, released UEs, events, critical events). The second line holds the
+    distribution of the RRC / NAS cipher and integrity algorithms (algorithm value:number of UEs, 0 is the null algorithm). Then come the UEs with the
+    highest anomaly score and the counters of each cell.
+    A UE line reads "ue <ue_id>@<cell_id> score=<anomaly score> msgs=<messages> t=<first>-<last timestamp> states=<rrc_state/nas_state/rrc_sec_state path> last=<last RRC message> alg=<rrc_cipher/rrc_integrity/nas_cipher/nas_integrity>",
+    followed by "released", anomaly flags (null_cipher, null_integrity, shared_s_tmsi, repeated_security_mode, incomplete_attach) and its event counts.
+    Args:
+        top_k (int): max number of anomalous UEs to list
+    Returns:
+        str: the network summary, one item per line
+    '''
+    return get_network_summary(top_k=top_k)
+
+get_network_summary_tool.coroutine = aget_network_summary
+
+@tool
+def get_ue_summary_tool(ue_id: str) -> str:
+    '''
+    Get a compact summary of a UE computed from its MobiFlow and event data: message count, time range, the path of its rrc_state/nas_state/rrc_sec_state
+    state machine, last RRC message, algorithms (rrc_cipher/rrc_integrity/nas_cipher/nas_integrity), anomaly flags and event counts.
+    Use it before fetching the raw MobiFlow telemetry of the UE.
+    Args:
+        ue_id (str): the UE ID
+    Returns:
+        str: one summary line per cell the UE is seen in
+    '''
+    return get_ue_summary(ue_id)
+
+get_ue_summary_tool.coroutine = aget_ue_summary
+
+def fetch_sdl_event_data_osc(incremental: bool = True) -> dict:
     ''' 
     Fetch network event data generated by MobieXpert and MobiWatch from SDL
+    Args:
+        incremental (bool): if True, only fetch the events above the last seen key of each namespace and merge them
+            into the in-memory event data. Otherwise reset the in-memory data (see reset_sdl_high_water_marks) and
+            read all events again.
     Returns:
         dict: A dictionary containing the network event data.
     '''
-    event = {}
-    event_id_counter = 1
-    # if simulation mode is enabled, read from the sample data file
-    if global_vars.simulation_mode is True:
-        # read MobieXpert events
-        with open(get_sample_data_path("5G-Sample-Data - Event - MobieXpert.csv"), "r") as f:
-            event_meta = "Event ID,Event Name,Affected base station ID,Time,Affected UE ID,Description,Level".split(",")
-            lines = f.readlines()
-            for line in lines:
-                event_item = line.strip().split(";")
-                event[event_id_counter] = {
-                    "id": event_id_counter,
-                    "source": "MobieXpert",
-                    "name": event_item[event_meta.index("Event Name")],
-                    "cellID": event_item[event_meta.index("Affected base station ID")],
-                    "ueID": event_item[event_meta.index("Affected UE ID")],
-                    "timestamp": event_item[event_meta.index("Time")],
-                    "severity": event_item[event_meta.index("Level")],
-                    "description": event_item[event_meta.index("Description")],
-                    "active": True
-                }
-                event_id_counter += 1
-
-        # read MobiWatch events
-        with open(get_sample_data_path("5G-Sample-Data - Event - MobiWatch.csv"), "r") as f:
-            event_meta = "id,source,name,cellID,ueID,timestamp,severity,mobiflow_index,description".split(",")
-            lines = f.readlines()
-            for line in lines:
-                event_item = line.strip().split(";")
-                model_name = event_item[0]
-                # f"{model_name};{event['event_name']};{event['nr_cell_id']};{event['ue_id']};{event['timestamp']};{index_str};{event_desc}"
-                event[event_id_counter] = {
-                    "id": event_id_counter,
-                    "source": f"MobiWatch_{model_name}",
-                    "name": event_item[1],
-                    "cellID": event_item[2],
-                    "ueID": event_item[3],
-                    "timestamp": event_item[4],
-                    "severity": "Warning",
-                    "mobiflow_index": event_item[5],
-                    "description": event_item[6],
-                    "active": True
-                }
-                event_id_counter += 1
-
-        return event
-
-    # get namespaces from SDL
-    get_ns_command = 'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get namespaces'
-    ns_output = execute_command(get_ns_command)
-
-    # Parse namespaces (split by newlines)
-    namespaces = [ns.strip() for ns in ns_output.split("\n") if ns.strip()]
-
-    # Iterate over the desired namespaces to get all keys
-    ns_target = ["mobiexpert-event", "mobiwatch-event"]
-    key_len_by_namespace = {}
-
-    for namespace in ns_target:
-        if namespace in namespaces:
-            get_key_command = f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get keys {namespace}'
-            keys_output = execute_command(get_key_command)
-
-            # Parse keys (split by newlines)
-            keys = [key.strip() for key in keys_output.split("\n") if key.strip()]
-
-            # Store the keys by namespace
-            key_len_by_namespace[namespace] = len(keys)
-        else:
-            print(f"Namespace '{namespace}' not found in the available namespaces.")
-            key_len_by_namespace[namespace] = -1
+    return dict(get_network_snapshot(incremental).events)
 
-    # variable to hold sdl event data
-    max_batch_get_value = 20  # max number of keys to fetch in a single batch
-    get_val_command = lambda ns, key: f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get {ns} {key}'  # template get value command
-    
-    # get all mobiexpert-event
-    event_key = ns_target[0]
+async def afetch_sdl_event_data_osc(incremental: bool = True) -> dict:
+    '''
+    Async variant of fetch_sdl_event_data_osc.
+    '''
+    return dict((await aget_network_snapshot(incremental)).events)
+
+def ingest_event_data(force_pull: bool = False) -> EventStore:
+    '''
+    Bring the event store up to date.
+    While the SDL watcher is running, it keeps the event store up to date and no SDL read is made here,
+    unless force_pull is set (e.g., after a reset).
+    Returns:
+        EventStore: the event store
+    '''
+    with sdl_ingest_lock:
+        if force_pull or not is_sdl_watcher_running():
+            pull_event_data()
+        return event_store
+
+def pull_event_data():
+    '''
+    Pull the MobieXpert and MobiWatch events above the high-water marks from SDL into the event store. Events
+    already in the store keep their ID and are not parsed again.
+    '''
+    with sdl_ingest_lock:
+        sdl = get_sdl_backend()
+        for namespace, parse_event in (("mobiexpert-event", parse_mobiexpert_event), ("mobiwatch-event", parse_mobiwatch_event)):
+            items = fetch_new_sdl_items(sdl, namespace)
+            last_event_id = max(event_store.events, default=0)
+            new_event_ids = []
+            for key, val in items.items():
+                val = clean_sdl_value(val)  # Remove non-ASCII characters
+                event_id = event_store.add(namespace, key, val, parse_event)
+                if event_id is not None and event_id > last_event_id:
+                    new_event_ids.append(event_id)
+            archive = get_mobiflow_archive()
+            if archive is not None and len(new_event_ids) > 0:
+                archive.append_events([event_store.events[event_id] for event_id in new_event_ids])
+
+def parse_mobiexpert_event(val: str) -> dict:
+    '''
+    Parse a MobieXpert event (separated by ; delimiter)
+    '''
     event_meta = "Event ID,Event Name,Affected base station ID,Time,Affected UE ID,Description,Level".split(",")
-    for i in range(1, key_len_by_namespace[event_key] + 1, max_batch_get_value):  # event index starts from 1
-        # Create a batch of keys
-        batch_keys = [str(j) for j in range(i, min(i + max_batch_get_value, key_len_by_namespace[event_key] + 1))]
-
-        # Create the command for the batch
-        command = get_val_command(event_key, " ".join(batch_keys))
-        value = execute_command(command)
-
-        # Process each value in the batch
-        values = [val.strip() for val in value.split("\n") if val.strip()]
-
-        for val in values:
-            val = ''.join([c for c in val if 32 <= ord(c) <= 126])[2:]  # Remove non-ASCII characters
-            event_item = val.split(";")
-                        
-            # create and insert attack event
-            event[event_id_counter] = {
-                "id": event_id_counter,
-                "source": "MobieXpert",
-                "name": event_item[event_meta.index("Event Name")],
-                "cellID": event_item[event_meta.index("Affected base station ID")],
-                "ueID": event_item[event_meta.index("Affected UE ID")],
-                "timestamp": event_item[event_meta.index("Time")],
-                "severity": event_item[event_meta.index("Level")],
-                "description": event_item[event_meta.index("Description")],
-                "active": True
-            }
-
-            if int(event_item[event_meta.index("Affected UE ID")]) not in current_active_ue_ids:
-                event[event_id_counter]["active"] = False # indicate the event is not related to active UEs
-
-            event_id_counter += 1
-
-    # get all mobiwatch-event
-    event_key = ns_target[1]
-    for i in range(1, key_len_by_namespace[event_key] + 1, max_batch_get_value):  # event index starts from 1
-        # Create a batch of keys
-        batch_keys = [str(j) for j in range(i, min(i + max_batch_get_value, key_len_by_namespace[event_key] + 1))]
-
-        # Create the command for the batch
-        command = get_val_command(event_key, " ".join(batch_keys))
-        value = execute_command(command)
-        
-        # Process each value in the batch
-        values = [val.strip() for val in value.split("\n") if val.strip()]
-
-        for val in values:
-            val = ''.join([c for c in val if 32 <= ord(c) <= 126])[2:]  # Remove non-ASCII characters
-            event_item = val.split(";")
-            model_name = event_item[0]
-            if model_name == "autoencoder_v2":
-                # f"{model_name};{event['event_name']};{event['nr_cell_id']};{event['ue_id']};{event['timestamp']};{index_str};{event_desc}"
-                event[event_id_counter] = {
-                    "id": event_id_counter,
-                    "source": f"MobiWatch_{model_name}",
-                    "name": event_item[1],
-                    "cellID": event_item[2],
-                    "ueID": event_item[3],
-                    "timestamp": event_item[4],
-                    "severity": "Warning", # TODO: this should be populated from the xApp data
-                    "mobiflow_index": event_item[5],
-                    "description": event_item[6],
-                    "active": True
-                }
-                if int(event_item[3]) not in current_active_ue_ids:
-                    event[event_id_counter]["active"] = False # indicate the event is not related to active UEs
-                event_id_counter += 1
-
-            elif model_name == "lstm_v2":
-                # f"{model_name};{event['event_name']};{event['nr_cell_id']};{event['ue_id']};{event['timestamp']};{str(merged_sequence_list)};{event_desc}"
-                event[event_id_counter] = {
-                    "id": event_id_counter,
-                    "source": f"MobiWatch_{model_name}",
-                    "name": event_item[1],
-                    "cellID": event_item[2],
-                    "ueID": event_item[3],
-                    "timestamp": event_item[4],
-                    "severity": "Warning", # TODO: this should be populated from the xApp data
-                    "mobiflow_index": event_item[5],
-                    "description": event_item[6],
-                    "active": True
-                }
-                if int(event_item[3]) not in current_active_ue_ids:
-                    event[event_id_counter]["active"] = False # indicate the event is not related to active UEs
-                event_id_counter += 1
-    # update event time series data
-    update_event_time_series(event)
-
-    return event
+    event_item = val.split(";")
+    return {
+        "source": "MobieXpert",
+        "name": event_item[event_meta.index("Event Name")],
+        "cellID": event_item[event_meta.index("Affected base station ID")],
+        "ueID": event_item[event_meta.index("Affected UE ID")],
+        "timestamp": event_item[event_meta.index("Time")],
+        "severity": event_item[event_meta.index("Level")],
+        "description": event_item[event_meta.index("Description")],
+    }
+
+def parse_mobiwatch_event(val: str) -> dict:
+    '''
+    Parse a MobiWatch event (separated by ; delimiter). Returns None for events of unsupported models.
+    '''
+    event_item = val.split(";")
+    model_name = event_item[0]
+    if model_name not in ["autoencoder_v2", "lstm_v2"]:
+        return None
+    # autoencoder_v2: f"{model_name};{event['event_name']};{event['nr_cell_id']};{event['ue_id']};{event['timestamp']};{index_str};{event_desc}"
+    # lstm_v2: f"{model_name};{event['event_name']};{event['nr_cell_id']};{event['ue_id']};{event['timestamp']};{str(merged_sequence_list)};{event_desc}"
+    return {
+        "source": f"MobiWatch_{model_name}",
+        "name": event_item[1],
+        "cellID": event_item[2],
+        "ueID": event_item[3],
+        "timestamp": event_item[4],
+        "severity": "Warning", # TODO: this should be populated from the xApp data
+        "mobiflow_index": event_item[5],
+        "description": event_item[6],
+    }
+
+def get_events_by(field: str, value: str, snapshot: NetworkSnapshot = None) -> dict:
+    '''
+    Get the events of a network snapshot whose field ("ueID" or "cellID") equals the value
+    '''
+    snapshot = snapshot or get_network_snapshot()
+    return {event_id: snapshot.events[event_id] for event_id in snapshot.event_index[field].get(str(value), [])}
+
+async def aget_events_by(field: str, value: str) -> dict:
+    '''
+    Async variant of get_events_by.
+    '''
+    return get_events_by(field, value, await aget_network_snapshot())
+
+async def afetch_sdl_event_data_by_ue_id(ue_id: str) -> dict:
+    return await aget_events_by("ueID", ue_id)
+
+async def afetch_sdl_event_data_by_cell_id(cell_id: str) -> dict:
+    return await aget_events_by("cellID", cell_id)
 
 @tool
 def fetch_sdl_event_data_all_tool() -> dict:
@@ -569,6 +680,8 @@ def fetch_sdl_event_data_all_tool() -> dict:
     '''
     return fetch_sdl_event_data_osc()
 
+fetch_sdl_event_data_all_tool.coroutine = afetch_sdl_event_data_osc
+
 @tool
 def fetch_sdl_event_data_by_ue_id_tool(ue_id: str) -> dict:
     ''' 
@@ -579,9 +692,9 @@ def fetch_sdl_event_data_by_ue_id_tool(ue_id: str) -> dict:
         dict: A dictionary containing the network event data filtered by UE ID. Each dict object contains the following keys: ['id', 'source', 'name', 'cellID', 'ueID', 'timestamp', 'severity', 'description']
         Example event: {'id': 1, 'source': 'MobieXpert', 'name': 'RRC Null Cipher', 'cellID': '12345678', 'ueID': '38940', 'timestamp': '1745783800', 'severity': 'Critical', 'description': 'The UE uses null cipher mode in its RRC session, its RRC traffic data is subject to sniffing attack.'}
     '''
-    all_events = fetch_sdl_event_data_osc()
-    filtered_events = {k: v for k, v in all_events.items() if v.get("ueID") == ue_id}
-    return filtered_events
+    return get_events_by("ueID", ue_id)
+
+fetch_sdl_event_data_by_ue_id_tool.coroutine = afetch_sdl_event_data_by_ue_id
 
 @tool
 def fetch_sdl_event_data_by_cell_id_tool(cell_id: str) -> dict:
@@ -593,9 +706,93 @@ def fetch_sdl_event_data_by_cell_id_tool(cell_id: str) -> dict:
         dict: A dictionary containing the network event data filtered by Cell ID. Each dict object contains the following keys: ['id', 'source', 'name', 'cellID', 'ueID', 'timestamp', 'severity', 'description']
         Example event: {'id': 1, 'source': 'MobieXpert', 'name': 'RRC Null Cipher', 'cellID': '12345678', 'ueID': '38940', 'timestamp': '1745783800', 'severity': 'Critical', 'description': 'The UE uses null cipher mode in its RRC session, its RRC traffic data is subject to sniffing attack.'}
     '''
-    all_events = fetch_sdl_event_data_osc()
-    filtered_events = {k: v for k, v in all_events.items() if v.get("cellID") == cell_id}
-    return filtered_events
+    return get_events_by("cellID", cell_id)
+
+fetch_sdl_event_data_by_cell_id_tool.coroutine = afetch_sdl_event_data_by_cell_id
+
+def resolve_time_range(start_ts: int = None, end_ts: int = None, last_seconds: int = None, latest_ts: int = None) -> tuple:
+    '''
+    Resolve the (start_ts, end_ts) of a time-range query. With last_seconds, the range is the last_seconds before
+    the latest timestamp of the data (latest_ts), so replayed data can be queried like live data.
+    '''
+    if last_seconds is not None:
+        if latest_ts is None:
+            return None, None
+        return int(latest_ts) - int(last_seconds), int(latest_ts)
+    return (None if start_ts is None else int(start_ts)), (None if end_ts is None else int(end_ts))
+
+def query_events(ue_id: str = None, cell_id: str = None, source: str = None, severity: str = None, active: bool = None,
+                 start_ts: int = None, end_ts: int = None, last_seconds: int = None, snapshot: NetworkSnapshot = None) -> dict:
+    '''
+    Get the events of a network snapshot matching all given predicates, in time order. The predicates are evaluated
+    against the event indexes (see query_event_ids), only the matching events are returned.
+    With last_seconds, the time range is the last_seconds before the latest event.
+    '''
+    snapshot = snapshot or get_network_snapshot()
+    time_index = snapshot.event_index["timestamp"]
+    start_ts, end_ts = resolve_time_range(start_ts, end_ts, last_seconds, time_index[-1][0] if time_index else None)
+    event_ids = query_event_ids(snapshot.events, snapshot.event_index, ue_id, cell_id, source, severity, active, start_ts, end_ts)
+    return {event_id: snapshot.events[event_id] for event_id in event_ids}
+
+async def aquery_events(ue_id: str = None, cell_id: str = None, source: str = None, severity: str = None, active: bool = None,
+                        start_ts: int = None, end_ts: int = None, last_seconds: int = None) -> dict:
+    '''
+    Async variant of query_events.
+    '''
+    return query_events(ue_id, cell_id, source, severity, active, start_ts, end_ts, last_seconds, await aget_network_snapshot())
+
+@tool
+def query_sdl_event_data_tool(ue_id: str = None, cell_id: str = None, source: str = None, severity: str = None, active: bool = None,
+                              start_ts: int = None, end_ts: int = None, last_seconds: int = None) -> dict:
+    '''
+    Query the network events generated by MobieXpert and MobiWatch with filters, all given filters must match. Prefer it over fetching all events.
+    Args:
+        ue_id (str): only the events of this UE ID
+        cell_id (str): only the events of this Cell ID
+        source (str): only the events of this source: "MobieXpert", "MobiWatch" (all models), or a MobiWatch model such as "autoencoder_v2" or "lstm_v2"
+        severity (str): only the events of this severity, e.g., "Critical" or "Warning"
+        active (bool): only the events related to UEs that are (True) or are not (False) currently active
+        start_ts (int): start of the time range (epoch seconds, inclusive)
+        end_ts (int): end of the time range (epoch seconds, inclusive)
+        last_seconds (int): if set, the time range is the last_seconds before the latest event, start_ts and end_ts are ignored
+    Returns:
+        dict: A dictionary containing the matching network event data in time order. Each dict object contains the following keys: ['id', 'source', 'name', 'cellID', 'ueID', 'timestamp', 'severity', 'description', 'active']
+    '''
+    return query_events(ue_id, cell_id, source, severity, active, start_ts, end_ts, last_seconds)
+
+query_sdl_event_data_tool.coroutine = aquery_events
+
+def get_events_by_time_range(start_ts: int = None, end_ts: int = None, last_seconds: int = None, ue_id: str = None,
+                             cell_id: str = None, snapshot: NetworkSnapshot = None) -> dict:
+    '''
+    Get the events of a network snapshot with start_ts <= timestamp <= end_ts (or in the last_seconds before the
+    latest event), optionally of a UE and / or a cell, in time order.
+    '''
+    return query_events(ue_id, cell_id, start_ts=start_ts, end_ts=end_ts, last_seconds=last_seconds, snapshot=snapshot)
+
+async def aget_events_by_time_range(start_ts: int = None, end_ts: int = None, last_seconds: int = None, ue_id: str = None, cell_id: str = None) -> dict:
+    '''
+    Async variant of get_events_by_time_range.
+    '''
+    return get_events_by_time_range(start_ts, end_ts, last_seconds, ue_id, cell_id, await aget_network_snapshot())
+
+@tool
+def fetch_sdl_event_data_by_time_range_tool(start_ts: int = None, end_ts: int = None, last_seconds: int = None, ue_id: str = None, cell_id: str = None) -> dict:
+    '''
+    Fetch the network events generated by MobieXpert and MobiWatch in a time range, optionally of a UE and / or a cell. Use it to look at the events around the time of an event
+    instead of fetching all events.
+    Args:
+        start_ts (int): start of the time range (epoch seconds, inclusive), no lower bound if omitted
+        end_ts (int): end of the time range (epoch seconds, inclusive), no upper bound if omitted
+        last_seconds (int): if set, the range is the last_seconds before the latest event, start_ts and end_ts are ignored
+        ue_id (str): only the events of this UE ID
+        cell_id (str): only the events of this Cell ID
+    Returns:
+        dict: A dictionary containing the network event data in time order. Each dict object contains the following keys: ['id', 'source', 'name', 'cellID', 'ueID', 'timestamp', 'severity', 'description']
+    '''
+    return get_events_by_time_range(start_ts, end_ts, last_seconds, ue_id, cell_id)
+
+fetch_sdl_event_data_by_time_range_tool.coroutine = aget_events_by_time_range
 
 def build_xapp_osc(xapp_name: str):
     """
@@ -617,7 +814,6 @@ def build_xapp_osc(xapp_name: str):
     if global_vars.simulation_mode is True:
         return {"message": "Build finished", "logs": []}, 200
 
-    original_cwd = os.getcwd()
     logs = []  # We'll accumulate logs here
 
     try:
@@ -640,31 +836,29 @@ def build_xapp_osc(xapp_name: str):
                 # If the folder is already there, just continue
                 logs.append(f"Directory {xapp_root} already exists.")
 
-        os.chdir(xapp_root)
-        logs.append(f"Changed directory to: {os.getcwd()}")
-
+        # the commands run in the xApp directories, the working directory of the process is not changed so
+        # concurrent requests are not affected
+        xapp_dir = os.path.join(xapp_root, xapp_name)
 
         # Step 2: clone the repo    
         # If the xapp_name folder doesn't exist, clone it.
-        if not os.path.exists(xapp_name):
+        if not os.path.exists(xapp_dir):
             
             git_url = f"https://github.com/5GSEC/{xapp_name}.git"
-            clone_output = execute_command(f"git clone {git_url}")
+            clone_output = execute_command(f"git clone {git_url}", cwd=xapp_root)
             logs.append(f"git clone output: {clone_output}")
 
             # Check if xApp folder is there
-            if not os.path.exists(xapp_name):
+            if not os.path.exists(xapp_dir):
                 logs.append(f"Failed to clone {git_url}")
                 return {"error": f"Failed to clone {git_url}", "logs": logs}, 500
 
-            os.chdir(xapp_name)
-            logs.append(f"Now in xApp folder (newly cloned): {os.getcwd()}")
+            logs.append(f"xApp folder (newly cloned): {xapp_dir}")
 
         else:
-            # If folder already exists, just cd in and do a checkout + pull
+            # If folder already exists, just do a checkout + pull
             logs.append(f"{xapp_name} folder already exists. Will attempt to update it.")
-            os.chdir(xapp_name)
-            logs.append(f"Now in existing xApp folder: {os.getcwd()}")
+            logs.append(f"Existing xApp folder: {xapp_dir}")
             # We won't remove; we'll checkout branch & pull
 
 
@@ -672,10 +866,10 @@ def build_xapp_osc(xapp_name: str):
         # You can customize this dict with more xApp->branch mappings
         branch_to_checkout = branch_map.get(xapp_name)
         if branch_to_checkout:
-            checkout_output = execute_command(f"git checkout {branch_to_checkout}")
+            checkout_output = execute_command(f"git checkout {branch_to_checkout}", cwd=xapp_dir)
             logs.append(f"Checked out branch '{branch_to_checkout}': {checkout_output}")
             # Then pull the latest changes
-            pull_output = execute_command("git pull")
+            pull_output = execute_command("git pull", cwd=xapp_dir)
             logs.append(f"Pulled latest code: {pull_output}")
         else:
             logs.append(f"No custom branch specified for {xapp_name}.")
@@ -691,16 +885,12 @@ def build_xapp_osc(xapp_name: str):
             logs.append("Docker registry is already running.")
 
         # Step 5: run build.sh
-        # os.chdir(xapp_name) # This is already done above
-
-        logs.append(f"Now in xApp folder: {os.getcwd()}")
-        
-        if not os.path.exists("build.sh"):
+        if not os.path.exists(os.path.join(xapp_dir, "build.sh")):
             logs.append(f"No build.sh found in {xapp_name}")
             return {"error": f"No build.sh found in {xapp_name} directory", "logs": logs}, 500
 
-        execute_command("chmod +x build.sh")
-        build_output = execute_command("./build.sh")
+        execute_command("chmod +x build.sh", cwd=xapp_dir)
+        build_output = execute_command("./build.sh", cwd=xapp_dir)
         logs.append(f"build.sh output:\n{build_output}")
 
         # Step 6: check if build is successful
@@ -710,9 +900,6 @@ def build_xapp_osc(xapp_name: str):
     except Exception as e:
         # Return any error and the logs collected so far
         return {"error": str(e), "logs": logs}, 500
-    finally:
-        # Always switch back to the original directory
-        os.chdir(original_cwd)
 
 @tool
 def build_xapp_tool(xapp_name: str):
@@ -734,6 +921,14 @@ def build_xapp_tool(xapp_name: str):
     """
     return build_xapp_osc(xapp_name)
 
+async def abuild_xapp_osc(xapp_name: str):
+    """
+    Async variant of build_xapp_osc, the build runs in a worker thread.
+    """
+    return await asyncio.to_thread(build_xapp_osc, xapp_name)
+
+build_xapp_tool.coroutine = abuild_xapp_osc
+
 def deploy_xapp_osc(xapp_name: str):
     '''
     Deploy the xApp from the given xapp_name.
@@ -742,7 +937,6 @@ def deploy_xapp_osc(xapp_name: str):
     if global_vars.simulation_mode is True:
         return {"message": f"{xapp_name} is deployed successfully", "logs": []}, 200
 
-    original_cwd = os.getcwd()  # Remember our original directory
     logs = []  # We'll collect log messages in this list
 
     try:
@@ -794,20 +988,15 @@ def deploy_xapp_osc(xapp_name: str):
                 "logs": logs
             }, 400
 
-        # Change directory to xApp
-        os.chdir(xapp_dir)
-
-        # 4) Onboard step
+        # 4) Onboard step, the commands run in the xApp directories instead of changing the working directory
         init_dir = os.path.join(xapp_dir, "init")
         if os.path.exists(init_dir):
             onboard_cmd = (
                 # "sudo -E env CHART_REPO_URL=http://0.0.0.0:8090 "
                 "CHART_REPO_URL=http://0.0.0.0:8090 dms_cli onboard --config_file_path=config-file.json --shcema_file_path=schema.json"
             )
-            os.chdir(init_dir)
-            onboard_output = execute_command(onboard_cmd)
+            onboard_output = execute_command(onboard_cmd, cwd=init_dir)
             logs.append(f"Onboard output: {onboard_output}")
-            os.chdir(xapp_dir)
         else:
             logs.append("No 'init' folder found. Skipping onboard step.")
 
@@ -819,9 +1008,10 @@ def deploy_xapp_osc(xapp_name: str):
                 "logs": logs
             }, 500
 
-        execute_command("chmod +x deploy.sh")
-        deploy_output = execute_command("./deploy.sh")
+        execute_command("chmod +x deploy.sh", cwd=xapp_dir)
+        deploy_output = execute_command("./deploy.sh", cwd=xapp_dir)
         logs.append(f"deploy.sh output: {deploy_output}")
+        invalidate_sdl_cache() # the deployed xApp may write new data into SDL
 
         # 6) Check if the xApp is deployed
         check_output = execute_command(f"kubectl get pods -A | grep {xapp_name}")
@@ -843,9 +1033,6 @@ def deploy_xapp_osc(xapp_name: str):
     except Exception as e:
         # If an error occurs, return the error along with any logs we've collected
         return {"error": str(e), "logs": logs}, 500
-    finally:
-        # Always return to the original directory
-        os.chdir(original_cwd)
 
 @tool
 def deploy_xapp_tool(xapp_name: str):
@@ -858,6 +1045,14 @@ def deploy_xapp_tool(xapp_name: str):
     '''
     return deploy_xapp_osc(xapp_name)
 
+async def adeploy_xapp_osc(xapp_name: str):
+    '''
+    Async variant of deploy_xapp_osc, the deployment runs in a worker thread.
+    '''
+    return await asyncio.to_thread(deploy_xapp_osc, xapp_name)
+
+deploy_xapp_tool.coroutine = adeploy_xapp_osc
+
 def unDeploy_xapp_osc(xapp_name: str):
     ''' 
     Undeploy the xApp from the given xapp_name.
@@ -871,7 +1066,6 @@ def unDeploy_xapp_osc(xapp_name: str):
     if global_vars.simulation_mode is True:
         return {"message": f"{xapp_name} is undeployed successfully", "logs": []}, 200
     
-    original_cwd = os.getcwd()
     try:
         if xapp_name in xapp_names:
             xapp_name = xapp_names[xapp_name]
@@ -894,14 +1088,14 @@ def unDeploy_xapp_osc(xapp_name: str):
             # return {"message": f"No running pods for {xapp_name}. Maybe it's already undeployed."}, 200
 
         # step 3: ./undeploy.sh
-        os.chdir(xapp_dir)
         undeploy_script = os.path.join(xapp_dir, "undeploy.sh")
         if not os.path.exists(undeploy_script):
             return {"error": f"No undeploy.sh found in {xapp_dir}"}, 500
 
-        execute_command("chmod +x undeploy.sh")
-        undeploy_output = execute_command("./undeploy.sh")
+        execute_command("chmod +x undeploy.sh", cwd=xapp_dir)
+        undeploy_output = execute_command("./undeploy.sh", cwd=xapp_dir)
         print(undeploy_output)
+        invalidate_sdl_cache()
 
         # step 4: check undeployment is successful or not
         check_output2 = execute_command(f"kubectl get pods -A | grep {xapp_name}")
@@ -916,8 +1110,6 @@ def unDeploy_xapp_osc(xapp_name: str):
 
     except Exception as e:
         return {"error": str(e)}, 500
-    finally:
-        os.chdir(original_cwd)
 
 @tool
 def unDeploy_xapp_tool(xapp_name: str):
@@ -935,6 +1127,14 @@ def unDeploy_xapp_tool(xapp_name: str):
     '''
     return unDeploy_xapp_osc(xapp_name)
 
+async def aunDeploy_xapp_osc(xapp_name: str):
+    '''
+    Async variant of unDeploy_xapp_osc, the undeployment runs in a worker thread.
+    '''
+    return await asyncio.to_thread(unDeploy_xapp_osc, xapp_name)
+
+unDeploy_xapp_tool.coroutine = aunDeploy_xapp_osc
+
 @tool
 def get_ue_mobiflow_data_all_tool() -> list:
     '''
@@ -943,23 +1143,24 @@ def get_ue_mobiflow_data_all_tool() -> list:
     Returns:
         list: a list of UE MobiFlow telemetry in raw format (separated by ; delimiter)
     '''
-    keys = []
-    # if simulation mode is enabled, grab the data keys from the sample data file
-    if global_vars.simulation_mode is True:
-        with open(get_sample_data_path("5G-Sample-Data - UE.csv"), "r") as file:
-            for line in file.readlines():
-                index = int(line.split(";")[1])
-                keys.append(index)
-    else:
-        # get all keys for ue_mobiflow namespace in the actual SDL
-        namespace = sdl_namespaces[0]
-        get_key_command = f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get keys {namespace}'
-        keys_output = execute_command(get_key_command)
+    return get_ue_mobiflow_data_all()
 
-        # Parse keys (split by newlines)
-        keys = [int(key.strip()) for key in keys_output.split("\n") if key.strip()]
-    
-    keys = sorted(keys)
+def get_ue_mobiflow_data_all() -> list:
+    '''
+    Get all UE MobiFlow telemetry, read through the SDL snapshot cache of the current request
+    Returns:
+        list: a list of UE MobiFlow telemetry in raw format (separated by ; delimiter)
+    '''
+    return list(cached_sdl_read(sdl_namespaces[0], fetch_ue_mobiflow_data_all))
+
+def fetch_ue_mobiflow_data_all() -> list:
+    '''
+    Fetch all UE MobiFlow telemetry from SDL
+    Returns:
+        list: a list of UE MobiFlow telemetry in raw format (separated by ; delimiter)
+    '''
+    # in simulation mode, the backend serves the keys of the sample data
+    keys = get_sdl_keys_sorted(get_sdl_backend(), sdl_namespaces[0])
     return get_ue_mobiflow_data_by_index(keys)
 
 @tool
@@ -996,14 +1197,147 @@ def get_ue_mobiflow_data_by_ue_id(ue_id: int) -> list:
     Args:
         ue_id (int): the UE ID (gnb_du_ue_f1ap_id) to get the MobiFlow telemetry for
     '''
-    mobiflow_data = get_ue_mobiflow_data_all_tool.invoke("")
-    mf_list = []
-    for data in mobiflow_data:
-        if int(data.split(";")[7]) == ue_id:
-            mf_list.append(data)
-    return mf_list
+    ingest_mobiflow_data()
+    return ue_mobiflow_store.get_by("gnb_du_ue_f1ap_id", ue_id)
     
 
+@tool
+def get_ue_mobiflow_data_by_time_range_tool(start_ts: int = None, end_ts: int = None, last_seconds: int = None, ue_id: int = None, cell_id: int = None) -> list:
+    '''
+    Get the UE MobiFlow telemetry in a time range, optionally of a UE and / or a cell. Use it to look at the MobiFlow messages around the time of an event instead of
+    fetching all MobiFlow telemetry.
+    Before analyzing the MobiFlow telemetry, ensure you have called get_ue_mobiflow_description_tool() to obtain the semantics associated with the data for better understanding.
+    Args:
+        start_ts (int): start of the time range (epoch seconds, inclusive), no lower bound if omitted
+        end_ts (int): end of the time range (epoch seconds, inclusive), no upper bound if omitted
+        last_seconds (int): if set, the range is the last_seconds before the latest MobiFlow record, start_ts and end_ts are ignored
+        ue_id (int): only the telemetry of this UE ID (gnb_du_ue_f1ap_id)
+        cell_id (int): only the telemetry of this Cell ID (nr_cell_id)
+    Returns:
+        list: a list of UE MobiFlow telemetry in raw format (separated by ; delimiter), in time order
+    '''
+    return get_ue_mobiflow_data_by_time_range(start_ts, end_ts, last_seconds, ue_id, cell_id)
+
+def get_ue_mobiflow_data_by_time_range(start_ts: int = None, end_ts: int = None, last_seconds: int = None, ue_id: int = None, cell_id: int = None) -> list:
+    '''
+    Get the UE MobiFlow telemetry with start_ts <= timestamp <= end_ts (or in the last_seconds before the latest
+    record), optionally of a UE and / or a cell, from the timestamp index of the MobiFlow store.
+    '''
+    ingest_mobiflow_data()
+    filters = {}
+    if ue_id is not None:
+        filters["gnb_du_ue_f1ap_id"] = ue_id
+    if cell_id is not None:
+        filters["nr_cell_id"] = cell_id
+    start_ts, end_ts = resolve_time_range(start_ts, end_ts, last_seconds, ue_mobiflow_store.latest_timestamp())
+    return ue_mobiflow_store.query(start_ts, end_ts, **filters)
+
+@tool
+def query_mobiflow_archive_tool(start_ts: int = None, end_ts: int = None, ue_id: int = None, cell_id: int = None, limit: int = 500) -> list:
+    '''
+    Query the archived UE MobiFlow telemetry, including records that are no longer in SDL or in memory (e.g., for the forensics of an event from hours ago).
+    Before analyzing the MobiFlow telemetry, ensure you have called get_ue_mobiflow_description_tool() to obtain the semantics associated with the data for better understanding.
+    Args:
+        start_ts (int): start of the time range (epoch seconds, inclusive), no lower bound if omitted
+        end_ts (int): end of the time range (epoch seconds, inclusive), no upper bound if omitted
+        ue_id (int): only the telemetry of this UE ID (gnb_du_ue_f1ap_id)
+        cell_id (int): only the telemetry of this Cell ID (nr_cell_id)
+        limit (int): max number of records returned (the earliest ones)
+    Returns:
+        list: a list of UE MobiFlow telemetry in raw format (separated by ; delimiter), in time order
+    '''
+    archive = get_mobiflow_archive()
+    if archive is None:
+        return [{"error": "The MobiFlow archive is not enabled (MOBIFLOW_ARCHIVE_DIR is not set)"}]
+    return archive.query("ue", start_ts, end_ts, cell_id, ue_id, limit)
+
+@tool
+def query_event_archive_tool(start_ts: int = None, end_ts: int = None, ue_id: str = None, cell_id: str = None, limit: int = 500) -> list:
+    '''
+    Query the archived network events generated by MobieXpert and MobiWatch, including events that are no longer in SDL.
+    Args:
+        start_ts (int): start of the time range (epoch seconds, inclusive), no lower bound if omitted
+        end_ts (int): end of the time range (epoch seconds, inclusive), no upper bound if omitted
+        ue_id (str): only the events of this UE ID
+        cell_id (str): only the events of this Cell ID
+        limit (int): max number of events returned (the earliest ones)
+    Returns:
+        list: a list of events in time order, with the keys ['id', 'source', 'name', 'cellID', 'ueID', 'timestamp', 'severity', 'description'] (the id is the one assigned when the event was archived)
+    '''
+    archive = get_mobiflow_archive()
+    if archive is None:
+        return [{"error": "The MobiFlow archive is not enabled (MOBIFLOW_ARCHIVE_DIR is not set)"}]
+    return archive.query("event", start_ts, end_ts, cell_id, ue_id, limit)
+
+def get_kpi_views() -> KPIViews:
+    '''
+    Return the KPI views, brought up to date with an incremental pull unless the SDL watcher keeps them live.
+    '''
+    with sdl_ingest_lock:
+        if not is_sdl_watcher_running():
+            pull_mobiflow_data()
+    return kpi_views
+
+def get_cell_kpis(cell_id: str = None) -> dict:
+    '''
+    Get the KPIs of a cell (None if unknown), or of all cells (cell ID -> KPIs): UE / message counts, RRCSetupRequests,
+    retries, registrations, attach success ratio, releases, algorithm distributions, posture flag counts and
+    RRC / NAS message counters.
+    '''
+    return get_kpi_views().get_cell_kpis(cell_id)
+
+def get_ue_security_posture(ue_id: str, cell_id: str = None) -> list:
+    '''
+    Get the security posture of a UE in each cell it is tracked in.
+    '''
+    return get_kpi_views().get_ue_posture(ue_id, cell_id)
+
+@tool
+def get_cell_kpis_tool(cell_id: str = None) -> str:
+    '''
+    Get the KPIs of a cell, or of all cells if no cell ID is given, maintained from the MobiFlow telemetry. Use it to answer questions such as how many UEs of a cell use null ciphering
+    or which cell has the most RRCSetupRequest retries, instead of reading the raw MobiFlow telemetry.
+    Each cell line holds: ues (tracked UEs), msgs, setup_requests (RRCSetupRequest count), retries (RRCSetupRequests sent again before the previous attach registered), registrations,
+    attach_success (registrations / setup_requests), releases, the number of UEs with each posture flag (null_cipher, null_integrity: RRC algorithm 0 after the security mode
+    procedure; nas_null_integrity; attach_retry), the distribution of the algorithms over the UEs (value:number of UEs) and the most frequent RRC messages.
+    Args:
+        cell_id (str): the Cell ID, all cells if omitted
+    Returns:
+        str: one line per cell
+    '''
+    kpis = get_cell_kpis()
+    if cell_id is not None:
+        kpis = {str(cell_id): kpis[str(cell_id)]} if str(cell_id) in kpis else {}
+    if len(kpis) == 0:
+        return f"Cell {cell_id} not found" if cell_id is not None else "No cell data"
+    return "\n".join(format_cell_kpis(c, k) for c, k in sorted(kpis.items()))
+
+@tool
+def get_ue_security_posture_tool(ue_id: str) -> list:
+    '''
+    Get the security posture of a UE, maintained from its MobiFlow telemetry: message count, first / last seen timestamps, current RRC / NAS cipher and integrity algorithms,
+    latest rrc_state / nas_state / rrc_sec_state, whether it completed the security mode procedure (secured), registered or was released, its RRCSetupRequests and retries, and its posture flags.
+    Args:
+        ue_id (str): the UE ID
+    Returns:
+        list: the posture of the UE in each cell it is seen in
+    '''
+    return get_ue_security_posture(ue_id)
+
+@tool
+def get_ues_by_security_posture_tool(flag: str, cell_id: str = None) -> dict:
+    '''
+    Get the IDs of the UEs with a security posture flag, by cell.
+    Args:
+        flag (str): the posture flag: "null_cipher" (null RRC ciphering), "null_integrity" (null RRC integrity protection), "nas_null_integrity" or "attach_retry"
+        cell_id (str): only the UEs of this Cell ID
+    Returns:
+        dict: cell ID -> list of UE IDs
+    '''
+    if flag not in posture_flags:
+        return {"error": f"Unknown posture flag: {flag}, available flags: {posture_flags}"}
+    return get_kpi_views().get_ues_with_flag(flag, cell_id)
+
 def get_ue_mobiflow_data_by_index(index_list: list) -> list:
     '''
     Get UE MobiFlow telemetry from SDL using a specified index list
@@ -1015,39 +1349,16 @@ def get_ue_mobiflow_data_by_index(index_list: list) -> list:
     if index_list is None or len(index_list) == 0:
         return []
 
-    # if simulation mode is enabled, read from the sample data file
-    if global_vars.simulation_mode is True:
-        mf_list = []
-        with open(get_sample_data_path("5G-Sample-Data - UE.csv"), "r") as file:
-            for line in file.readlines():
-                index = int(line.split(";")[1])
-                if index in index_list:
-                    mf_list.append(line)
-        return mf_list
-
-    max_batch_get_value = 20  # max number of keys to fetch in a single batch
-    get_val_command = lambda ns, key: f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get {ns} {key}'  # template get value command
-
-    # get all UE mobiflow
-    mf_data = {}
-    ue_mobiflow_key = sdl_namespaces[0]
-    for i in range(0, len(index_list), max_batch_get_value):
-        # Create a batch of keys
-        batch_keys = [str(index_list[j]) for j in range(i, min(i + max_batch_get_value, len(index_list)))]
-
-        # Create the command for the batch
-        command = get_val_command(ue_mobiflow_key, " ".join(batch_keys))
-        value = execute_command(command)
-
-        # Process each value in the batch
-        for line in [val.strip() for val in value.split("\n") if val.strip()]:
-            k = int(line.split(":")[0])
-            v = line.split(":")[1]
-            start_index = v.index("UE;")
-            mf_data[k] = v[start_index:] # remove prefix
-        mf_data = dict(sorted(mf_data.items())) # sort values based on Index
-
-    return list(mf_data.values())
+    # serve from the request snapshot if the namespace has already been pulled
+    snapshot = peek_sdl_snapshot(sdl_namespaces[0])
+    if snapshot is not None:
+        index_set = set(index_list)
+        return [line for line in snapshot if mobiflow_index(line) in index_set]
+
+    # get UE mobiflow
+    # parsed from the raw bytes, the records are sorted by index
+    values = get_sdl_backend().get_bytes(sdl_namespaces[0], index_list)
+    return list(extract_mobiflow_records(values, "UE").values())
 
 @tool
 def get_bs_mobiflow_data_all_tool() -> list:
@@ -1057,23 +1368,24 @@ def get_bs_mobiflow_data_all_tool() -> list:
     Returns:
         list: a list of BS MobiFlow telemetry in raw format (separated by ; delimiter)
     '''
-    keys = []
-    # if simulation mode is enabled, grab the data keys from the sample data file
-    if global_vars.simulation_mode is True:
-        with open(get_sample_data_path("5G-Sample-Data - BS.csv"), "r") as file:
-            for line in file.readlines():
-                index = int(line.split(";")[1])
-                keys.append(index)
-    else:
-        # get all keys for bs_mobiflow namespace in the actual SDL
-        namespace = sdl_namespaces[1]
-        get_key_command = f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get keys {namespace}'
-        keys_output = execute_command(get_key_command)
-
-        # Parse keys (split by newlines)
-        keys = [int(key.strip()) for key in keys_output.split("\n") if key.strip()]
-        
-    keys = sorted(keys)
+    return get_bs_mobiflow_data_all()
+
+def get_bs_mobiflow_data_all() -> list:
+    '''
+    Get all BS MobiFlow telemetry, read through the SDL snapshot cache of the current request
+    Returns:
+        list: a list of BS MobiFlow telemetry in raw format (separated by ; delimiter)
+    '''
+    return list(cached_sdl_read(sdl_namespaces[1], fetch_bs_mobiflow_data_all))
+
+def fetch_bs_mobiflow_data_all() -> list:
+    '''
+    Fetch all BS MobiFlow telemetry from SDL
+    Returns:
+        list: a list of BS MobiFlow telemetry in raw format (separated by ; delimiter)
+    '''
+    # in simulation mode, the backend serves the keys of the sample data
+    keys = get_sdl_keys_sorted(get_sdl_backend(), sdl_namespaces[1])
     return get_bs_mobiflow_data_by_index(keys)
 
 @tool
@@ -1103,40 +1415,17 @@ def get_bs_mobiflow_data_by_index(index_list: list) -> list:
     '''
     if index_list is None or len(index_list) == 0:
         return []
+
+    # serve from the request snapshot if the namespace has already been pulled
+    snapshot = peek_sdl_snapshot(sdl_namespaces[1])
+    if snapshot is not None:
+        index_set = set(index_list)
+        return [line for line in snapshot if mobiflow_index(line) in index_set]
     
-    # if simulation mode is enabled, read from the sample data file
-    if global_vars.simulation_mode is True:
-        mf_list = []
-        with open(get_sample_data_path("5G-Sample-Data - BS.csv"), "r") as file:
-            for line in file.readlines():
-                index = int(line.split(";")[1])
-                if index in index_list:
-                    mf_list.append(line)
-        return mf_list
-
-    max_batch_get_value = 20  # max number of keys to fetch in a single batch
-    get_val_command = lambda ns, key: f'kubectl exec -it statefulset-ricplt-dbaas-server-0 -n ricplt -- sdlcli get {ns} {key}'  # template get value command
-
-    # get all BS mobiflow
-    mf_data = {}
-    bs_mobiflow_key = sdl_namespaces[1]
-    for i in range(0, len(index_list), max_batch_get_value):
-        # Create a batch of keys
-        batch_keys = [str(index_list[j]) for j in range(i, min(i + max_batch_get_value, len(index_list)))]
-
-        # Create the command for the batch
-        command = get_val_command(bs_mobiflow_key, " ".join(batch_keys))
-        value = execute_command(command)
-
-        # Process each value in the batch
-        for line in [val.strip() for val in value.split("\n") if val.strip()]:
-            k = int(line.split(":")[0])
-            v = line.split(":")[1]
-            start_index = v.index("BS;")
-            mf_data[k] = v[start_index:] # remove prefix
-        mf_data = dict(sorted(mf_data.items())) # sort values based on Index
-
-    return list(mf_data.values())
+    # get BS mobiflow
+    # parsed from the raw bytes, the records are sorted by index
+    values = get_sdl_backend().get_bytes(sdl_namespaces[1], index_list)
+    return list(extract_mobiflow_records(values, "BS").values())
 
 @tool
 def get_ue_mobiflow_description_tool() -> str:
@@ -0,0 +1,362 @@
+'''
+Pluggable SDL backends used by the SDL tools in sdl_apis.py.
+
+Every backend exposes the same small interface (namespaces, keys, multi-key get / set) so
+the tool functions do not need to know whether the data comes from `kubectl exec sdlcli`
+or directly from the RIC dbaas Redis.
+'''
+import os
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from ..utils import execute_command
+from . import global_vars
+from .sdl_bytes import parse_sdlcli_output
+
+class SDLBackend:
+    '''
+    Base interface of an SDL backend. Keys and values are returned as strings.
+    '''
+    def get_namespaces(self) -> list:
+        raise NotImplementedError
+
+    def get_keys(self, namespace: str) -> list:
+        raise NotImplementedError
+
+    def get(self, namespace: str, keys: list) -> dict:
+        '''
+        Get the values of the given keys. Returns a dict {key: raw value}, missing keys are omitted.
+        '''
+        raise NotImplementedError
+
+    def get_bytes(self, namespace: str, keys: list) -> dict:
+        '''
+        Get the values of the given keys as bytes, for the bytes-level parsing of sdl_bytes. Returns a dict
+        {key: value bytes}, the non-printable bytes of the values may already be deleted.
+        '''
+        return {k: v.encode("utf-8") for k, v in self.get(namespace, keys).items()}
+
+    def set(self, namespace: str, items: dict):
+        raise NotImplementedError
+
+def concurrent_batch_get(get_batch, keys: list, batch_size: int, max_in_flight: int) -> dict:
+    '''
+    Split keys into batches and fetch them with at most max_in_flight batches running concurrently.
+    Args:
+        get_batch (function): function that fetches a list of keys and returns a dict {key: value}
+        keys (list): the keys to fetch
+        batch_size (int): max number of keys in a single batch
+        max_in_flight (int): max number of batches fetched at the same time
+    Returns:
+        dict: the merged {key: value} of all batches, in the order of keys
+    '''
+    batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+    if len(batches) <= 1 or max_in_flight <= 1:
+        results = [get_batch(batch_keys) for batch_keys in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(batches))) as executor:
+            results = list(executor.map(get_batch, batches))
+    # merge once at the end, keeping the order of the requested keys
+    merged = {}
+    for batch_keys, batch_values in zip(batches, results):
+        for k in batch_keys:
+            if k in batch_values:
+                merged[k] = batch_values[k]
+    return merged
+
+def encode_redis_command(args: list) -> bytes:
+    '''
+    Encode a Redis command (a list of bytes arguments) in the Redis protocol, e.g., for redis-cli --pipe.
+    '''
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+class KubectlSDLBackend(SDLBackend):
+    '''
+    SDL backend that shells out to `sdlcli` inside the dbaas pod through `kubectl exec`.
+    '''
+    def __init__(self, pod_name: str = None, pod_namespace: str = None, max_batch_get_value: int = None, max_in_flight: int = None,
+                 max_batch_set_value: int = 1000):
+        self.pod_name = pod_name or global_vars.sdl_dbaas_pod_name
+        self.pod_namespace = pod_namespace or global_vars.sdl_dbaas_pod_namespace
+        self.max_batch_get_value = max_batch_get_value or global_vars.sdl_batch_size  # max number of keys to fetch in a single batch
+        self.max_in_flight = max_in_flight or global_vars.sdl_max_in_flight  # max number of batches fetched concurrently
+        self.max_batch_set_value = max_batch_set_value  # max number of keys in a single MSET
+
+    def _sdlcli(self, args: str) -> str:
+        command = f'kubectl exec -it {self.pod_name} -n {self.pod_namespace} -- sdlcli {args}'
+        output = execute_command(command)
+        return output if isinstance(output, str) else ""
+
+    def get_namespaces(self) -> list:
+        output = self._sdlcli("get namespaces")
+        return [ns.strip() for ns in output.split("\n") if ns.strip()]
+
+    def get_keys(self, namespace: str) -> list:
+        output = self._sdlcli(f"get keys {namespace}")
+        return [key.strip() for key in output.split("\n") if key.strip()]
+
+    def _get_batch(self, namespace: str, batch_keys: list) -> dict:
+        values = {}
+        output = self._sdlcli(f"get {namespace} {' '.join(batch_keys)}")
+        # each line has the format key:value
+        for line in [val.strip() for val in output.split("\n") if val.strip()]:
+            if ":" not in line:
+                continue
+            k, v = line.split(":", 1)
+            values[k.strip()] = v
+        return values
+
+    def get(self, namespace: str, keys: list) -> dict:
+        keys = [str(k) for k in keys]
+        return concurrent_batch_get(lambda batch_keys: self._get_batch(namespace, batch_keys), keys,
+                                    self.max_batch_get_value, self.max_in_flight)
+
+    def _get_batch_bytes(self, namespace: str, batch_keys: list) -> dict:
+        command = f'kubectl exec -it {self.pod_name} -n {self.pod_namespace} -- sdlcli get {namespace} {" ".join(batch_keys)}'
+        try:
+            output = subprocess.run(command, shell=True, capture_output=True).stdout
+        except Exception as e:
+            print(f"Failed to get keys from namespace {namespace}: {e}")
+            return {}
+        # the output is parsed as bytes, without decoding it first
+        return parse_sdlcli_output(output)
+
+    def get_bytes(self, namespace: str, keys: list) -> dict:
+        keys = [str(k) for k in keys]
+        return concurrent_batch_get(lambda batch_keys: self._get_batch_bytes(namespace, batch_keys), keys,
+                                    self.max_batch_get_value, self.max_in_flight)
+
+    def set(self, namespace: str, items: dict):
+        '''
+        Write all items with a single kubectl exec, piping MSET commands into the redis-cli of the dbaas pod.
+        Raises RuntimeError if the write failed, so a bulk load stops instead of skipping the chunk.
+        '''
+        if len(items) == 0:
+            return
+        keys = list(items.keys())
+        payload = bytearray()
+        for i in range(0, len(keys), self.max_batch_set_value):
+            batch_keys = keys[i:i + self.max_batch_set_value]
+            args = [b"MSET"]
+            for k in batch_keys:
+                args.append(RedisSDLBackend._redis_key(namespace, k).encode("utf-8"))
+                args.append(str(items[k]).encode("utf-8"))
+            payload += encode_redis_command(args)
+        command = ["kubectl", "exec", "-i", self.pod_name, "-n", self.pod_namespace, "--", "redis-cli", "--pipe"]
+        result = subprocess.run(command, input=bytes(payload), capture_output=True)
+        output = result.stdout.decode("utf-8", errors="replace")
+        # redis-cli --pipe ends with "errors: <n>, replies: <n>"
+        if result.returncode != 0 or "errors: 0," not in output:
+            raise RuntimeError(f"Failed to set {len(items)} keys in namespace {namespace}: {output.strip()} {result.stderr.decode('utf-8', errors='replace').strip()}")
+
+class RedisSDLBackend(SDLBackend):
+    '''
+    SDL backend that talks to the RIC dbaas Redis directly over a pooled connection.
+    SDL stores each entry under the Redis key "{namespace},key".
+    '''
+    def __init__(self, host: str = None, port: int = None, db: int = 0, password: str = None,
+                 max_connections: int = 16, scan_count: int = 1000, max_batch_get_value: int = 1000, max_batch_set_value: int = 1000, client=None):
+        '''
+        Args:
+            client: an existing redis-py compatible client (e.g., a local Redis stand-in for testing).
+                If None, a client backed by a connection pool is created from host / port.
+        '''
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("The redis package is required for the Redis SDL backend (pip install redis)") from e
+            pool = redis.ConnectionPool(
+                host=host or global_vars.sdl_redis_host,
+                port=int(port or global_vars.sdl_redis_port),
+                db=db,
+                password=password,
+                max_connections=max_connections,
+            )
+            client = redis.Redis(connection_pool=pool)
+        self.client = client
+        self.scan_count = scan_count
+        self.max_batch_get_value = max_batch_get_value  # max number of keys in a single MGET
+        self.max_batch_set_value = max_batch_set_value  # max number of keys in a single MSET
+
+    @staticmethod
+    def _decode(value) -> str:
+        if isinstance(value, bytes):
+            return value.decode("utf-8", errors="replace")
+        return value
+
+    @staticmethod
+    def _redis_key(namespace: str, key) -> str:
+        return f"{{{namespace}}},{key}"
+
+    def get_namespaces(self) -> list:
+        namespaces = set()
+        for redis_key in self.client.scan_iter(match="{*},*", count=self.scan_count):
+            redis_key = self._decode(redis_key)
+            namespaces.add(redis_key[1:redis_key.index("},")])
+        return sorted(namespaces)
+
+    def get_keys(self, namespace: str) -> list:
+        prefix = self._redis_key(namespace, "")
+        return [self._decode(k)[len(prefix):] for k in self.client.scan_iter(match=prefix + "*", count=self.scan_count)]
+
+    def get(self, namespace: str, keys: list) -> dict:
+        return self._mget(namespace, keys, self._decode)
+
+    def get_bytes(self, namespace: str, keys: list) -> dict:
+        return self._mget(namespace, keys, lambda v: v if isinstance(v, bytes) else v.encode("utf-8"))
+
+    def _mget(self, namespace: str, keys: list, convert) -> dict:
+        keys = [str(k) for k in keys]
+        if len(keys) == 0:
+            return {}
+        pipe = self.client.pipeline(transaction=False)
+        for i in range(0, len(keys), self.max_batch_get_value):
+            pipe.mget([self._redis_key(namespace, k) for k in keys[i:i + self.max_batch_get_value]])
+        values = {}
+        batch_start = 0
+        for batch_values in pipe.execute():
+            for k, v in zip(keys[batch_start:batch_start + self.max_batch_get_value], batch_values):
+                if v is not None:
+                    values[k] = convert(v)
+            batch_start += self.max_batch_get_value
+        return values
+
+    def set(self, namespace: str, items: dict):
+        if len(items) == 0:
+            return
+        keys = list(items.keys())
+        pipe = self.client.pipeline(transaction=False)
+        for i in range(0, len(keys), self.max_batch_set_value):
+            pipe.mset({self._redis_key(namespace, k): items[k] for k in keys[i:i + self.max_batch_set_value]})
+        pipe.execute()
+
+class SimulationSDLBackend(SDLBackend):
+    '''
+    In-memory SDL backend serving the sample data files in simulation mode. Each file is read once, on first use,
+    and indexed by key: MobiFlow records by their MobiFlow index, events by their line number.
+    '''
+    sample_files = {
+        "ue_mobiflow": "5G-Sample-Data - UE.csv",
+        "bs_mobiflow": "5G-Sample-Data - BS.csv",
+        "mobiexpert-event": "5G-Sample-Data - Event - MobieXpert.csv",
+        "mobiwatch-event": "5G-Sample-Data - Event - MobiWatch.csv",
+    }
+    mobiflow_namespaces = ["ue_mobiflow", "bs_mobiflow"]
+
+    def __init__(self, data_dir: str = None):
+        '''
+        Args:
+            data_dir (str): directory of the sample data files, e.g., a larger generated sample set.
+                Defaults to global_vars.simulation_data_dir or the bundled 5G-Sample-Data directory.
+        '''
+        self.data_dir = data_dir or global_vars.simulation_data_dir or os.path.join(os.path.dirname(__file__), "5G-Sample-Data")
+        self._data = None  # namespace -> key -> value
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = {ns: self._read_sample_file(ns, filename) for ns, filename in self.sample_files.items()}
+        return self._data
+
+    def _read_sample_file(self, namespace: str, filename: str) -> dict:
+        values = {}
+        path = os.path.join(self.data_dir, filename)
+        if not os.path.exists(path):
+            print(f"Sample data file not found: {path}")
+            return values
+        with open(path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if len(line) == 0:
+                    continue
+                if namespace in self.mobiflow_namespaces:
+                    values[line.split(";", 2)[1]] = line
+                else:
+                    values[str(line_number)] = line
+        return values
+
+    def reload(self):
+        '''
+        Drop the loaded data, the sample data files are read again on next use.
+        '''
+        with self._lock:
+            self._data = None
+
+    def get_namespaces(self) -> list:
+        return sorted(self._load().keys())
+
+    def get_keys(self, namespace: str) -> list:
+        return list(self._load().get(namespace, {}).keys())
+
+    def get(self, namespace: str, keys: list) -> dict:
+        data = self._load().get(namespace, {})
+        values = {}
+        for k in keys:
+            k = str(k)
+            if k in data:
+                values[k] = data[k]
+        return values
+
+    def set(self, namespace: str, items: dict):
+        data = self._load()
+        with self._lock:
+            data.setdefault(namespace, {}).update({str(k): v for k, v in items.items()})
+
+_sdl_backend = None
+_simulation_sdl_backend = None
+_sdl_backend_lock = threading.Lock()
+
+def create_sdl_backend(name: str = None) -> SDLBackend:
+    '''
+    Create an SDL backend by name ("kubectl", "redis" or "simulation"). Defaults to global_vars.sdl_backend.
+    '''
+    name = (name or global_vars.sdl_backend).lower()
+    if name == "simulation":
+        return SimulationSDLBackend()
+    elif name == "kubectl":
+        return KubectlSDLBackend()
+    elif name == "redis":
+        return RedisSDLBackend()
+    raise ValueError(f"Unknown SDL backend: {name}")
+
+def get_sdl_backend() -> SDLBackend:
+    '''
+    Return the process-wide SDL backend, creating it on first use. In simulation mode, the simulation backend
+    serving the sample data is returned instead, unless a backend has been set with set_sdl_backend.
+    '''
+    global _sdl_backend
+    if _sdl_backend is not None:
+        return _sdl_backend
+    if global_vars.simulation_mode is True:
+        return get_simulation_sdl_backend()
+    if _sdl_backend is None:
+        with _sdl_backend_lock:
+            if _sdl_backend is None:
+                _sdl_backend = create_sdl_backend()
+    return _sdl_backend
+
+def get_simulation_sdl_backend() -> SDLBackend:
+    '''
+    Return the process-wide simulation SDL backend, loading the sample data on first use.
+    '''
+    global _simulation_sdl_backend
+    if _simulation_sdl_backend is None:
+        with _sdl_backend_lock:
+            if _simulation_sdl_backend is None:
+                _simulation_sdl_backend = SimulationSDLBackend()
+    return _simulation_sdl_backend
+
+def set_sdl_backend(backend: SDLBackend):
+    '''
+    Replace the process-wide SDL backend, e.g., with a RedisSDLBackend wrapping a local Redis stand-in. The backend
+    is used in simulation mode too, set None to go back to the default backend.
+    '''
+    global _sdl_backend
+    with _sdl_backend_lock:
+        _sdl_backend = backend
@@ -0,0 +1,111 @@
+'''
+Bytes-level parsing of raw SDL values and sdlcli output.
+
+The xApps write SDL values with a non-ASCII "€€" prefix. Instead of decoding each value and filtering it character
+by character, the values are kept as bytes from the SDL backend: the prefix and control bytes are deleted with a
+single table-driven bytes.translate, MobiFlow records are located with bytes.find and decoded straight from a
+memoryview slice, and fields such as the MobiFlow index are read without splitting the whole record.
+
+Run `python -m MobiLLM.tools.sdl_bytes` to benchmark the per-record cost against the str-based parsing.
+'''
+import time
+
+# bytes deleted from raw SDL values: everything but printable ASCII (the "€€" prefix, control characters, "\r")
+non_printable_bytes = bytes(b for b in range(256) if not 32 <= b <= 126)
+non_printable_bytes_except_newline = non_printable_bytes.replace(b"\n", b"")
+
+def clean_sdl_bytes(value: bytes) -> bytes:
+    '''
+    Delete the non-printable bytes (e.g., the "€€" prefix) of a raw SDL value.
+    '''
+    return value.translate(None, non_printable_bytes)
+
+def clean_sdl_str(value: str) -> str:
+    '''
+    Delete the non-printable characters of a raw SDL value given as str, same as keeping the characters 32 <= ord(c) <= 126.
+    '''
+    return value.encode("utf-8").translate(None, non_printable_bytes).decode("ascii")
+
+def parse_sdlcli_output(output: bytes) -> dict:
+    '''
+    Parse the "key:value" lines of a `sdlcli get` output. The non-printable bytes of the whole output are deleted
+    in one pass before the lines are split.
+    Returns:
+        dict: {key: cleaned value bytes}
+    '''
+    values = {}
+    for line in output.translate(None, non_printable_bytes_except_newline).split(b"\n"):
+        key, sep, value = line.partition(b":")
+        if sep:
+            values[key.strip().decode("ascii")] = value.rstrip()
+    return values
+
+def extract_mobiflow_records(values: dict, data_type: str) -> dict:
+    '''
+    Extract the MobiFlow records of raw SDL values. Values without a record of the data type are skipped.
+    Args:
+        values (dict): {key: raw value bytes (or str)}
+        data_type (str): "UE" or "BS"
+    Returns:
+        dict: {int key: record str}, sorted by key
+    '''
+    marker = data_type.encode("ascii") + b";"
+    records = {}
+    for key, value in values.items():
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        value = value.translate(None, non_printable_bytes)
+        start = value.find(marker)
+        if start < 0:
+            continue
+        # decode the record straight from the buffer, without copying the slice first
+        records[int(key)] = str(memoryview(value)[start:], "ascii")
+    return dict(sorted(records.items()))
+
+def mobiflow_index(record: str) -> int:
+    '''
+    Return the MobiFlow index (second field) of a record without splitting the other fields.
+    '''
+    start = record.index(";") + 1
+    return int(record[start:record.index(";", start)])
+
+def benchmark_sdl_bytes(n: int = 200000, batch_size: int = 1000):
+    '''
+    Compare the bytes-level parsing with the str-based parsing (decode, split lines and key:value, per-character
+    cleaning, str.index and a full split for the index) on n synthetic sdlcli output lines.
+    '''
+    prefix = "€€".encode("utf-8")
+    outputs = []
+    for batch_start in range(0, n, batch_size):
+        outputs.append(b"".join(
+            b"%d:%sUE;%d;v2.1;SECSM;%d;20000;1;%d;%d;0;2089900004778;2;2;0;2;RRCSetupRequest; ;0;0;0;3;0;0\r\n"
+            % (i, prefix, i, 1749482829 + i // 100, i % 5000, i % 5000) for i in range(batch_start, min(batch_start + batch_size, n))))
+
+    start = time.perf_counter()
+    legacy_records = []
+    for output in outputs:
+        values = {}
+        for line in [val.strip() for val in output.decode("utf-8", errors="replace").split("\n") if val.strip()]:
+            k, v = line.split(":", 1)
+            values[k.strip()] = v
+        for k, v in values.items():
+            v = ''.join([c for c in v if 32 <= ord(c) <= 126])
+            record = v[v.index("UE;"):]
+            int(record.split(";")[1])
+            legacy_records.append(record)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    records = []
+    for output in outputs:
+        for record in extract_mobiflow_records(parse_sdlcli_output(output), "UE").values():
+            mobiflow_index(record)
+            records.append(record)
+    bytes_level = time.perf_counter() - start
+
+    assert records == legacy_records
+    print(f"str parsing:   {legacy:.2f}s ({legacy / n * 1e6:.2f} us/record)")
+    print(f"bytes parsing: {bytes_level:.2f}s ({bytes_level / n * 1e6:.2f} us/record), speedup {legacy / bytes_level:.1f}x")
+
+if __name__ == "__main__":
+    benchmark_sdl_bytes()
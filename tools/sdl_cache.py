@@ -0,0 +1,109 @@
+'''
+Request-scoped snapshot cache for SDL reads.
+
+A MobiLLMService.invoke opens a scope with sdl_request_scope(). While the scope is open, every SDL tool reads the
+namespaces through the same SDLSnapshotCache, so a ReAct loop that calls several SDL tools pulls each namespace once.
+Outside of a scope the reads go straight to the SDL backend.
+'''
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from . import global_vars
+
+class SDLSnapshotCache:
+    '''
+    Snapshot cache of SDL data keyed by namespace. Each snapshot expires after ttl seconds.
+    '''
+    def __init__(self, ttl: float = None):
+        self.ttl = global_vars.sdl_cache_ttl if ttl is None else ttl
+        self._snapshots = {}  # namespace -> (fetch time, data)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _namespace_lock(self, namespace: str) -> threading.Lock:
+        with self._lock:
+            if namespace not in self._locks:
+                self._locks[namespace] = threading.Lock()
+            return self._locks[namespace]
+
+    def peek(self, namespace: str):
+        '''
+        Return the cached snapshot of the namespace, or None if it is missing or expired.
+        '''
+        entry = self._snapshots.get(namespace)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def get_or_fetch(self, namespace: str, fetch):
+        '''
+        Return the cached snapshot of the namespace, calling fetch() to populate it on a miss.
+        Concurrent callers of the same namespace wait for a single fetch.
+        '''
+        data = self.peek(namespace)
+        if data is not None:
+            return data
+        with self._namespace_lock(namespace):
+            data = self.peek(namespace)
+            if data is None:
+                data = fetch()
+                self._snapshots[namespace] = (time.monotonic(), data)
+        return data
+
+    def invalidate(self, namespace: str = None):
+        '''
+        Drop the snapshot of the namespace, or all snapshots if namespace is None.
+        '''
+        if namespace is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(namespace, None)
+
+_current_cache = ContextVar("mobillm_sdl_snapshot_cache", default=None)
+
+def get_request_cache():
+    '''
+    Return the snapshot cache of the current request scope, or None outside of a scope.
+    '''
+    return _current_cache.get()
+
+@contextmanager
+def sdl_request_scope(ttl: float = None):
+    '''
+    Open a request scope in which all SDL tools share one snapshot cache. Nested scopes reuse the outer cache.
+    '''
+    if _current_cache.get() is not None:
+        yield _current_cache.get()
+        return
+    token = _current_cache.set(SDLSnapshotCache(ttl))
+    try:
+        yield _current_cache.get()
+    finally:
+        _current_cache.reset(token)
+
+def cached_sdl_read(namespace: str, fetch):
+    '''
+    Read a namespace through the snapshot cache of the current request, or call fetch() directly outside of a scope.
+    '''
+    cache = _current_cache.get()
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(namespace, fetch)
+
+def peek_sdl_snapshot(namespace: str):
+    '''
+    Return the snapshot of the namespace if the current request has already pulled it, otherwise None.
+    '''
+    cache = _current_cache.get()
+    if cache is None:
+        return None
+    return cache.peek(namespace)
+
+def invalidate_sdl_cache(namespace: str = None):
+    '''
+    Invalidate the snapshot of the namespace (or all namespaces) in the current request, e.g., after an SDL write.
+    '''
+    cache = _current_cache.get()
+    if cache is not None:
+        cache.invalidate(namespace)
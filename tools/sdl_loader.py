@@ -0,0 +1,142 @@
+'''
+Bulk loader that streams CSV files into SDL, e.g., to stage a lab SDL with a replay dataset.
+
+Each non-empty line of a file is written under its line number, in chunks of multi-key sets (a pipelined Redis
+MSET, or a single `redis-cli --pipe` through kubectl exec for the kubectl backend). Chunks are written in file
+order, so a load can resume after the highest key already in the namespace. Progress and throughput are printed
+while loading.
+
+Usage:
+    python -m MobiLLM.tools.sdl_loader [--backend redis] [--chunk-size 5000] [--no-resume] [file:namespace ...]
+'''
+import os
+import sys
+import time
+import argparse
+from collections import namedtuple
+from .sdl_backend import SDLBackend, SimulationSDLBackend, create_sdl_backend
+
+# prefix of the values written by the xApps through SDL, removed again by clean_sdl_value
+sdl_value_prefix = "€€"
+
+SDLLoadStats = namedtuple("SDLLoadStats", ["namespace", "records", "bytes", "start_key", "elapsed", "last_key"])
+
+def get_last_sdl_key(sdl: SDLBackend, namespace: str) -> int:
+    '''
+    Return the highest integer key of an SDL namespace, or 0 if it is empty.
+    '''
+    return max((int(key) for key in sdl.get_keys(namespace) if key.strip().isdigit()), default=0)
+
+def iter_sdl_records(file_path: str, start_key: int = 0, prefix: str = sdl_value_prefix):
+    '''
+    Yield the (key, value) records of a CSV file: the line number and the line with the SDL value prefix.
+    Empty lines and the lines up to start_key are skipped.
+    '''
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if line_number <= start_key:
+                continue
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            yield line_number, prefix + line
+
+def format_load_stats(stats: SDLLoadStats) -> str:
+    rate = stats.records / stats.elapsed if stats.elapsed > 0 else 0
+    throughput = stats.bytes / stats.elapsed / 1e6 if stats.elapsed > 0 else 0
+    return (f"{stats.namespace}: {stats.records} records, {stats.bytes / 1e6:.1f} MB in {stats.elapsed:.1f}s "
+            f"({rate:.0f} records/s, {throughput:.1f} MB/s), last key {stats.last_key}")
+
+class SDLBulkLoader:
+    '''
+    Streams CSV files into an SDL backend in chunks of multi-key sets.
+    '''
+    def __init__(self, sdl: SDLBackend, chunk_size: int = 5000, progress_interval: float = 2.0, verbose: bool = True):
+        '''
+        Args:
+            sdl (SDLBackend): the backend to write into
+            chunk_size (int): number of records written by a single multi-key set
+            progress_interval (float): seconds between two progress reports
+            verbose (bool): print progress reports
+        '''
+        self.sdl = sdl
+        self.chunk_size = chunk_size
+        self.progress_interval = progress_interval
+        self.verbose = verbose
+
+    def load_records(self, namespace: str, records, start_key: int = 0) -> SDLLoadStats:
+        '''
+        Write (key, value) records, in ascending key order, into a namespace. A failed chunk write raises, the
+        chunks written before it stay in SDL and a resumed load starts after them.
+        '''
+        start = last_report = time.time()
+        count, size, last_key = 0, 0, start_key
+        chunk = {}
+        for key, value in records:
+            chunk[str(key)] = value
+            size += len(value.encode("utf-8"))
+            if len(chunk) >= self.chunk_size:
+                self.sdl.set(namespace, chunk)
+                count += len(chunk)
+                last_key = key
+                chunk = {}
+                if self.verbose and time.time() - last_report >= self.progress_interval:
+                    last_report = time.time()
+                    print(format_load_stats(SDLLoadStats(namespace, count, size, start_key, last_report - start, last_key)))
+        if len(chunk) > 0:
+            self.sdl.set(namespace, chunk)
+            count += len(chunk)
+            last_key = int(list(chunk.keys())[-1])
+        stats = SDLLoadStats(namespace, count, size, start_key, time.time() - start, last_key)
+        if self.verbose:
+            print(format_load_stats(stats))
+        return stats
+
+    def load_file(self, file_path: str, namespace: str, resume: bool = True) -> SDLLoadStats:
+        '''
+        Load a CSV file into a namespace, one record per line keyed by line number.
+        Args:
+            file_path (str): the CSV file
+            namespace (str): the SDL namespace
+            resume (bool): skip the lines up to the highest key already in the namespace
+        '''
+        if not os.path.exists(file_path):
+            print(f"File not found: {file_path}")
+            return SDLLoadStats(namespace, 0, 0, 0, 0.0, 0)
+        start_key = get_last_sdl_key(self.sdl, namespace) if resume else 0
+        if self.verbose and start_key > 0:
+            print(f"{namespace}: resuming after key {start_key}")
+        return self.load_records(namespace, iter_sdl_records(file_path, start_key), start_key)
+
+def get_sample_data_files(data_dir: str = None) -> list:
+    '''
+    Return the (file path, namespace) pairs of the sample data files.
+    '''
+    data_dir = data_dir or os.path.join(os.path.dirname(__file__), "5G-Sample-Data")
+    return [(os.path.join(data_dir, filename), ns) for ns, filename in SimulationSDLBackend.sample_files.items()]
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Bulk load CSV files into SDL")
+    parser.add_argument("files", nargs="*", help="file:namespace pairs (default: the sample data files)")
+    parser.add_argument("--backend", default=None, help='SDL backend, "kubectl" or "redis" (default: SDL_BACKEND)')
+    parser.add_argument("--data-dir", default=None, help="directory of the sample data files")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="records per multi-key set")
+    parser.add_argument("--no-resume", action="store_true", help="load all lines instead of resuming after the highest key")
+    args = parser.parse_args(argv)
+
+    if args.files:
+        files = [tuple(f.rsplit(":", 1)) for f in args.files]
+    else:
+        files = get_sample_data_files(args.data_dir)
+    loader = SDLBulkLoader(create_sdl_backend(args.backend), args.chunk_size)
+    for file_path, namespace in files:
+        print(f"Loading {file_path} into {namespace}...")
+        try:
+            loader.load_file(file_path, namespace, resume=not args.no_resume)
+        except Exception as e:
+            print(f"Load of {file_path} stopped: {e}")
+            print("Run the loader again to resume after the last written chunk")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
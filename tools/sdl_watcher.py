@@ -0,0 +1,184 @@
+'''
+Background SDL watcher that keeps the in-memory network and event data live.
+
+A change feed reports which SDL namespaces have changed, and the watcher thread applies the changes (an incremental
+pull of those namespaces) as they land. The agent tools then read the already-materialized data without SDL reads
+on the request path. Three change feeds are available:
+    - RedisKeyspaceChangeFeed: Redis keyspace notifications of the RIC dbaas (or a local Redis stand-in)
+    - PollChangeFeed: reports every namespace at a fixed interval, for backends without notifications
+    - ReplayChangeFeed: replays recorded SDL writes into a backend, for testing and load generation
+'''
+import time
+import threading
+from .sdl_backend import SDLBackend, RedisSDLBackend
+
+class PollChangeFeed:
+    '''
+    Change feed that reports all namespaces as changed once every interval seconds.
+    '''
+    def __init__(self, namespaces: list, interval: float = 1.0):
+        self.namespaces = list(namespaces)
+        self.interval = interval
+
+    def wait(self, timeout: float) -> set:
+        time.sleep(min(self.interval, timeout))
+        return set(self.namespaces)
+
+    def close(self):
+        pass
+
+def keyspace_notifications_enabled(flags: str) -> bool:
+    '''
+    Whether a notify-keyspace-events setting publishes keyspace events of the string write commands (set / mset).
+    '''
+    return "K" in flags and ("$" in flags or "A" in flags)
+
+class RedisKeyspaceChangeFeed:
+    '''
+    Change feed backed by Redis keyspace notifications on the "{namespace},key" keys of the SDL namespaces.
+    '''
+    def __init__(self, client, namespaces: list, db: int = 0, configure: bool = False):
+        '''
+        Args:
+            client: a redis-py compatible client
+            namespaces (list): the SDL namespaces to watch
+            db (int): the Redis database of the SDL
+            configure (bool): enable keyspace notifications of write commands on the Redis server. This changes the
+                server-wide configuration of the shared dbaas, so it is off by default and the notifications must
+                already be enabled; a RuntimeError is raised otherwise.
+        '''
+        if configure:
+            # K: keyspace events, $: string commands (set / mset), g: generic commands (del / expire)
+            client.config_set("notify-keyspace-events", "K$g")
+        else:
+            flags = next(iter(client.config_get("notify-keyspace-events").values()), "")
+            if isinstance(flags, bytes):
+                flags = flags.decode("utf-8", errors="replace")
+            if not keyspace_notifications_enabled(flags):
+                raise RuntimeError(f"keyspace notifications are not enabled on the Redis server (notify-keyspace-events='{flags}')")
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._channels = {f"__keyspace@{db}__:{{{ns}}},*": ns for ns in namespaces}
+        self.pubsub.psubscribe(*self._channels.keys())
+
+    def _namespace_of(self, message) -> str:
+        pattern = message.get("pattern")
+        if isinstance(pattern, bytes):
+            pattern = pattern.decode("utf-8", errors="replace")
+        return self._channels.get(pattern)
+
+    def wait(self, timeout: float) -> set:
+        changed = set()
+        message = self.pubsub.get_message(timeout=timeout)
+        while message is not None:
+            namespace = self._namespace_of(message)
+            if namespace is not None:
+                changed.add(namespace)
+            # drain the pending notifications so a burst of writes is applied at once
+            message = self.pubsub.get_message(timeout=0)
+        return changed
+
+    def close(self):
+        self.pubsub.close()
+
+class ReplayChangeFeed:
+    '''
+    Change feed that replays recorded SDL writes into a backend, one batch per wait.
+    '''
+    def __init__(self, backend: SDLBackend, records: list, batch_size: int = 1, interval: float = 0.0):
+        '''
+        Args:
+            backend (SDLBackend): the backend to write into, e.g., a SimulationSDLBackend
+            records (list): the (namespace, key, value) writes to replay, in order
+            batch_size (int): number of writes replayed per wait
+            interval (float): seconds to wait before each batch
+        '''
+        self.backend = backend
+        self.records = list(records)
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pos = 0
+
+    def done(self) -> bool:
+        return self._pos >= len(self.records)
+
+    def wait(self, timeout: float) -> set:
+        if self.done():
+            time.sleep(timeout)
+            return set()
+        if self.interval > 0:
+            time.sleep(min(self.interval, timeout))
+        items_by_namespace = {}
+        for namespace, key, value in self.records[self._pos:self._pos + self.batch_size]:
+            items_by_namespace.setdefault(namespace, {})[key] = value
+        self._pos += self.batch_size
+        for namespace, items in items_by_namespace.items():
+            self.backend.set(namespace, items)
+        return set(items_by_namespace.keys())
+
+    def close(self):
+        pass
+
+def create_sdl_change_feed(backend: SDLBackend, namespaces: list, poll_interval: float = 1.0, configure_notifications: bool = False):
+    '''
+    Create the change feed of a backend: keyspace notifications for the Redis backend if they are enabled on the
+    server (or configure_notifications is set), polling otherwise.
+    '''
+    if isinstance(backend, RedisSDLBackend):
+        try:
+            return RedisKeyspaceChangeFeed(backend.client, namespaces, configure=configure_notifications)
+        except Exception as e:
+            print(f"Redis keyspace notifications unavailable, falling back to polling: {e}")
+    return PollChangeFeed(namespaces, poll_interval)
+
+class SDLWatcher:
+    '''
+    Background thread that applies the namespaces reported by a change feed.
+    '''
+    def __init__(self, change_feed, apply_changes, wait_timeout: float = 1.0):
+        '''
+        Args:
+            change_feed: a change feed with wait(timeout) -> set of changed namespaces and close()
+            apply_changes (function): function called with the set of changed namespaces
+            wait_timeout (float): max seconds to wait for a change before checking whether to stop
+        '''
+        self.change_feed = change_feed
+        self.apply_changes = apply_changes
+        self.wait_timeout = wait_timeout
+        self.applied_count = 0  # number of applied change sets
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def run_once(self, timeout: float = None) -> set:
+        '''
+        Wait for one set of changes and apply it in the calling thread. Returns the changed namespaces.
+        '''
+        changed = self.change_feed.wait(self.wait_timeout if timeout is None else timeout)
+        if len(changed) > 0:
+            self.apply_changes(changed)
+            self.applied_count += 1
+        return changed
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"SDL watcher failed to apply changes: {e}")
+                self._stop_event.wait(self.wait_timeout)
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sdl-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.change_feed.close()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
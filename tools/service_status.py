@@ -0,0 +1,278 @@
+'''
+Cache of the network control-plane service status (RIC platform pods, xApps and the MobiFlow agent container).
+
+The pod and container sources are probed in parallel, either by a background refresher thread or on read once the
+cached status is older than the TTL, so a status query is a dict read instead of kubectl / docker calls. Each
+service keeps its latest state (ready containers, status, restart count and start time); the uptime is computed
+when the status is read. Sources are objects with a list() method returning ServiceState tuples (and optionally an
+async alist()), so the cache can be tested with a FakeServiceSource.
+'''
+import re
+import json
+import time
+import asyncio
+import calendar
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from ..utils import execute_command, execute_command_async
+
+# since: start time (epoch seconds) of a running service, or the time it stopped
+ServiceState = namedtuple("ServiceState", ["name", "ready", "status", "restart_count", "since"])
+
+def parse_timestamp(value: str) -> float:
+    '''
+    Parse a RFC 3339 UTC timestamp (e.g., "2025-06-09T12:00:00Z" or Docker's "2025-06-09T12:00:00.123456789Z")
+    into epoch seconds. Returns None for empty or zero timestamps.
+    '''
+    match = re.match(r"(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)", value or "")
+    if match is None or int(match.group(1)) < 1970:
+        return None
+    return float(calendar.timegm(tuple(int(v) for v in match.groups())))
+
+def format_age(seconds: float) -> str:
+    '''
+    Format a duration the way kubectl prints the pod age, e.g., "40s", "5m30s", "95m", "4d20h".
+    '''
+    seconds = max(int(seconds), 0)
+    minutes, hours, days = seconds // 60, seconds // 3600, seconds // 86400
+    if seconds < 120:
+        return f"{seconds}s"
+    if minutes < 10:
+        return f"{minutes}m{seconds % 60}s" if seconds % 60 else f"{minutes}m"
+    if minutes < 180:
+        return f"{minutes}m"
+    if hours < 8:
+        return f"{hours}h{minutes % 60}m" if minutes % 60 else f"{hours}h"
+    if hours < 48:
+        return f"{hours}h"
+    if hours < 192:
+        return f"{days}d{hours % 24}h" if hours % 24 else f"{days}d"
+    return f"{days}d"
+
+def format_service_state(state: ServiceState, now: float = None) -> str:
+    '''
+    Format a service state as "name;ready;status;restart_count;age", or an empty string for an inactive service.
+    '''
+    if state is None:
+        return ""
+    now = time.time() if now is None else now
+    age = "N/A" if state.since is None else format_age(now - state.since)
+    return f"{state.name};{state.ready};{state.status};{state.restart_count};{age}"
+
+class KubernetesPodSource:
+    '''
+    Lists the pods of all namespaces with a single "kubectl get pods -o json" call.
+    '''
+    command = "kubectl get pods -A -o json"
+
+    def __init__(self, run_command=execute_command, run_command_async=execute_command_async):
+        self.run_command = run_command
+        self.run_command_async = run_command_async
+
+    def list(self) -> list:
+        return self.parse(self.run_command(self.command))
+
+    async def alist(self) -> list:
+        return self.parse(await self.run_command_async(self.command))
+
+    def parse(self, output: str) -> list:
+        data = json.loads(output)
+        states = []
+        for item in data.get("items", []):
+            metadata, status = item.get("metadata", {}), item.get("status", {})
+            containers = status.get("containerStatuses", [])
+            pod_status = status.get("reason") or status.get("phase", "Unknown")
+            for container in containers:
+                # waiting / terminated reasons (e.g., CrashLoopBackOff) take precedence, as in kubectl
+                reason = container.get("state", {}).get("waiting", {}).get("reason") or container.get("state", {}).get("terminated", {}).get("reason")
+                if reason:
+                    pod_status = reason
+            if metadata.get("deletionTimestamp"):
+                pod_status = "Terminating"
+            ready = f"{sum(1 for c in containers if c.get('ready'))}/{len(item.get('spec', {}).get('containers', containers))}"
+            restart_count = sum(c.get("restartCount", 0) for c in containers)
+            states.append(ServiceState(metadata.get("name", ""), ready, pod_status, restart_count, parse_timestamp(metadata.get("creationTimestamp"))))
+        return states
+
+class DockerContainerSource:
+    '''
+    Inspects the given containers with a single "docker inspect" call.
+    '''
+    def __init__(self, container_names: list, run_command=execute_command, run_command_async=execute_command_async):
+        self.command = "docker inspect " + " ".join(container_names)
+        self.run_command = run_command
+        self.run_command_async = run_command_async
+
+    def list(self) -> list:
+        return self.parse(self.run_command(self.command))
+
+    async def alist(self) -> list:
+        return self.parse(await self.run_command_async(self.command))
+
+    def parse(self, output: str) -> list:
+        # docker inspect prints an empty list and fails if none of the containers exists
+        if not output:
+            return []
+        states = []
+        for container in json.loads(output):
+            state = container.get("State", {})
+            running = state.get("Running", False)
+            since = parse_timestamp(state.get("StartedAt") if running else state.get("FinishedAt"))
+            states.append(ServiceState(container.get("Name", "").lstrip("/"), "1/1" if running else "0/1", "Running" if running else "Inactive",
+                                       container.get("RestartCount", 0), since))
+        return states
+
+class FakeServiceSource:
+    '''
+    In-memory pod / container source, for testing.
+    '''
+    def __init__(self):
+        self.states = {}
+        self.list_count = 0
+
+    def set(self, name: str, status: str = "Running", restart_count: int = 0, since: float = None, ready: str = "1/1"):
+        self.states[name] = ServiceState(name, ready, status, restart_count, time.time() if since is None else since)
+
+    def remove(self, name: str):
+        self.states.pop(name, None)
+
+    def list(self) -> list:
+        self.list_count += 1
+        return list(self.states.values())
+
+class ServiceStatusCache:
+    '''
+    Latest state of each service, refreshed from the sources in the background or once older than ttl seconds.
+    '''
+    def __init__(self, sources: list, services: dict, ttl: float = 10.0, labels: dict = None):
+        '''
+        Args:
+            sources (list): the pod / container sources
+            services (dict): display name -> name pattern, a service is matched to the pod / container whose name
+                contains the pattern
+            ttl (float): max age in seconds of the cached states served when the background refresher is not running
+            labels (dict): display name -> name starting the formatted status of the service, instead of the pod /
+                container name
+        '''
+        self.sources = list(sources)
+        self.services = dict(services)
+        self.labels = dict(labels or {})
+        self.ttl = ttl
+        self.states = {name: None for name in self.services}  # display name -> ServiceState, None if inactive
+        self.last_refresh = None
+        self._source_states = [[] for _ in self.sources]  # latest successful list() of each source
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.sources), 1), thread_name_prefix="service-status")
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _probe(self, i: int):
+        try:
+            self._source_states[i] = self.sources[i].list()
+        except Exception as e:
+            # keep the previous states of the source
+            print(f"Failed to list services from {type(self.sources[i]).__name__}: {e}")
+
+    async def _aprobe(self, i: int):
+        source = self.sources[i]
+        try:
+            if hasattr(source, "alist"):
+                self._source_states[i] = await source.alist()
+            else:
+                self._source_states[i] = await asyncio.to_thread(source.list)
+        except Exception as e:
+            print(f"Failed to list services from {type(source).__name__}: {e}")
+
+    def _update_states(self):
+        states = {name: None for name in self.services}
+        for source_states in self._source_states:
+            for state in source_states:
+                for name, pattern in self.services.items():
+                    if pattern in state.name:
+                        states[name] = state
+                        break
+        self.states = states
+        self.last_refresh = time.time()
+
+    def refresh(self):
+        '''
+        Probe all sources in parallel and update the service states.
+        '''
+        with self._refresh_lock:
+            list(self._executor.map(self._probe, range(len(self.sources))))
+            self._update_states()
+
+    async def arefresh(self):
+        '''
+        Probe all sources concurrently on the event loop and update the service states.
+        '''
+        await asyncio.gather(*(self._aprobe(i) for i in range(len(self.sources))))
+        self._update_states()
+
+    def _is_stale(self) -> bool:
+        return not self.is_running() and (self.last_refresh is None or time.time() - self.last_refresh > self.ttl)
+
+    def get_states(self) -> dict:
+        '''
+        Return the states of the services (display name -> ServiceState, None if inactive).
+        '''
+        if self._is_stale():
+            self.refresh()
+        return self.states
+
+    async def aget_states(self) -> dict:
+        '''
+        Async variant of get_states.
+        '''
+        if self._is_stale():
+            await self.arefresh()
+        return self.states
+
+    def get_status(self) -> dict:
+        '''
+        Return the formatted status of the services, see format_service_state.
+        '''
+        return self._format_states(self.get_states())
+
+    async def aget_status(self) -> dict:
+        '''
+        Async variant of get_status.
+        '''
+        return self._format_states(await self.aget_states())
+
+    def _format_states(self, states: dict) -> dict:
+        now = time.time()
+        status = {}
+        for name, state in states.items():
+            if state is not None and name in self.labels:
+                state = state._replace(name=self.labels[name])
+            status[name] = format_service_state(state, now)
+        return status
+
+    def _run(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Service status refresher failed: {e}")
+            self._stop_event.wait(interval)
+
+    def start(self, interval: float = None):
+        '''
+        Start a background thread refreshing the states every interval seconds (default: ttl).
+        '''
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(self.ttl if interval is None else interval,), name="service-status", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,191 @@
+'''
+Aggregate views of the network data for the LLM tools.
+
+Instead of every raw MobiFlow message, the views summarize the network locally: per-UE state-machine summaries,
+per-cell counters, cipher / integrity algorithm distributions and the most anomalous UEs. They are rendered in a
+compact line format and cut to a token budget, so a tool output stays small on a busy cell.
+'''
+from collections import Counter
+
+algorithm_fields = ["rrc_cipher_alg", "rrc_integrity_alg", "nas_cipher_alg", "nas_integrity_alg"]
+# weights of the UE anomaly flags in the anomaly score
+anomaly_flag_weights = {
+    "null_cipher": 3,
+    "null_integrity": 3,
+    "shared_s_tmsi": 3,
+    "repeated_security_mode": 2,
+    "incomplete_attach": 1,
+}
+event_severity_weights = {"Critical": 3}
+
+def is_null_algorithm(value) -> bool:
+    '''
+    Whether a cipher / integrity algorithm value (int in the MobiFlow table, str in the network data) is the null algorithm.
+    '''
+    return value == 0 or value == "0"
+
+def null_security_flags(alg, secured: bool, registered: bool = False) -> list:
+    '''
+    Return the null cipher / integrity flags of a UE, shared by the summaries and the KPI views.
+    Args:
+        alg: the values of the algorithm_fields of the UE
+        secured (bool): whether the RRC security mode of the UE completed, the RRC flags apply only then
+        registered (bool): whether the UE is registered, the NAS flag applies only then
+    '''
+    flags = []
+    if secured and is_null_algorithm(alg[0]):
+        flags.append("null_cipher")
+    if secured and is_null_algorithm(alg[1]):
+        flags.append("null_integrity")
+    if registered and is_null_algorithm(alg[3]):
+        flags.append("nas_null_integrity")
+    return flags
+
+def estimate_tokens(text: str) -> int:
+    '''
+    Estimate the number of LLM tokens of a text (about 4 characters per token).
+    '''
+    return (len(text) + 3) // 4
+
+def fit_token_budget(lines: list, token_budget: int) -> str:
+    '''
+    Join the lines, in priority order, until the token budget is reached. Cut lines are reported in a last line.
+    '''
+    kept = []
+    used = 0
+    for i, line in enumerate(lines):
+        tokens = estimate_tokens(line) + 1
+        if used + tokens > token_budget and len(kept) > 0:
+            kept.append(f"... {len(lines) - i} more lines cut to fit the token budget")
+            break
+        kept.append(line)
+        used += tokens
+    return "\n".join(kept)
+
+def format_counts(counts: dict) -> str:
+    return " ".join(f"{k}:{v}" for k, v in sorted(counts.items(), key=lambda kv: (-kv[1], str(kv[0]))))
+
+def summarize_ue(nr_cell_id: str, ue_id: str, ue: dict, events: list = (), shared_s_tmsi: bool = False) -> dict:
+    '''
+    Summarize the MobiFlow messages of a UE: message counts, the path of its (rrc_state, nas_state, rrc_sec_state)
+    state machine, its algorithms, anomaly flags and events.
+    Args:
+        nr_cell_id (str): the cell of the UE
+        ue_id (str): the UE ID
+        ue (dict): the UE data of the network data
+        events (list): the events of the UE
+        shared_s_tmsi (bool): whether another UE of the cell uses the same S-TMSI
+    '''
+    messages = ue["mobiflow"]
+    rrc_msgs = Counter(m["rrc_msg"] for m in messages)
+    path = []
+    for m in messages:
+        state = f"{m['rrc_state']}/{m['nas_state']}/{m['rrc_sec_state']}"
+        if len(path) == 0 or path[-1] != state:
+            path.append(state)
+    secured = rrc_msgs["SecurityModeComplete"] > 0
+    flags = null_security_flags([ue[f] for f in algorithm_fields], secured)
+    if shared_s_tmsi:
+        flags.append("shared_s_tmsi")
+    if rrc_msgs["SecurityModeComplete"] > 1:
+        flags.append("repeated_security_mode")
+    if not secured and rrc_msgs["RRCRelease"] == 0:
+        flags.append("incomplete_attach")
+    critical_events = sum(1 for e in events if e["severity"] == "Critical")
+    score = sum(anomaly_flag_weights[f] for f in flags) + sum(event_severity_weights.get(e["severity"], 1) for e in events)
+    summary = ue.get("mobiflow_summary")
+    return {
+        "cell": nr_cell_id,
+        "ue": ue_id,
+        "msgs": len(messages) + (summary["compacted_messages"] if summary else 0),
+        "first": messages[0]["timestamp"] if messages else "",
+        "last": messages[-1]["timestamp"] if messages else "",
+        "last_msg": messages[-1]["rrc_msg"] if messages else "",
+        "state_path": path,
+        "released": rrc_msgs["RRCRelease"] > 0,
+        "alg": "/".join(ue[f] for f in algorithm_fields),
+        "flags": flags,
+        "events": len(events),
+        "critical_events": critical_events,
+        "score": score,
+    }
+
+def format_ue_summary(s: dict) -> str:
+    line = (f"ue {s['ue']}@{s['cell']} score={s['score']} msgs={s['msgs']} t={s['first']}-{s['last']} "
+            f"states={'>'.join(s['state_path'])} last={s['last_msg']} alg={s['alg']}")
+    if s["released"]:
+        line += " released"
+    if s["flags"]:
+        line += " flags=" + ",".join(s["flags"])
+    if s["events"]:
+        line += f" events={s['events']}(critical {s['critical_events']})"
+    return line
+
+def summarize_network(network: dict, events: dict = None, event_index: dict = None, active_ue_ids=None) -> dict:
+    '''
+    Summarize the network data: per-cell counters, algorithm distributions and the UE summaries sorted by anomaly score.
+    Args:
+        network (dict): the network data (nr_cell_id -> BS data and UEs)
+        events (dict): event ID -> event
+        event_index (dict): field -> value -> event IDs, see EventStore (the events of a UE are matched by UE and cell ID)
+        active_ue_ids: the IDs of the active UEs
+    '''
+    events = events or {}
+    ue_event_ids = (event_index or {}).get("ueID", {})
+    cells = {}
+    algorithms = {field: Counter() for field in algorithm_fields}
+    ues = []
+    for nr_cell_id, cell in network.items():
+        s_tmsi_counts = Counter(ue["s_tmsi"] for ue in cell["ue"].values() if ue["s_tmsi"] != "0")
+        counters = Counter()
+        for ue_id, ue in cell["ue"].items():
+            ue_events = [events[i] for i in ue_event_ids.get(ue_id, ()) if i in events and events[i]["cellID"] == nr_cell_id]
+            summary = summarize_ue(nr_cell_id, ue_id, ue, ue_events, s_tmsi_counts[ue["s_tmsi"]] > 1)
+            ues.append(summary)
+            counters["ues"] += 1
+            counters["active"] += 1 if active_ue_ids is not None and ue_id in active_ue_ids else 0
+            counters["msgs"] += summary["msgs"]
+            counters["released"] += summary["released"]
+            counters["events"] += summary["events"]
+            for flag in summary["flags"]:
+                counters[flag] += 1
+            for field in algorithm_fields:
+                algorithms[field][ue[field]] += 1
+        cells[nr_cell_id] = dict(counters)
+    ues.sort(key=lambda s: (-s["score"], s["cell"], s["ue"]))
+    return {
+        "cells": cells,
+        "algorithms": {field: dict(counts) for field, counts in algorithms.items()},
+        "events": len(events),
+        "critical_events": sum(1 for e in events.values() if e["severity"] == "Critical"),
+        "ues": ues,
+    }
+
+def render_network_summary(summary: dict, token_budget: int, top_k: int = 20) -> str:
+    '''
+    Render a network summary in the compact line format within the token budget. The totals come first, then the
+    most anomalous UEs (up to top_k) and the per-cell counters.
+    '''
+    cells = summary["cells"]
+    totals = Counter()
+    for counters in cells.values():
+        totals.update(counters)
+    lines = [
+        f"cells={len(cells)} ues={totals['ues']} active={totals['active']} msgs={totals['msgs']} released={totals['released']} "
+        f"events={summary['events']} critical={summary['critical_events']}",
+        "alg (rrc_cipher/rrc_integrity/nas_cipher/nas_integrity value:ues): "
+        + " | ".join(f"{field.replace('_alg', '')} {format_counts(counts)}" for field, counts in summary["algorithms"].items()),
+    ]
+    anomalous = [s for s in summary["ues"] if s["score"] > 0][:top_k]
+    if anomalous:
+        lines.append(f"top anomalous UEs ({len(anomalous)} of {sum(1 for s in summary['ues'] if s['score'] > 0)}):")
+        lines += [format_ue_summary(s) for s in anomalous]
+    for nr_cell_id, counters in sorted(cells.items()):
+        lines.append(f"cell {nr_cell_id}: " + " ".join(f"{k}={v}" for k, v in counters.items()))
+    return fit_token_budget(lines, token_budget)
+
+def render_ue_summaries(summaries: list, token_budget: int) -> str:
+    '''
+    Render UE summaries in the compact line format within the token budget.
+    '''
+    return fit_token_budget([format_ue_summary(s) for s in summaries], token_budget)
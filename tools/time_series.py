@@ -0,0 +1,154 @@
+'''
+Fixed-size time series backed by preallocated NumPy ring buffers.
+
+Each series keeps the raw samples (one every ~10 seconds) in a ring buffer and maintains rollups at coarser
+resolutions (1 minute, 15 minutes, 1 hour by default) with min / max / avg per bucket, so long dashboard windows
+are served from a few hundred points instead of every raw sample. Appends are O(1). The most recent raw sample is
+folded into the rollups only once a sample with a later timestamp arrives, as it may still be replaced; the rollup
+queries include it.
+'''
+import time
+import threading
+import numpy as np
+
+class RingBuffer:
+    '''
+    Preallocated ring buffer of one or more typed columns. The oldest row is overwritten once the buffer is full.
+    '''
+    def __init__(self, capacity: int, dtypes: dict):
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self._next = 0  # position of the next row to write
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, **values):
+        pos = self._next
+        for name, value in values.items():
+            self.columns[name][pos] = value
+        self._next = (pos + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self, name: str):
+        '''
+        Return the value of the column in the most recent row, or None if the buffer is empty.
+        '''
+        if self._size == 0:
+            return None
+        return self.columns[name][(self._next - 1) % self.capacity]
+
+    def update_last(self, **values):
+        pos = (self._next - 1) % self.capacity
+        for name, value in values.items():
+            self.columns[name][pos] = value
+
+    def ordered(self, name: str) -> np.ndarray:
+        '''
+        Return the column from the oldest to the most recent row.
+        '''
+        col = self.columns[name]
+        if self._size < self.capacity:
+            return col[:self._size]
+        return np.concatenate((col[self._next:], col[:self._next]))
+
+class TimeSeries:
+    '''
+    Time series of numeric samples with raw ring buffer and min / max / avg rollups.
+    '''
+    default_rollups = ((60, 1440), (900, 672), (3600, 720))  # (resolution in seconds, number of buckets): 24h, 7d, 30d
+
+    def __init__(self, raw_capacity: int = 90, rollups: tuple = None, dtype=np.int64):
+        '''
+        Args:
+            raw_capacity (int): number of raw samples to keep, e.g., 90 samples of 10 seconds = 15 minutes
+            rollups (tuple): (resolution in seconds, number of buckets) of each rollup level
+            dtype: type of the sample values
+        '''
+        self.dtype = dtype
+        self.raw = RingBuffer(raw_capacity, {"ts": np.int64, "value": dtype})
+        self.rollups = {}
+        for resolution, capacity in (rollups or self.default_rollups):
+            self.rollups[resolution] = RingBuffer(capacity, {"ts": np.int64, "min": dtype, "max": dtype, "sum": np.float64, "count": np.int64})
+        self._lock = threading.Lock()
+
+    def append(self, ts: int, value):
+        '''
+        Append a sample. A sample with the same timestamp as the last one replaces it.
+        '''
+        ts = int(ts)
+        with self._lock:
+            last_ts = self.raw.last("ts")
+            if last_ts == ts:
+                self.raw.update_last(value=value)
+                return
+            if last_ts is not None:
+                # the previous sample can no longer be replaced
+                for resolution, buckets in self.rollups.items():
+                    self._fold(buckets, resolution, int(last_ts), self.raw.last("value"))
+            self.raw.append(ts=ts, value=value)
+
+    @staticmethod
+    def _fold(buckets: RingBuffer, resolution: int, ts: int, value):
+        bucket_ts = ts - ts % resolution
+        last_ts = buckets.last("ts")
+        if last_ts is not None and bucket_ts <= last_ts:
+            # same bucket (late samples are folded into the most recent bucket)
+            buckets.update_last(
+                min=min(buckets.last("min"), value),
+                max=max(buckets.last("max"), value),
+                sum=buckets.last("sum") + value,
+                count=buckets.last("count") + 1,
+            )
+        else:
+            buckets.append(ts=bucket_ts, min=value, max=value, sum=value, count=1)
+
+    def get_raw(self, start_ts: int = None) -> dict:
+        '''
+        Return the raw samples with timestamp >= start_ts as {timestamp: value}.
+        '''
+        with self._lock:
+            timestamps = self.raw.ordered("ts")
+            values = self.raw.ordered("value")
+        lo = 0 if start_ts is None else np.searchsorted(timestamps, start_ts, side="left")
+        return dict(zip(timestamps[lo:].tolist(), values[lo:].tolist()))
+
+    def get_rollup(self, resolution: int, start_ts: int = None) -> dict:
+        '''
+        Return the rollup buckets of a resolution with timestamp >= start_ts as {bucket timestamp: {"min", "max", "avg"}}.
+        '''
+        if resolution not in self.rollups:
+            raise ValueError(f"No rollup with resolution {resolution}s, available resolutions: {list(self.rollups.keys())}")
+        buckets = self.rollups[resolution]
+        with self._lock:
+            columns = {name: buckets.ordered(name).copy() for name in ("ts", "min", "max", "sum", "count")}
+            pending = (int(self.raw.last("ts")), self.raw.last("value")) if len(self.raw) > 0 else None
+        if pending is not None:
+            # fold the most recent raw sample, not in the rollups yet
+            ts, value = pending
+            bucket_ts = ts - ts % resolution
+            if len(columns["ts"]) > 0 and bucket_ts <= columns["ts"][-1]:
+                columns["min"][-1] = min(columns["min"][-1], value)
+                columns["max"][-1] = max(columns["max"][-1], value)
+                columns["sum"][-1] += value
+                columns["count"][-1] += 1
+            else:
+                for name, v in (("ts", bucket_ts), ("min", value), ("max", value), ("sum", value), ("count", 1)):
+                    columns[name] = np.append(columns[name], v)
+        lo = 0 if start_ts is None else np.searchsorted(columns["ts"], start_ts, side="left")
+        avg = columns["sum"][lo:] / np.maximum(columns["count"][lo:], 1)
+        return {
+            ts: {"min": min_value, "max": max_value, "avg": round(avg_value, 2)}
+            for ts, min_value, max_value, avg_value in zip(columns["ts"][lo:].tolist(), columns["min"][lo:].tolist(), columns["max"][lo:].tolist(), avg.tolist())
+        }
+
+    def get_window(self, window: int, resolution: int = None, end_ts: int = None) -> dict:
+        '''
+        Return the rollup buckets of a resolution covering the last `window` seconds of the series. If the resolution
+        is None, all raw samples (the raw_capacity most recent ones) are returned, whatever their age.
+        '''
+        if resolution is None:
+            return self.get_raw()
+        end_ts = int(time.time()) if end_ts is None else end_ts
+        return self.get_rollup(resolution, end_ts - window - resolution + 1)
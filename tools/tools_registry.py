@@ -7,7 +7,13 @@ def mobillm_chat_tools():
     return [
             # get_ue_mobiflow_data_all_tool,
             fetch_sdl_data_osc_tool,
+            get_network_summary_tool,
+            get_ue_summary_tool,
+            get_cell_kpis_tool,
+            get_ue_security_posture_tool,
+            get_ues_by_security_posture_tool,
             get_ue_mobiflow_data_by_index_tool,
+            get_ue_mobiflow_data_by_time_range_tool,
             get_ue_mobiflow_description_tool,
             get_ue_mobiflow_data_all_tool,
             get_bs_mobiflow_data_all_tool,
@@ -16,6 +22,10 @@ def mobillm_chat_tools():
             fetch_sdl_event_data_all_tool,
             fetch_sdl_event_data_by_ue_id_tool,
             fetch_sdl_event_data_by_cell_id_tool,
+            fetch_sdl_event_data_by_time_range_tool,
+            query_sdl_event_data_tool,
+            query_mobiflow_archive_tool,
+            query_event_archive_tool,
             get_event_description_tool,
             fetch_service_status_tool,
             build_xapp_tool,
@@ -26,8 +36,14 @@ def mobillm_chat_tools():
 def mobillm_security_analysis_tools():
     return [
             # get_ue_mobiflow_data_all_tool,
+            get_network_summary_tool,
+            get_ue_summary_tool,
+            get_cell_kpis_tool,
+            get_ue_security_posture_tool,
+            get_ues_by_security_posture_tool,
             get_ue_mobiflow_data_by_index_tool,
             get_ue_mobiflow_data_by_ue_id_tool,
+            get_ue_mobiflow_data_by_time_range_tool,
             get_ue_mobiflow_description_tool,
             get_bs_mobiflow_data_all_tool,
             get_bs_mobiflow_data_by_index_tool,
@@ -35,6 +51,10 @@ def mobillm_security_analysis_tools():
             fetch_sdl_event_data_all_tool,
             fetch_sdl_event_data_by_ue_id_tool,
             fetch_sdl_event_data_by_cell_id_tool,
+            fetch_sdl_event_data_by_time_range_tool,
+            query_sdl_event_data_tool,
+            query_mobiflow_archive_tool,
+            query_event_archive_tool,
             get_event_description_tool,
         ]
 
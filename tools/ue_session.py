@@ -0,0 +1,165 @@
+'''
+UE session lifecycle tracker.
+
+Sessions are modeled from the RRC / NAS messages of the UE MobiFlow records: a session starts when a UE connects,
+becomes registered once NAS registration completes, and is released on RRC release / NAS deregistration. Sessions
+without messages for idle_timeout seconds expire and are removed, so memory stays bounded on cells with high UE
+churn. Idle time is measured on the MobiFlow clock (the latest record timestamp).
+'''
+import threading
+import numpy as np
+from collections import OrderedDict, deque, namedtuple
+
+UESessionTransition = namedtuple("UESessionTransition", ["timestamp", "nr_cell_id", "ue_id", "from_state", "to_state"])
+
+class UESession:
+    '''
+    Session of a UE in a cell.
+    '''
+    __slots__ = ["nr_cell_id", "ue_id", "state", "first_seen", "last_seen"]
+
+    def __init__(self, nr_cell_id: str, ue_id: str, timestamp: int):
+        self.nr_cell_id = nr_cell_id
+        self.ue_id = ue_id
+        self.state = None
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+
+class UESessionTracker:
+    '''
+    Tracks the sessions of the UEs from their MobiFlow records and keeps a hash set of the active UEs.
+    '''
+    # session states, the connected and registered sessions are active
+    CONNECTED = "connected"
+    REGISTERED = "registered"
+    RELEASED = "released"
+    EXPIRED = "expired"
+    active_states = (CONNECTED, REGISTERED)
+    release_messages = ["RRCRelease", "Deregistrationrequest", "Deregistrationaccept"]
+    # rrc_state values, see get_ue_mobiflow_description_tool
+    rrc_inactive_states = (0, 1)
+    # nas_state value of EMM_REGISTERED
+    nas_registered_state = 2
+
+    def __init__(self, idle_timeout: float = 600, max_sessions: int = None, max_transitions: int = 1000):
+        '''
+        Args:
+            idle_timeout (float): seconds without messages after which a session expires
+            max_sessions (int): max number of tracked sessions, the least recently seen sessions expire first
+            max_transitions (int): number of recent lifecycle transitions to keep
+        '''
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()  # (nr_cell_id, ue_id) -> UESession, least recently seen first
+        self.active_ue_keys = set()  # (nr_cell_id, ue_id) of the active sessions
+        self.transitions = deque(maxlen=max_transitions)
+        self.listeners = []
+        self.latest_timestamp = None
+        self.last_index = -1  # highest MobiFlow index observed by observe_rows
+        self._lock = threading.RLock()
+
+    def reset(self):
+        '''
+        Forget all sessions, e.g., after the MobiFlow indexes were reset. Listeners and past transitions are kept.
+        '''
+        with self._lock:
+            self.sessions.clear()
+            self.active_ue_keys.clear()
+            self.latest_timestamp = None
+            self.last_index = -1
+
+    def add_listener(self, callback):
+        '''
+        Register a function called with each UESessionTransition.
+        '''
+        self.listeners.append(callback)
+
+    def _transition(self, session: UESession, to_state: str, timestamp: int):
+        if session.state == to_state:
+            return
+        transition = UESessionTransition(timestamp, session.nr_cell_id, session.ue_id, session.state, to_state)
+        session.state = to_state
+        key = (session.nr_cell_id, session.ue_id)
+        if to_state in self.active_states:
+            self.active_ue_keys.add(key)
+        else:
+            self.active_ue_keys.discard(key)
+        self.transitions.append(transition)
+        for callback in self.listeners:
+            callback(transition)
+
+    def observe(self, nr_cell_id, ue_id, timestamp: int, rrc_msg: str, nas_msg: str, rrc_state: int, nas_state: int):
+        '''
+        Update the session of a UE with one of its MobiFlow messages.
+        '''
+        key = (str(nr_cell_id), str(ue_id))
+        with self._lock:
+            session = self.sessions.get(key)
+            if session is None or session.state == self.RELEASED and rrc_msg == "RRCSetupRequest":
+                # new session, or a released UE connecting again
+                if session is None:
+                    session = UESession(key[0], key[1], timestamp)
+                    self.sessions[key] = session
+                self._transition(session, self.CONNECTED, timestamp)
+            session.last_seen = max(session.last_seen, timestamp)
+            self.sessions.move_to_end(key)
+
+            if rrc_msg in self.release_messages or nas_msg in self.release_messages or (rrc_state in self.rrc_inactive_states and session.state == self.REGISTERED):
+                self._transition(session, self.RELEASED, timestamp)
+            elif nas_state == self.nas_registered_state and session.state != self.RELEASED:
+                self._transition(session, self.REGISTERED, timestamp)
+
+            if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+                self.latest_timestamp = timestamp
+            if self.max_sessions is not None:
+                while len(self.sessions) > self.max_sessions:
+                    self._expire(next(iter(self.sessions)), timestamp)
+
+    def observe_rows(self, table, rows):
+        '''
+        Update the sessions with the given rows of a MobiFlowTable. Rows whose MobiFlow index has already been
+        observed are skipped, so a rebuilt table can be passed again.
+        '''
+        with self._lock:
+            indexes = table.column("Index")[rows]
+            rows = np.asarray(rows)[indexes > self.last_index]
+            if len(rows) == 0:
+                return
+            columns = [table.get_values(rows, name) for name in ("nr_cell_id", "gnb_du_ue_f1ap_id", "Timestamp", "rrc_msg", "nas_msg", "rrc_state", "nas_state")]
+            for values in zip(*columns):
+                self.observe(*values)
+            self.last_index = max(self.last_index, int(indexes.max()))
+
+    def _expire(self, key: tuple, timestamp: int):
+        session = self.sessions.pop(key)
+        self._transition(session, self.EXPIRED, timestamp)
+
+    def expire_idle(self, now: int = None) -> int:
+        '''
+        Expire the sessions without messages for idle_timeout seconds before now (default: the latest record timestamp).
+        Returns:
+            int: the number of expired sessions
+        '''
+        with self._lock:
+            now = self.latest_timestamp if now is None else now
+            if now is None:
+                return 0
+            expired = 0
+            # sessions are ordered by last message, stop at the first session that is not idle
+            while len(self.sessions) > 0:
+                key, session = next(iter(self.sessions.items()))
+                if now - session.last_seen <= self.idle_timeout:
+                    break
+                self._expire(key, now)
+                expired += 1
+            return expired
+
+    def active_ue_ids(self) -> set:
+        '''
+        Return the IDs of the UEs with an active session.
+        '''
+        with self._lock:
+            return set(ue_id for _, ue_id in self.active_ue_keys)
+
+    def get_session(self, nr_cell_id, ue_id) -> UESession:
+        return self.sessions.get((str(nr_cell_id), str(ue_id)))
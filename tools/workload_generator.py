@@ -0,0 +1,301 @@
+'''
+Synthetic MobiFlow / event workload generator for scale testing.
+
+Generates the UE and BS MobiFlow records of N cells x M UEs over T minutes in the semicolon schema of the sample
+data, with the MobieXpert / MobiWatch events of the injected attacks. Each UE goes through sessions following the
+RRC / NAS sequences of the sample data (RRC setup, registration, authentication, security mode, capability
+enquiry, NAS transport activity, RRC release) with a mix of cipher / integrity algorithms. Injected attacks:
+    - null cipher: a session with the RRC null cipher (MobieXpert "RRC Null Cipher" and MobiWatch events)
+    - blind DoS: a second UE connecting with the S-TMSI of a connected UE (MobieXpert "Blind DoS")
+    - signaling storm: a burst of RRC setups that never complete in a cell (MobieXpert "Signaling Storm")
+Records are generated lazily in timestamp order, so large workloads can be written to CSV (with the sample data
+file names, usable as SIMULATION_DATA_DIR) or fed into an SDL backend without holding them in memory.
+
+Usage:
+    python -m MobiLLM.tools.workload_generator --cells 10 --ues 100 --minutes 60 --output-dir /tmp/mobiflow
+    python -m MobiLLM.tools.workload_generator --cells 10 --ues 100 --minutes 60 --sdl-backend redis
+'''
+import os
+import sys
+import time
+import heapq
+import random
+import argparse
+from operator import itemgetter
+from .sdl_backend import SDLBackend, SimulationSDLBackend, create_sdl_backend
+from .sdl_loader import sdl_value_prefix
+
+# (rrc_msg, nas_msg, rrc_state, nas_state, secured, reserved_field_1) of a UE attach, as in the sample data
+attach_sequence = [
+    ("RRCSetupRequest", " ", 0, 0, False, 3),
+    ("RRCSetup", " ", 2, 0, False, 0),
+    ("RRCSetupComplete", "Registrationrequest", 2, 1, False, 1),
+    ("DLInformationTransfer", "Authenticationrequest", 2, 1, False, 0),
+    ("ULInformationTransfer", "Authenticationresponse", 2, 1, False, 0),
+    ("DLInformationTransfer", "Securitymodecommand", 2, 1, False, 0),
+    ("ULInformationTransfer", "Securitymodecomplete", 2, 1, False, 0),
+    ("SecurityModeCommand", " ", 2, 1, False, 0),
+    ("SecurityModeComplete", " ", 2, 1, True, 0),
+    ("RRCReconfiguration", " ", 2, 1, True, 0),
+    ("RRCReconfigurationComplete", " ", 2, 1, True, 0),
+    ("UECapabilityEnquiry", " ", 2, 1, True, 0),
+    ("UECapabilityInformation", " ", 2, 1, True, 0),
+    ("ULInformationTransfer", "Registrationcomplete", 2, 2, True, 0),
+    ("ULInformationTransfer", "ULNAStransport", 2, 2, True, 0),
+    ("RRCReconfiguration", " ", 2, 2, True, 0),
+    ("RRCReconfigurationComplete", " ", 2, 2, True, 0),
+]
+activity_sequence = [
+    ("ULInformationTransfer", "ULNAStransport", 2, 2, True, 0),
+    ("DLInformationTransfer", "DLNAStransport", 2, 2, True, 0),
+]
+release_sequence = [("RRCRelease", " ", 1, 0, False, 0)]
+# positions in the attach sequence of the first message analyzed by the MobiWatch LSTM / autoencoder models
+lstm_sequence_start = 4
+autoencoder_sequence_start = 8
+# (rrc_cipher_alg, rrc_integrity_alg, nas_cipher_alg, nas_integrity_alg) -> weight
+algorithm_mix = {
+    (2, 2, 0, 2): 0.5,
+    (2, 2, 2, 2): 0.3,
+    (1, 1, 1, 1): 0.15,
+    (3, 3, 3, 3): 0.05,
+}
+null_cipher_algorithms = (0, 2, 0, 2)
+# rrc_sec_state after the security mode complete, for ciphered and null cipher sessions
+ciphered_sec_state = 3
+null_cipher_sec_state = 1
+
+event_descriptions = {
+    "RRC Null Cipher": "The UE uses null cipher mode in its RRC session, its RRC traffic data is subject to sniffing attack.",
+    "Blind DoS": "A UE initiated an RRC connection using the same S-TMSI as another connected UE. The previously connected UE's session could have been released by the gNB.",
+    "Signaling Storm": "A burst of RRC connections that never completed the registration was observed in the cell, which may deplete the base station resources.",
+}
+
+class _Session:
+    __slots__ = ["nr_cell_id", "cu_ue_id", "ue_id", "indexes"]
+
+    def __init__(self, nr_cell_id: int, cu_ue_id: int, ue_id: int):
+        self.nr_cell_id = nr_cell_id
+        self.cu_ue_id = cu_ue_id
+        self.ue_id = ue_id
+        self.indexes = []  # MobiFlow indexes of the session records, assigned when the records are emitted
+
+class MobiFlowWorkloadGenerator:
+    '''
+    Generates the MobiFlow records and events of n_cells cells with n_ues UEs each over the given minutes.
+    '''
+    def __init__(self, n_cells: int = 3, n_ues: int = 10, minutes: float = 10, start_timestamp: int = 1749482800, seed: int = 0,
+                 null_cipher_rate: float = 0.01, blind_dos_rate: float = 0.005, storm_rate: float = 0.01, storm_size: int = 50,
+                 mean_session: float = 300, mean_idle: float = 120, mean_activity_interval: float = 30):
+        '''
+        Args:
+            n_cells (int): number of cells
+            n_ues (int): number of UEs per cell
+            minutes (float): duration of the workload
+            start_timestamp (int): timestamp of the first record
+            seed (int): random seed, the same arguments generate the same workload
+            null_cipher_rate (float): probability that a session uses the null cipher
+            blind_dos_rate (float): probability that a session is attacked by a blind DoS
+            storm_rate (float): probability of a signaling storm in a cell, per minute
+            storm_size (int): number of RRC setups of a signaling storm
+            mean_session (float): mean session length in seconds
+            mean_idle (float): mean time in seconds between two sessions of a UE
+            mean_activity_interval (float): mean time in seconds between two NAS transport exchanges of a session
+        '''
+        self.n_cells = n_cells
+        self.n_ues = n_ues
+        self.start_timestamp = start_timestamp
+        self.end_timestamp = start_timestamp + minutes * 60
+        self.seed = seed
+        self.null_cipher_rate = null_cipher_rate
+        self.blind_dos_rate = blind_dos_rate
+        self.storm_rate = storm_rate
+        self.storm_size = storm_size
+        self.mean_session = mean_session
+        self.mean_idle = mean_idle
+        self.mean_activity_interval = mean_activity_interval
+        self.cells = [(i + 1) * 10000 for i in range(n_cells)]
+        self._algorithms = list(algorithm_mix.keys())
+        self._algorithm_weights = list(algorithm_mix.values())
+        self._next_ue_ids = {}
+        self._next_cu_ids = {}
+
+    def _new_session(self, rng: random.Random, nr_cell_id: int) -> _Session:
+        # gnb_du_ue_f1ap_id (also the RNTI) cycles through the 16-bit range from a random offset per cell
+        ue_id = self._next_ue_ids.get(nr_cell_id, rng.randrange(1000, 60000)) % 65535 + 1
+        self._next_ue_ids[nr_cell_id] = ue_id
+        cu_ue_id = self._next_cu_ids.get(nr_cell_id, 0) + 1
+        self._next_cu_ids[nr_cell_id] = cu_ue_id
+        return _Session(nr_cell_id, cu_ue_id, ue_id)
+
+    def _records(self, session: _Session, timestamp: float, step: float, sequence: list, s_tmsi: int, mobile_id: str,
+                 algorithms: tuple, sec_state: int, identified_from: int = 2) -> list:
+        '''
+        Return the (timestamp, session, fields, events) records of a message sequence, one message every step seconds.
+        The identity and algorithms are reported from the identified_from-th message on, as in the sample data.
+        '''
+        records = []
+        for i, (rrc_msg, nas_msg, rrc_state, nas_state, secured, reserved) in enumerate(sequence):
+            identified = i >= identified_from
+            fields = "%d;%d;%d;%d;%d;%s;%d;%d;%d;%d;%s;%s;%d;%d;%d;%d;0;0" % (
+                session.nr_cell_id, session.cu_ue_id, session.ue_id, session.ue_id, s_tmsi if identified else 0, mobile_id if identified else "0",
+                *(algorithms if identified else (0, 0, 0, 0)), rrc_msg, nas_msg, rrc_state, nas_state, sec_state if secured else 0, reserved)
+            records.append((timestamp + i * step, session, fields, ()))
+        return records
+
+    def _ue_stream(self, nr_cell_id: int, ue_number: int):
+        '''
+        Yield the records of the sessions of a UE in timestamp order.
+        '''
+        rng = random.Random(f"{self.seed}-{nr_cell_id}-{ue_number}")
+        mobile_id = f"20899{rng.randrange(10 ** 8):08d}"
+        s_tmsi = rng.randrange(1, 2 ** 24)
+        t = self.start_timestamp + rng.uniform(0, min(60, self.end_timestamp - self.start_timestamp))
+        while t < self.end_timestamp:
+            session = self._new_session(rng, nr_cell_id)
+            null_cipher = rng.random() < self.null_cipher_rate
+            algorithms = null_cipher_algorithms if null_cipher else rng.choices(self._algorithms, self._algorithm_weights)[0]
+            sec_state = null_cipher_sec_state if null_cipher else ciphered_sec_state
+            step = rng.uniform(0.02, 0.1)
+            records = self._records(session, t, step, attach_sequence, s_tmsi, mobile_id, algorithms, sec_state)
+            if null_cipher:
+                # detected once the attach is complete
+                records[-1] = records[-1][:3] + (("RRC Null Cipher",),)
+            attach_end = records[-1][0]
+            session_end = attach_end + rng.expovariate(1 / self.mean_session)
+
+            t = attach_end + rng.expovariate(1 / self.mean_activity_interval)
+            while t < min(session_end, self.end_timestamp):
+                records += self._records(session, t, step, activity_sequence, s_tmsi, mobile_id, algorithms, sec_state)
+                t += rng.expovariate(1 / self.mean_activity_interval)
+
+            if rng.random() < self.blind_dos_rate:
+                # an attacker connects with the S-TMSI of the UE while its session is up
+                attacker = self._new_session(rng, nr_cell_id)
+                attack_time = rng.uniform(attach_end, min(session_end, self.end_timestamp))
+                attack = self._records(attacker, attack_time, step, attach_sequence[:4], s_tmsi, "2089900000000", (0, 0, 0, 0), 0)
+                attack[-1] = attack[-1][:3] + (("Blind DoS",),)
+                records += attack
+
+            if session_end < self.end_timestamp:
+                records += self._records(session, session_end, step, release_sequence, s_tmsi, mobile_id, algorithms, sec_state, 0)
+            records.sort(key=itemgetter(0))
+            yield from records
+            t = session_end + rng.expovariate(1 / self.mean_idle)
+
+    def _storm_stream(self, nr_cell_id: int):
+        '''
+        Yield the records of the signaling storms of a cell in timestamp order.
+        '''
+        rng = random.Random(f"{self.seed}-{nr_cell_id}-storm")
+        minute_start = self.start_timestamp
+        while minute_start < self.end_timestamp:
+            if rng.random() < self.storm_rate:
+                t = minute_start + rng.uniform(0, 60)
+                records = []
+                for _ in range(self.storm_size):
+                    records += self._records(self._new_session(rng, nr_cell_id), t, 0.01, attach_sequence[:2], 0, "0", (0, 0, 0, 0), 0)
+                    t += rng.uniform(0.005, 0.02)
+                records[-1] = records[-1][:3] + (("Signaling Storm",),)
+                records.sort(key=itemgetter(0))
+                yield from (r for r in records if r[0] < self.end_timestamp)
+            minute_start += 60
+
+    def generate(self):
+        '''
+        Yield the (namespace, line) records of the workload: the BS records, then the UE MobiFlow records in
+        timestamp order interleaved with the events they trigger.
+        '''
+        for i, nr_cell_id in enumerate(self.cells):
+            yield "bs_mobiflow", f"BS;{i};{self.start_timestamp};v2.1;SECSM;{nr_cell_id};208;099;0;1000;1"
+        self._next_ue_ids, self._next_cu_ids = {}, {}
+        streams = [self._ue_stream(c, u) for c in self.cells for u in range(self.n_ues)] + [self._storm_stream(c) for c in self.cells]
+        index = 0
+        event_id = 0
+        for t, session, fields, events in heapq.merge(*streams, key=itemgetter(0)):
+            timestamp = int(t)
+            session.indexes.append(index)
+            yield "ue_mobiflow", "UE;%d;v2.1;SECSM;%d;%s" % (index, timestamp, fields)
+            index += 1
+            for name in events:
+                event_id += 1
+                yield "mobiexpert-event", f"{event_id};{name};{session.nr_cell_id};{timestamp};{session.ue_id};{event_descriptions[name]};Critical"
+                if name == "RRC Null Cipher":
+                    state_indexes = ",".join(str(i) for i in session.indexes[autoencoder_sequence_start:])
+                    sequence_indexes = str([session.indexes[lstm_sequence_start:]])
+                    yield "mobiwatch-event", (f"autoencoder_v2;Abnormal UE State;{session.nr_cell_id};{session.ue_id};{timestamp};{state_indexes};"
+                                              f"Abnormal UE state detected by the Autoencoder model at the following MobiFlow index {state_indexes}")
+                    yield "mobiwatch-event", (f"lstm_v2;Abnormal UE Sequence;{session.nr_cell_id};{session.ue_id};{timestamp};{sequence_indexes};"
+                                              f"Abnormal UE message sequences detected by the LSTM model at the following MobiFlow sequences {sequence_indexes}")
+
+    def sdl_records(self):
+        '''
+        Yield the (namespace, key, value) SDL writes of the workload, keyed by line number like the bulk loader,
+        e.g., for a ReplayChangeFeed.
+        '''
+        counts = {}
+        for namespace, line in self.generate():
+            counts[namespace] = counts.get(namespace, 0) + 1
+            yield namespace, str(counts[namespace]), sdl_value_prefix + line
+
+    def write_csv(self, output_dir: str) -> dict:
+        '''
+        Write the workload into output_dir, with the file names of the sample data. Returns the record counts.
+        '''
+        os.makedirs(output_dir, exist_ok=True)
+        files = {ns: open(os.path.join(output_dir, filename), "w", encoding="utf-8") for ns, filename in SimulationSDLBackend.sample_files.items()}
+        counts = {ns: 0 for ns in files}
+        try:
+            for namespace, line in self.generate():
+                files[namespace].write(line + "\n")
+                counts[namespace] += 1
+        finally:
+            for f in files.values():
+                f.close()
+        return counts
+
+    def feed_sdl(self, sdl: SDLBackend, chunk_size: int = 5000) -> dict:
+        '''
+        Write the workload into an SDL backend in chunks of multi-key sets. Returns the record counts.
+        '''
+        chunks = {}
+        counts = {}
+        for namespace, key, value in self.sdl_records():
+            chunk = chunks.setdefault(namespace, {})
+            chunk[key] = value
+            counts[namespace] = counts.get(namespace, 0) + 1
+            if len(chunk) >= chunk_size:
+                sdl.set(namespace, chunk)
+                chunks[namespace] = {}
+        for namespace, chunk in chunks.items():
+            if len(chunk) > 0:
+                sdl.set(namespace, chunk)
+        return counts
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic MobiFlow / event workload")
+    parser.add_argument("--cells", type=int, default=3, help="number of cells")
+    parser.add_argument("--ues", type=int, default=10, help="number of UEs per cell")
+    parser.add_argument("--minutes", type=float, default=10, help="duration of the workload")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--null-cipher-rate", type=float, default=0.01, help="probability that a session uses the null cipher")
+    parser.add_argument("--blind-dos-rate", type=float, default=0.005, help="probability that a session is attacked by a blind DoS")
+    parser.add_argument("--storm-rate", type=float, default=0.01, help="probability of a signaling storm in a cell, per minute")
+    parser.add_argument("--output-dir", default=None, help="write the CSV files into this directory")
+    parser.add_argument("--sdl-backend", default=None, help='write into an SDL backend instead, "kubectl" or "redis"')
+    parser.add_argument("--chunk-size", type=int, default=5000, help="records per multi-key set when writing into SDL")
+    args = parser.parse_args(argv)
+
+    generator = MobiFlowWorkloadGenerator(args.cells, args.ues, args.minutes, seed=args.seed, null_cipher_rate=args.null_cipher_rate,
+                                          blind_dos_rate=args.blind_dos_rate, storm_rate=args.storm_rate)
+    start = time.time()
+    if args.sdl_backend:
+        counts = generator.feed_sdl(create_sdl_backend(args.sdl_backend), args.chunk_size)
+    else:
+        counts = generator.write_csv(args.output_dir or "mobiflow-workload")
+    elapsed = time.time() - start
+    total = sum(counts.values())
+    print(f"Generated {total} records in {elapsed:.1f}s ({total / elapsed if elapsed > 0 else 0:.0f} records/s): {counts}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,4 +1,5 @@
 import subprocess
+import asyncio
 import os
 import json
 import re
@@ -6,19 +7,28 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint, HuggingFacePipeline
 
 
-def execute_command(command):
-    ''' Execute a shell command and return the output '''
+def execute_command(command, cwd=None):
+    ''' Execute a shell command (in the cwd directory, if given) and return the output '''
     # print(command)
     # result = subprocess.run(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     # if result.returncode != 0:
     #     raise Exception(f"Command failed with error: {result.stderr}")
     # return result.stdout.decode("utf-8", errors="replace")
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, encoding="utf-8", errors="replace")
+        result = subprocess.run(command, shell=True, cwd=cwd, capture_output=True, text=True, encoding="utf-8", errors="replace")
         return result.stdout.strip()
     except Exception as e:
         return None, str(e), -1  # Return -1 as exit code for exceptions
 
+async def execute_command_async(command, cwd=None):
+    ''' Execute a shell command without blocking the event loop and return the output '''
+    try:
+        process = await asyncio.create_subprocess_shell(command, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        stdout, _ = await process.communicate()
+        return stdout.decode("utf-8", errors="replace").strip()
+    except Exception as e:
+        return None, str(e), -1  # Return -1 as exit code for exceptions
+
 def extract_json_from_string(input_str: str):
     try:
         response = json.loads(input_str.strip().replace("\n", ""))